@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+import urllib.request
+from datetime import date
+
+import standin_server
+
+# Uçtan uca yük testi: yerel yer tutucu sunucu (standin_server.py) başlatılır ve gerçek
+# kazıyıcı (cli.py backfill) SCRAPER_BASE ile ona yönlendirilerek ayrı bir süreçte çalıştırılır.
+# Belge/sn, aşama gecikme yüzdelikleri (istemci histogramlarından), sunucu tarafı yanıt süreleri,
+# CPU ve tepe RSS raporlanır.
+#
+#   python bench/load_test.py                                    # varsayılan 14 gün, gecikmesiz
+#   python bench/load_test.py --latency 0.08 --jitter 0.04 --error-rate 0.02 --partitions 8
+#   python bench/load_test.py --rate 10 --host-rate 0            # sunucu 429 ile kısıtlar
+#   python bench/load_test.py --revalidate                       # ikinci geçiş: koşullu istekler, 304
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# Raporlanan istemci tarafı aşamaları (metrics.stage_seconds)
+STAGES = ("get_soup", "fetch_detail", "extract_detail", "parse_detail", "save")
+
+
+def histogram_quantile(q, buckets, count):
+    # Birikimli kova sayılarından doğrusal aralama (Prometheus histogram_quantile ile aynı yaklaşım)
+    if not count:
+        return 0.0
+    rank, prev_bound, prev_count = q * count, 0.0, 0
+    for bound, cum in sorted(((float(b), c) for b, c in buckets.items()), key=lambda x: x[0]):
+        if cum >= rank:
+            if cum == prev_count:
+                return bound
+            return prev_bound + (bound - prev_bound) * (rank - prev_count) / (cum - prev_count)
+        prev_bound, prev_count = bound, cum
+    return float("inf")
+
+
+def _server_stats(base):
+    with urllib.request.urlopen(base + "__stats", timeout=10) as r:
+        return json.loads(r.read())
+
+
+def run_scraper(base, work, args, extra_env=None, log_name="scraper.log"):
+    out_dir = os.path.join(work, "output")
+    env = dict(os.environ,
+               SCRAPER_BASE=base,
+               SCRAPER_OUT_DIR=out_dir,
+               HTTP_CACHE_DIR=os.path.join(work, ".http_cache"),
+               OCR_CACHE_DIR=os.path.join(work, ".ocr_cache"),
+               METRICS_JSON=os.path.join(out_dir, "run_metrics.json"),
+               SCRAPER_HOST_RATE=str(args.host_rate),
+               SCRAPER_CONCURRENCY=str(args.concurrency),
+               PYTHONUNBUFFERED="1")
+    if args.extract_workers is not None:
+        env["SCRAPER_EXTRACT_WORKERS"] = str(args.extract_workers)
+    if args.fast_parser:
+        env["FAST_INDEX_PARSER"] = "1"
+    for spec in args.env:
+        k, _, v = spec.partition("=")
+        env[k] = v
+    env.update(extra_env or {})
+    cmd = [sys.executable, os.path.join(ROOT, "cli.py"), "backfill", args.start.isoformat(), args.end.isoformat(),
+           "--partitions", str(args.partitions)]
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    t0 = time.perf_counter()
+    with open(os.path.join(work, log_name), "w", encoding="utf-8") as log:
+        proc = subprocess.run(cmd, cwd=work, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - t0
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    try:
+        with open(env["METRICS_JSON"], encoding="utf-8") as f:
+            metrics = json.load(f)
+    except (OSError, ValueError):
+        metrics = {"counters": {}, "stages": {}}
+    counters = metrics.get("counters", {})
+    saved = counters.get("records_saved_total", 0)
+    cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    # ru_maxrss alt süreçlerin en büyüğüdür (toplam değil); çıkarma süreçleri de dahildir
+    rss = after.ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else after.ru_maxrss / 1024
+    result = {
+        "exit_code": proc.returncode,
+        "wall_s": wall,
+        "documents": saved,
+        "failed": counters.get("records_failed_total", 0),
+        "docs_per_s": saved / wall if wall > 0 else 0.0,
+        "cpu_s": cpu,
+        "cpu_util": cpu / wall if wall > 0 else 0.0,
+        "peak_rss_mb": rss,
+        "http": {k.split("status=", 1)[1].rstrip("}"): v for k, v in counters.items()
+                 if k.startswith("http_requests_total{")},
+        "stages": {},
+    }
+    for name in STAGES:
+        h = metrics.get("stages", {}).get(name)
+        if not h or not h["count"]:
+            continue
+        result["stages"][name] = {"count": h["count"], "mean_s": h["mean_seconds"],
+                                  **{f"p{int(q * 100)}_s": histogram_quantile(q, h["buckets"], h["count"])
+                                     for q in (0.5, 0.95, 0.99)}}
+    return result
+
+
+def report(title, res, server):
+    print(f"\n== {title}")
+    print(f"  çıkış kodu {res['exit_code']}, {res['wall_s']:.1f} sn, {res['documents']} belge "
+          f"({res['docs_per_s']:.2f} belge/sn), {res['failed']} hata")
+    print(f"  CPU {res['cpu_s']:.1f} sn (çekirdek kullanımı {res['cpu_util']:.2f}), tepe RSS {res['peak_rss_mb']:.1f} MB")
+    print("  istemci HTTP: " + ", ".join(f"{k} {v}" for k, v in sorted(res["http"].items())))
+    # Yüzdelikler istemci histogram kovalarından aralanır (kaba); sunucu yüzdelikleri kesin değerlerdir
+    print(f"  {'aşama':<16}{'adet':>7}{'ort':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, s in res["stages"].items():
+        print(f"  {name:<16}{s['count']:>7}{s['mean_s']:>9.3f}{s['p50_s']:>9.3f}{s['p95_s']:>9.3f}{s['p99_s']:>9.3f}")
+    print(f"  sunucu: {server['requests']} istek, " + ", ".join(f"{k} {v}" for k, v in sorted(server["status"].items()))
+          + f"; yanıt süresi p50 {server['p50_seconds'] * 1000:.0f} ms, p95 {server['p95_seconds'] * 1000:.0f} ms, "
+          f"p99 {server['p99_seconds'] * 1000:.0f} ms, en fazla {server['max_seconds'] * 1000:.0f} ms, "
+          f"{server['bytes_sent'] / 1024 / 1024:.1f} MB")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Yer tutucu sunucuya karşı uçtan uca yük testi")
+    ap.add_argument("--start", type=date.fromisoformat, default=date(2019, 12, 25))
+    ap.add_argument("--end", type=date.fromisoformat, default=date(2020, 1, 7))
+    ap.add_argument("--partitions", type=int, default=4, help="backfill --partitions")
+    ap.add_argument("--concurrency", type=int, default=4, help="SCRAPER_CONCURRENCY")
+    ap.add_argument("--extract-workers", type=int, help="SCRAPER_EXTRACT_WORKERS (varsayılan çekirdek sayısı)")
+    ap.add_argument("--host-rate", type=float, default=0.0, help="SCRAPER_HOST_RATE (0: istemci sınırı kapalı)")
+    ap.add_argument("--fast-parser", action="store_true", help="FAST_INDEX_PARSER=1")
+    ap.add_argument("--env", action="append", default=[], metavar="AD=DEĞER", help="kazıyıcıya ek ortam değişkeni")
+    ap.add_argument("--revalidate", action="store_true",
+                    help="ikinci geçiş: önbellek süreleri 0, SCRAPER_FORCE=1; her istek koşullu (304)")
+    ap.add_argument("--keep", action="store_true", help="çalışma klasörünü (çıktı, günlük) silme")
+    ap.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    standin_server.add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    server = standin_server.start(*standin_server.from_args(args))
+    work = tempfile.mkdtemp(prefix="rg_load_")
+    results = {}
+    try:
+        print(f"[+] Sunucu {server.base_url}, çalışma klasörü {work}")
+        print(f"[+] {args.start} .. {args.end}, {args.partitions} parça, eşzamanlılık {args.concurrency}")
+        results["first"] = run_scraper(server.base_url, work, args)
+        results["first"]["server"] = _server_stats(server.base_url)
+        report("ilk geçiş", results["first"], results["first"]["server"])
+        if args.revalidate:
+            server.stats.reset()
+            results["revalidate"] = run_scraper(server.base_url, work, args, log_name="scraper_revalidate.log",
+                                                extra_env={"SCRAPER_FORCE": "1", "HTTP_CACHE_TTL_INDEX": "0",
+                                                           "HTTP_CACHE_TTL_DETAIL": "0", "HTTP_CACHE_TTL_PDF": "0"})
+            results["revalidate"]["server"] = _server_stats(server.base_url)
+            report("yeniden doğrulama", results["revalidate"], results["revalidate"]["server"])
+    finally:
+        server.shutdown()
+        server.server_close()
+        if args.keep:
+            print(f"\n[=] Çalışma klasörü korundu: {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r["exit_code"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
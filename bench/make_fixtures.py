@@ -0,0 +1,211 @@
+import os
+import io
+import random
+import sys
+
+import fitz
+from PIL import Image, ImageDraw, ImageFont
+
+# Sabit tohumla üretilen benchmark korpusu. Çıktılar depoya eklenir; yeniden üretmek
+# yalnızca korpusu bilerek değiştirmek gerektiğinde yapılır.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+
+KELIMELER = ("karar yönetmelik madde kurum bakanlık uygulama kapsam tanım esas usul hüküm yürürlük "
+             "yürütme başkanlık kanun sayılı tarihli ilgili gereği değişiklik fıkra bent idare "
+             "görev yetki işlem belge başvuru süre ücret ödeme denetim").split()
+
+GUNLER = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+BOLUMLER = [
+    ("YASAMA BÖLÜMÜ", ["KANUNLAR"]),
+    ("YÜRÜTME VE İDARE BÖLÜMÜ", ["CUMHURBAŞKANI KARARLARI", "YÖNETMELİKLER", "TEBLİĞLER", "KURUL KARARLARI"]),
+    ("YARGI BÖLÜMÜ", ["ANAYASA MAHKEMESİ KARARLARI"]),
+]
+
+
+def cumle(rnd, n):
+    s = " ".join(rnd.choice(KELIMELER) for _ in range(n))
+    return s[0].upper() + s[1:] + "."
+
+
+def paragraf(rnd, n_cumle=5):
+    return " ".join(cumle(rnd, rnd.randint(6, 14)) for _ in range(n_cumle))
+
+
+def daily_index_html(rnd, n_items, day=15, month="Ocak", year=2024, issue=32430):
+    parts = [f'<html><head><meta charset="utf-8"><title>Resmî Gazete</title></head><body>',
+             f'<div id="gazete-header"><span id="spanGazeteTarih">{day} {month} {year} {GUNLER[day % 7]} '
+             f'Tarihli ve {issue} Sayılı Resmî Gazete</span></div>',
+             '<div id="html-content" class="html-content">']
+    k = 0
+    for title, subs in BOLUMLER:
+        parts.append(f'<div class="html-title">{title}</div>')
+        for sub in subs:
+            parts.append(f'<div class="html-subtitle">{sub}</div>')
+            for _ in range(max(1, n_items // 8)):
+                k += 1
+                ext = "pdf" if k % 3 == 0 else "htm"
+                href = f"eskiler/{year}/01/{year}01{day:02d}-{k}.{ext}"
+                parts.append(f'<div class="fihrist-item mb-1"><a href="{href}" target="_blank">'
+                             f'–– {cumle(rnd, 8)}</a></div>')
+            # Alt başlığı olmayan, önceki başlığa düşen öğeler (find_previous yolu)
+            parts.append('<div class="card"><div class="fihrist-item"><a href="'
+                         f'eskiler/{year}/01/{year}01{day:02d}-x{k}.htm">–– {cumle(rnd, 6)}</a></div></div>')
+    parts.append('<div class="html-title">İLAN BÖLÜMÜ</div>')
+    parts.append('<div class="html-subtitle">YARGI İLANLARI</div>')
+    for i in range(10):
+        parts.append(f'<div class="fihrist-item"><a href="ilanlar/eskiler/{year}/01/{year}01{day:02d}-4-{i}.htm">'
+                     f'{cumle(rnd, 4)}</a></div>')
+    parts.append('<div class="fihrist-item"><a href="#">Önceki Sayı</a></div>')
+    parts.append("</div></body></html>")
+    return "\n".join(parts)
+
+
+def detail_html(rnd):
+    paras = "".join(f"<p>{paragraf(rnd)}</p>" for _ in range(12))
+    return (f'<html><head><meta charset="utf-8"><title>Resmî Gazete</title><script>var x=1;</script></head>'
+            f'<body><h1>{cumle(rnd, 9).upper()}</h1><p>Karar Sayısı: 8123</p>{paras}</body></html>')
+
+
+def _font(size):
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+
+_HELV = fitz.Font("helv")
+
+
+def _write(page, items, fontsize=10):
+    # insert_text WinAnsi dışındaki Türkçe harfleri (ş, ğ, ı, İ) düşürür; TextWriter Unicode yazar
+    tw = fitz.TextWriter(page.rect)
+    for pos, text in items:
+        tw.append(pos, text, font=_HELV, fontsize=fontsize)
+    tw.write_text(page)
+
+
+def _text_page(doc, lines, fontsize=10):
+    page = doc.new_page(width=595, height=842)
+    items, y = [], 60
+    for ln in lines:
+        items.append(((50, y), ln))
+        y += fontsize * 1.5
+        if y > 800:
+            break
+    _write(page, items, fontsize)
+    return page
+
+
+def _save(doc):
+    doc.subset_fonts()
+    return doc.tobytes(garbage=3, deflate=True)
+
+
+def _wrap(text, width=95):
+    out, cur = [], ""
+    for w in text.split():
+        if len(cur) + len(w) + 1 > width:
+            out.append(cur)
+            cur = w
+        else:
+            cur = f"{cur} {w}".strip()
+    if cur:
+        out.append(cur)
+    return out
+
+
+def prose_pdf(rnd, pages=6):
+    doc = fitz.open()
+    for p in range(pages):
+        lines = ["15 Ocak 2024 PAZARTESİ", "Resmî Gazete", "Sayı : 32430", ""]
+        if p == 0:
+            lines += ["YÖNETMELİK", cumle(rnd, 10).upper(), "Karar Sayısı: 8123", ""]
+        for _ in range(6):
+            lines += _wrap(paragraf(rnd)) + [""]
+        _text_page(doc, lines)
+    return _save(doc)
+
+
+def scanned_pdf(rnd, pages=3):
+    doc = fitz.open()
+    font = _font(22)
+    for _ in range(pages):
+        img = Image.new("L", (850, 1100), 255)
+        d = ImageDraw.Draw(img)
+        y = 60
+        for ln in _wrap(" ".join(paragraf(rnd) for _ in range(5)), 60):
+            d.text((60, y), ln, fill=0, font=font)
+            y += 30
+            if y > 1040:
+                break
+        buf = io.BytesIO()
+        img.save(buf, "PNG", optimize=True)
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=buf.getvalue())
+    return _save(doc)
+
+
+def table_pdf(rnd, rows=40):
+    doc = fitz.open()
+    lines = ["15 Ocak 2024 PAZARTESİ", "Resmî Gazete", "Sayı : 32430", "",
+             "CUMHURBAŞKANI KARARI", "Karar Sayısı: 8124", ""] + _wrap(paragraf(rnd, 8))
+    _text_page(doc, lines)
+    page = doc.new_page(width=595, height=842)
+    _write(page, [((50, 50), "TARİHLİ VE 8124 SAYILI CUMHURBAŞKANI KARARININ EKİ"), ((50, 66), "LİSTE")])
+    cols = [50, 100, 230, 480]
+    y = 90
+    page.draw_rect(fitz.Rect(45, y - 12, 560, y + rows * 16), color=(0, 0, 0), width=0.5)
+    _write(page, [((c, y), h) for c, h in zip(cols, ["SIRA NO", "İMZA TARİHİ VE YERİ", "ANLAŞMANIN ADI", "YÜRÜRLÜK"])], 8)
+    cells = []
+    for r in range(1, rows + 1):
+        y += 16
+        page.draw_line((45, y - 12), (560, y - 12), color=(0, 0, 0), width=0.3)
+        vals = [str(r), f"{rnd.randint(1, 28)} Mart {rnd.randint(1990, 2023)} Ankara",
+                " ".join(rnd.choice(KELIMELER) for _ in range(4)).title() + " Anlaşması",
+                f"{rnd.randint(1, 28)} Nisan {rnd.randint(1990, 2023)}"]
+        cells += [((c, y), v) for c, v in zip(cols, vals)]
+    _write(page, cells, 7)
+    return _save(doc)
+
+
+def map_pdf(rnd, pages=4):
+    doc = fitz.open()
+    lines = ["15 Ocak 2024 PAZARTESİ", "Resmî Gazete", "Sayı : 32430", "", "CUMHURBAŞKANI KARARI",
+             "Karar Sayısı: 8125", ""] + _wrap(paragraf(rnd, 10))
+    _text_page(doc, lines)
+    for p in range(pages):
+        page = doc.new_page(width=595, height=842)
+        _write(page, [((50, 40), f"EK-{p + 1} HARİTA")], 12)
+        for _ in range(900):
+            x, y = rnd.uniform(40, 555), rnd.uniform(60, 800)
+            page.draw_line((x, y), (x + rnd.uniform(-20, 20), y + rnd.uniform(-20, 20)), width=0.4)
+        _write(page, [((50, 820), "KOORDİNAT LİSTESİ")], 8)
+        _write(page, [((60 + (i % 3) * 170, 700 + (i // 3) * 12),
+                       f"{rnd.randint(400000, 499999)}.{rnd.randint(10, 99)} "
+                       f"{rnd.randint(4400000, 4499999)}.{rnd.randint(10, 99)}") for i in range(12)], 7)
+    return _save(doc)
+
+
+def main():
+    rnd = random.Random(20240115)
+    os.makedirs(os.path.join(FIXTURES, "html"), exist_ok=True)
+    os.makedirs(os.path.join(FIXTURES, "pdf"), exist_ok=True)
+    files = {
+        "html/gunluk_kucuk.htm": daily_index_html(rnd, 16).encode("utf-8"),
+        "html/gunluk_buyuk.htm": daily_index_html(rnd, 96, day=16, issue=32431).encode("utf-8"),
+        "html/detay.htm": detail_html(rnd).encode("utf-8"),
+        "pdf/duz_metin.pdf": prose_pdf(rnd),
+        "pdf/taranmis.pdf": scanned_pdf(rnd),
+        "pdf/tablo_eki.pdf": table_pdf(rnd),
+        "pdf/harita_eki.pdf": map_pdf(rnd),
+    }
+    for name, data in files.items():
+        with open(os.path.join(FIXTURES, name), "wb") as f:
+            f.write(data)
+        print(f"{name}: {len(data) // 1024} KB")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
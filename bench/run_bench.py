@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import statistics
+import subprocess
+import tempfile
+import multiprocessing as mp
+
+# Sabit korpus (bench/fixtures) üzerinde aşama bazlı benchmark.
+# Her aşama ayrı bir süreçte çalışır; böylece tepe RSS değeri aşamaya özgü olur.
+#
+#   python bench/run_bench.py                    # ölç ve yazdır
+#   python bench/run_bench.py --save-baseline    # bench/baseline.json'a yaz
+#   python bench/run_bench.py --compare          # baseline ile karşılaştır, gerilemede çıkış kodu 1
+#   python bench/run_bench.py --imports          # içe aktarma süresi bütçesi, aşılırsa çıkış kodu 1
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+FIXTURES = os.path.join(HERE, "fixtures")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+
+# Temiz bir süreçte içe aktarma süresi bütçeleri (ms, ortanca). cli kısa ömürlü komutların
+# (show, stats, queue) açılış maliyetidir; main indirme/izleme işçilerininki.
+IMPORT_BUDGETS_MS = {"cli": 50, "main": 450}
+# main içe aktarıldığında yüklenmemesi gereken ağır modüller (ilk kullanımda yüklenirler)
+LAZY_MODULES = ("fitz", "pymupdf", "pdfminer", "pytesseract", "PIL", "tesserocr", "pyarrow", "zstandard")
+
+
+def _fixture(*parts):
+    return os.path.join(FIXTURES, *parts)
+
+
+def _read(*parts):
+    with open(_fixture(*parts), "rb") as f:
+        return f.read()
+
+
+def _pdfs():
+    names = sorted(os.listdir(_fixture("pdf")))
+    return [(n, _read("pdf", n)) for n in names]
+
+
+def _page_count(pdf_bytes):
+    import fitz
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def stage_collect_from_daily_page(main, repeat):
+    pages = [("gunluk_kucuk.htm", _read("html", "gunluk_kucuk.htm")), ("gunluk_buyuk.htm", _read("html", "gunluk_buyuk.htm"))]
+    units = 0
+    for _ in range(repeat):
+        for name, body in pages:
+            soup = main.BeautifulSoup(body, "lxml")
+            main.collect_from_daily_page(main.urljoin(main.BASE, "15.01.2024"), soup)
+            units += 1
+    return units
+
+
+def stage_collect_from_daily_tree(main, repeat):
+    pages = [_read("html", "gunluk_kucuk.htm"), _read("html", "gunluk_buyuk.htm")]
+    units = 0
+    for _ in range(repeat):
+        for body in pages:
+            main.collect_from_daily_tree(main.urljoin(main.BASE, "15.01.2024"), main.fast_html.parse(body))
+            units += 1
+    return units
+
+
+def stage_detail_html_fast(main, repeat):
+    body = _read("html", "detay.htm")
+    for _ in range(repeat * 10):
+        main.title_and_text_fast(body)
+    return repeat * 10
+
+
+def stage_detail_html(main, repeat):
+    body = _read("html", "detay.htm")
+    for _ in range(repeat * 10):
+        soup = main.BeautifulSoup(body, "lxml")
+        main.extract_title(soup)
+        main._normalize_ws(main.clean_text(soup))
+    return repeat * 10
+
+
+def stage_pdf_to_text_robust(main, repeat):
+    units = 0
+    for _ in range(repeat):
+        for _, pdf in _pdfs():
+            main.pdf_to_text_robust(pdf)
+            units += _page_count(pdf)
+    return units
+
+
+def stage_pdf_to_text_robust_with_images(main, repeat):
+    units = 0
+    for _ in range(repeat):
+        for _, pdf in _pdfs():
+            main.pdf_to_text_robust_with_images(pdf)
+            units += _page_count(pdf)
+    return units
+
+
+def stage_ocr_page(main, repeat):
+    import fitz
+    if not (main.TESSEROCR_OK or (main.TESSERACT_OK and shutil.which(main.pytesseract.pytesseract.tesseract_cmd))):
+        return None
+    units = 0
+    with fitz.open(stream=_read("pdf", "taranmis.pdf"), filetype="pdf") as doc:
+        for _ in range(repeat):
+            for pg in doc:
+                main._ocr_page_with_tesseract(pg)
+                units += 1
+    return units
+
+
+def stage_cleaning(main, repeat):
+    import fitz
+    raw = []
+    for _, pdf in _pdfs():
+        with fitz.open(stream=pdf, filetype="pdf") as doc:
+            raw.append("\n".join(pg.get_text("text") for pg in doc))
+    big = "\n".join(raw) * 20
+    for _ in range(repeat):
+        main.CLEANER.clean(big, header_lines=True)
+    return repeat
+
+
+def stage_save_rec_with_pdf_and_images(main, repeat):
+    pdf = _read("pdf", "duz_metin.pdf")
+    _, images = main.pdf_to_text_robust_with_images(pdf)
+    rec = main.ResmiGazeteKaydi(tarih="15.01.2024", sayi="32430", kategori="YÖNETMELİKLER", baslik="Benchmark",
+                                kaynak_url="https://www.resmigazete.gov.tr/eskiler/2024/01/20240115-1.pdf",
+                                metin="metin " * 2000)
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        main.save_rec_with_pdf_and_images(i + 1, rec, pdf_bytes=pdf, page_images=images)
+    return repeat, time.perf_counter() - t0
+
+
+STAGES = {
+    "collect_from_daily_page": (stage_collect_from_daily_page, "sayfa"),
+    "collect_from_daily_tree": (stage_collect_from_daily_tree, "sayfa"),
+    "detail_html": (stage_detail_html, "belge"),
+    "detail_html_fast": (stage_detail_html_fast, "belge"),
+    "pdf_to_text_robust": (stage_pdf_to_text_robust, "sayfa"),
+    "pdf_to_text_robust_with_images": (stage_pdf_to_text_robust_with_images, "sayfa"),
+    "ocr_page": (stage_ocr_page, "sayfa"),
+    "cleaning": (stage_cleaning, "geçiş"),
+    "save_rec_with_pdf_and_images": (stage_save_rec_with_pdf_and_images, "kayıt"),
+}
+
+
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_stage(name, repeat, queue):
+    work = tempfile.mkdtemp(prefix="rg_bench_")
+    try:
+        os.chdir(work)
+        # Önbellekler kapalı: her çalıştırma aynı işi yapmalı
+        os.environ.update({"HTTP_CACHE": "0", "OCR_CACHE": "0",
+                           "SCRAPER_MANIFEST": os.path.join(work, "manifest.sqlite")})
+        sys.path.insert(0, ROOT)
+        import main
+        main.OUT_DIR = os.path.join(work, "output")
+        fn, _ = STAGES[name]
+        t0 = time.perf_counter()
+        res = fn(main, repeat)
+        wall = time.perf_counter() - t0
+        if isinstance(res, tuple):
+            res, wall = res
+        queue.put({"units": res, "wall_s": wall, "peak_rss_mb": _peak_rss_mb()})
+    except Exception as e:
+        queue.put({"error": repr(e)})
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def run(stages, repeat):
+    ctx = mp.get_context("spawn")
+    results = {}
+    for name in stages:
+        q = ctx.Queue()
+        p = ctx.Process(target=_run_stage, args=(name, repeat, q))
+        p.start()
+        res = q.get()
+        p.join()
+        if "error" in res:
+            print(f"{name:<34} HATA: {res['error']}")
+            continue
+        if res["units"] is None:
+            print(f"{name:<34} atlandı (Tesseract yok)")
+            continue
+        res["per_s"] = res["units"] / res["wall_s"] if res["wall_s"] > 0 else 0.0
+        results[name] = res
+        print(f"{name:<34} {res['wall_s']:8.3f} s  {res['per_s']:9.1f} {STAGES[name][1]}/s  "
+              f"tepe RSS {res['peak_rss_mb']:7.1f} MB")
+    return results
+
+
+def _import_once(module, work):
+    code = (f"import sys, time, json\nt0 = time.perf_counter()\nimport {module}\n"
+            f"ms = (time.perf_counter() - t0) * 1000\n"
+            f"print(json.dumps({{'ms': ms, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))")
+    env = dict(os.environ, PYTHONPATH=ROOT, SCRAPER_OUT_DIR=os.path.join(work, "output"), PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run([sys.executable, "-c", code], cwd=work, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def check_imports(budgets, runs=7):
+    # Her ölçüm yeni bir yorumlayıcıda; ilk çalıştırma .pyc üretimini ısıtmak için sayılmaz
+    failures = []
+    work = tempfile.mkdtemp(prefix="rg_import_")
+    try:
+        for module, budget in budgets.items():
+            _import_once(module, work)
+            samples = [_import_once(module, work) for _ in range(runs)]
+            ms = statistics.median(s["ms"] for s in samples)
+            loaded = sorted({m for s in samples for m in s["loaded"]})
+            ok = ms <= budget and not loaded
+            print(f"import {module:<8} {ms:8.1f} ms  (bütçe {budget} ms)  {'ok' if ok else 'AŞILDI'}"
+                  + (f"  erken yüklenen: {', '.join(loaded)}" if loaded else ""))
+            if not ok:
+                failures.append(module)
+            if os.path.exists(os.path.join(work, "output")):
+                print(f"  [UYARI] import {module} çıktı klasörü oluşturdu")
+                failures.append(module)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return failures
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key, better_high in (("per_s", True), ("peak_rss_mb", False)):
+            b, c = base.get(key), cur.get(key)
+            if not b or c is None:
+                continue
+            change = (b - c) / b if better_high else (c - b) / b
+            mark = "GERİLEME" if change > threshold else "ok"
+            print(f"  {name:<34} {key:<12} {b:10.2f} -> {c:10.2f}  ({-change if better_high else change:+.1%}) {mark}")
+            if change > threshold:
+                regressions.append((name, key))
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Aşama bazlı benchmark")
+    ap.add_argument("--stage", action="append", choices=sorted(STAGES), help="yalnızca bu aşama(lar)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--compare", action="store_true")
+    ap.add_argument("--threshold", type=float, default=0.25, help="izin verilen göreli gerileme (0.25 = %%25)")
+    ap.add_argument("--json", help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--imports", action="store_true", help="yalnızca içe aktarma süresi bütçesini denetle")
+    ap.add_argument("--import-budget", action="append", default=[], metavar="MODÜL=MS",
+                    help="bütçeyi değiştir (ör. main=600)")
+    args = ap.parse_args(argv)
+
+    if args.imports:
+        budgets = dict(IMPORT_BUDGETS_MS)
+        for spec in args.import_budget:
+            name, _, ms = spec.partition("=")
+            budgets[name] = float(ms)
+        failures = check_imports(budgets)
+        if failures:
+            print(f"{len(failures)} içe aktarma bütçesi aşıldı.")
+            return 1
+        return 0
+
+    results = run(args.stage or list(STAGES), args.repeat)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline kaydedildi: {args.baseline}")
+    if args.compare:
+        try:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        except OSError:
+            print(f"Baseline bulunamadı: {args.baseline}")
+            return 2
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} gerileme bulundu.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import date
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Yük testleri için yerel Resmî Gazete yerine geçen sunucu. bench/fixtures korpusunu
+# build_candidates() ile aynı URL şemalarından sunar:
+#
+#   /GG.AA.YYYY                           günlük fihrist (gunluk_since ve sonrası)
+#   /eskiler/YYYY/AA/YYYYAAGG.htm         eski fihrist sayfası (pdf_before .. gunluk_since arası)
+#   /eskiler/YYYY/AA/YYYYAAGG.pdf         yalnızca tam sayı PDF'i olan eski günler (pdf_before öncesi;
+#                                         --issue-pdf ile fihristi olan günlerde de)
+#   /eskiler/YYYY/AA/YYYYAAGG-N.htm|pdf   detay sayfası / PDF
+#   /eskiler/YYYY/AA/YYYYAAGGM1.htm       mükerrer sayı fihristi (--mukerrer; aynı sayı numarası)
+#   /eskiler/YYYY/AA/YYYYAAGGM1-N.htm|pdf mükerrer sayının detay sayfası / PDF
+#   /__stats                              sunucu tarafı sayaçlar ve gecikme yüzdelikleri (JSON)
+#
+# Gecikme, hata oranı, ETag/Last-Modified ile 304 yanıtları, istemci başına hız sınırı (429)
+# ve bant genişliği ayarlanabilir. Aynı tohum ve ayarlarla her çalıştırma aynı korpusu ve
+# aynı hata dizisini üretir.
+#
+#   python bench/standin_server.py --port 8800 --latency 0.05 --error-rate 0.02 --rate 20
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+
+AYLAR = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+GUNLER = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+KATEGORILER = ["KANUNLAR", "CUMHURBAŞKANI KARARLARI", "YÖNETMELİKLER", "TEBLİĞLER", "KURUL KARARLARI"]
+KELIMELER = ("karar yönetmelik madde kurum bakanlık uygulama kapsam tanım esas usul hüküm yürürlük yürütme "
+             "başkanlık kanun sayılı tarihli ilgili gereği değişiklik fıkra bent idare görev yetki").split()
+
+_GUNLUK_RE = re.compile(r"^/(\d{2})\.(\d{2})\.(\d{4})$")
+_ESKI_RE = re.compile(r"^/eskiler/(\d{4})/(\d{2})/(\d{4})(\d{2})(\d{2})\.(htm|pdf)$")
+_DETAY_RE = re.compile(r"^/eskiler/(\d{4})/(\d{2})/(\d{4})(\d{2})(\d{2})(?:M(\d+))?-(\d+)\.(htm|pdf)$")
+_MUKERRER_RE = re.compile(r"^/eskiler/(\d{4})/(\d{2})/(\d{4})(\d{2})(\d{2})M(\d+)\.htm$")
+
+# 32430 sayı 15.01.2024 tarihli; diğer günlerin sayı numarası buradan sayılır
+_ISSUE_ANCHOR = (date(2024, 1, 15).toordinal(), 32430)
+
+
+class Corpus:
+    def __init__(self, fixtures=FIXTURES, items=12, pdf_ratio=0.33, pdfs=None, unique=True, seed=0,
+                 gunluk_since=date(2020, 1, 1), pdf_before=date(2006, 1, 1), mukerrer=0, issue_pdf=False):
+        # mukerrer: günlük fihristten bağlantı verilen tek mükerrer sayının kalem sayısı (0 yok)
+        self.items, self.pdf_ratio, self.unique, self.seed = items, pdf_ratio, unique, seed
+        self.mukerrer, self.issue_pdf = mukerrer, issue_pdf
+        self.gunluk_since, self.pdf_before = gunluk_since, pdf_before
+        with open(os.path.join(fixtures, "html", "detay.htm"), encoding="utf-8") as f:
+            self.detail_template = f.read()
+        names = pdfs or sorted(os.listdir(os.path.join(fixtures, "pdf")))
+        self.pdfs = []
+        for name in names:
+            with open(os.path.join(fixtures, "pdf", name), "rb") as f:
+                self.pdfs.append(f.read())
+
+    def scheme(self, d):
+        if d >= self.gunluk_since:
+            return "gunluk"
+        return "eskiler_htm" if d >= self.pdf_before else "eskiler_pdf"
+
+    def issue(self, d):
+        return _ISSUE_ANCHOR[1] + d.toordinal() - _ISSUE_ANCHOR[0]
+
+    def _rnd(self, d, k=0):
+        return random.Random(f"{self.seed}:{d.isoformat()}:{k}")
+
+    def day_items(self, d, m=0):
+        # (sıra, kategori, başlık, uzantı); m > 0 ise m. mükerrer sayının kalemleri
+        rnd = self._rnd(d, f"M{m}") if m else self._rnd(d)
+        n = self.mukerrer if m else self.items
+        out = []
+        for k in range(1, n + 1):
+            title = " ".join(rnd.choice(KELIMELER) for _ in range(rnd.randint(5, 10))).capitalize()
+            ext = "pdf" if rnd.random() < self.pdf_ratio else "htm"
+            out.append((k, KATEGORILER[(k - 1) * len(KATEGORILER) // n], f"–– {title}.", ext))
+        return out
+
+    def index_html(self, d, m=0):
+        head = f"{d.day} {AYLAR[d.month - 1]} {d.year} {GUNLER[d.weekday()]} Tarihli ve {self.issue(d)} Sayılı Resmî Gazete"
+        if m:
+            head += f" ({m}. Mükerrer)"
+        parts = ['<html><head><meta charset="utf-8"><title>Resmî Gazete</title></head><body>',
+                 f'<div id="gazete-header"><span id="spanGazeteTarih">{head}</span></div>']
+        if self.mukerrer and not m:
+            parts.append(f'<div class="mukerrer"><a href="/eskiler/{d:%Y/%m/%Y%m%d}M1.htm">1. Mükerrer</a></div>')
+        parts += ['<div id="html-content" class="html-content">',
+                  '<div class="html-title">YÜRÜTME VE İDARE BÖLÜMÜ</div>']
+        category = None
+        prefix = f"{d:%Y%m%d}" + (f"M{m}" if m else "")
+        for k, cat, title, ext in self.day_items(d, m):
+            if cat != category:
+                parts.append(f'<div class="html-subtitle">{cat}</div>')
+                category = cat
+            href = f"/eskiler/{d:%Y/%m}/{prefix}-{k}.{ext}"
+            parts.append(f'<div class="fihrist-item mb-1"><a href="{href}" target="_blank">{title}</a></div>')
+        parts.append('<div class="html-title">İLAN BÖLÜMÜ</div>')
+        parts.append('<div class="html-subtitle">YARGI İLANLARI</div>')
+        parts.append(f'<div class="fihrist-item"><a href="/ilanlar/eskiler/{d:%Y/%m/%Y%m%d}-4-1.htm">İlan</a></div>')
+        parts.append("</div></body></html>")
+        return "\n".join(parts).encode("utf-8")
+
+    def _pdf(self, d, k):
+        pdf = self.pdfs[self._rnd(d, k).randrange(len(self.pdfs))]
+        if self.unique:
+            # %%EOF sonrasındaki yorum satırı okuyucular için etkisiz, gövde özetini ise değiştirir
+            pdf += f"\n% {d.isoformat()}-{k}\n".encode("ascii")
+        return pdf
+
+    def detail(self, d, k, ext, m=0):
+        if m and m > (1 if self.mukerrer else 0):
+            return None
+        items = {i[0]: i for i in self.day_items(d, m)}
+        if k not in items or items[k][3] != ext:
+            return None
+        key = f"M{m}-{k}" if m else k
+        if ext == "pdf":
+            return self._pdf(d, key), "application/pdf"
+        body = self.detail_template
+        body = re.sub(r"<h1>.*?</h1>", f"<h1>{items[k][2].strip('–– .').upper()}</h1>", body, count=1)
+        if self.unique:
+            body = body.replace("</body>", f"<p>Belge {d.isoformat()}-{key}</p></body>")
+        return body.encode("utf-8"), "text/html; charset=utf-8"
+
+    def resolve(self, path):
+        # (gövde, içerik türü, gün) ya da None (404)
+        m = _GUNLUK_RE.match(path)
+        if m:
+            d = _date(m.group(3), m.group(2), m.group(1))
+            if d and self.scheme(d) == "gunluk":
+                return self.index_html(d), "text/html; charset=utf-8", d
+            return None
+        m = _DETAY_RE.match(path)
+        if m:
+            d = _date(m.group(3), m.group(4), m.group(5))
+            found = self.detail(d, int(m.group(7)), m.group(8), int(m.group(6) or 0)) if d else None
+            return (*found, d) if found else None
+        m = _MUKERRER_RE.match(path)
+        if m:
+            d = _date(m.group(3), m.group(4), m.group(5))
+            if d and self.mukerrer and int(m.group(6)) == 1 and self.scheme(d) != "eskiler_pdf":
+                return self.index_html(d, 1), "text/html; charset=utf-8", d
+            return None
+        m = _ESKI_RE.match(path)
+        if m:
+            d = _date(m.group(3), m.group(4), m.group(5))
+            if d and m.group(6) == "htm" and self.scheme(d) == "eskiler_htm":
+                return self.index_html(d), "text/html; charset=utf-8", d
+            if d and m.group(6) == "pdf" and (self.issue_pdf or self.scheme(d) == "eskiler_pdf"):
+                return self._pdf(d, 0), "application/pdf", d
+        return None
+
+
+def _date(yyyy, mm, dd):
+    try:
+        return date(int(yyyy), int(mm), int(dd))
+    except ValueError:
+        return None
+
+
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate, self.capacity = rate, burst
+        self.tokens, self.updated = float(burst), time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Behaviour:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate=0.0, burst=5, bandwidth_kb=0, seed=0):
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self.rate, self.burst, self.bandwidth = rate, max(1, burst), bandwidth_kb * 1024
+        self._rnd = random.Random(seed)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def delay(self):
+        with self._lock:
+            return max(0.0, self.latency + self._rnd.uniform(-self.jitter, self.jitter))
+
+    def fail(self):
+        with self._lock:
+            if self.error_rate and self._rnd.random() < self.error_rate:
+                return self._rnd.choice((500, 502, 503))
+        return None
+
+    def throttled(self, client):
+        if self.rate <= 0:
+            return False
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = _TokenBucket(self.rate, self.burst)
+            return not bucket.take()
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.status, self.kinds, self.latencies, self.bytes = {}, {}, [], 0
+            self.started = time.time()
+
+    def add(self, status, kind, seconds, size):
+        with self._lock:
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+            self.kinds[kind] = self.kinds.get(kind, 0) + 1
+            self.latencies.append(seconds)
+            self.bytes += size
+
+    def summary(self):
+        with self._lock:
+            lat = sorted(self.latencies)
+            out = {"requests": len(lat), "status": dict(self.status), "kinds": dict(self.kinds),
+                   "bytes_sent": self.bytes, "seconds": time.time() - self.started}
+        for q in (0.5, 0.95, 0.99):
+            out[f"p{int(q * 100)}_seconds"] = lat[min(len(lat) - 1, int(q * len(lat)))] if lat else 0.0
+        out["max_seconds"] = lat[-1] if lat else 0.0
+        return out
+
+
+def _kind(path):
+    if _DETAY_RE.match(path):
+        return "detail_pdf" if path.endswith(".pdf") else "detail_html"
+    if _GUNLUK_RE.match(path) or _ESKI_RE.match(path) or _MUKERRER_RE.match(path):
+        return "index_pdf" if path.endswith(".pdf") else "index"
+    return "other"
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "RGStandin/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def _send(self, status, body=b"", content_type="text/plain; charset=utf-8", headers=(), head=False):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        if head or not body:
+            return 0
+        bandwidth = self.server.behaviour.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return len(body)
+        # Bant genişliği sınırı: gövde 64 KB'lık parçalar halinde, parça başına bekleyerek yazılır
+        for i in range(0, len(body), 65536):
+            chunk = body[i:i + 65536]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+        return len(body)
+
+    def _serve(self, head):
+        t0 = time.perf_counter()
+        path = self.path.split("?", 1)[0]
+        kind = _kind(path)
+        srv = self.server
+        if path == "/__stats":
+            body = json.dumps(srv.stats.summary()).encode("utf-8")
+            self._send(200, body, "application/json", head=head)
+            return
+        if srv.behaviour.throttled(self.client_address[0]):
+            self._send(429, b"Too Many Requests", headers=[("Retry-After", "1")], head=head)
+            srv.stats.add(429, kind, time.perf_counter() - t0, 0)
+            return
+        time.sleep(srv.behaviour.delay())
+        status = srv.behaviour.fail()
+        if status:
+            self._send(status, b"stand-in error", head=head)
+            srv.stats.add(status, kind, time.perf_counter() - t0, 0)
+            return
+        if path == "/":
+            size = self._send(200, b"<html><body>Resmi Gazete (stand-in)</body></html>", "text/html; charset=utf-8",
+                              head=head)
+            srv.stats.add(200, kind, time.perf_counter() - t0, size)
+            return
+        found = srv.corpus.resolve(path)
+        if found is None:
+            self._send(404, b"Not Found", head=head)
+            srv.stats.add(404, kind, time.perf_counter() - t0, 0)
+            return
+        body, content_type, d = found
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        last_modified = formatdate(time.mktime(d.timetuple()) + 6 * 3600, usegmt=True)
+        headers = [("ETag", etag), ("Last-Modified", last_modified)]
+        inm = self.headers.get("If-None-Match")
+        if (inm and etag in [t.strip() for t in inm.split(",")]) or \
+                (not inm and self.headers.get("If-Modified-Since") == last_modified):
+            self._send(304, headers=headers, head=True)
+            srv.stats.add(304, kind, time.perf_counter() - t0, 0)
+            return
+        size = self._send(200, body, content_type, headers=headers, head=head)
+        srv.stats.add(200, kind, time.perf_counter() - t0, size)
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Aynı anda çok sayıda bağlantı açan istemci için listen kuyruğu geniş tutulur
+    request_queue_size = 256
+
+    def __init__(self, address, corpus, behaviour):
+        super().__init__(address, Handler)
+        self.corpus, self.behaviour, self.stats = corpus, behaviour, Stats()
+
+    def handle_error(self, request, client_address):
+        # İstemcinin (ör. zaman aşımında) kapattığı bağlantılar beklenen durum; iz basılmaz
+        if isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            self.stats.add("reset", "other", 0.0, 0)
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+def start(corpus=None, behaviour=None, host="127.0.0.1", port=0):
+    # Arka plan iş parçacığında başlatır; port 0 ise boş bir port seçilir
+    server = StandinServer((host, port), corpus or Corpus(), behaviour or Behaviour())
+    threading.Thread(target=server.serve_forever, name="standin", daemon=True).start()
+    return server
+
+
+def add_arguments(ap):
+    ap.add_argument("--items", type=int, default=12, help="gün başına fihrist kalemi")
+    ap.add_argument("--pdf-ratio", type=float, default=0.33, help="PDF olan kalemlerin oranı")
+    ap.add_argument("--pdf", action="append", dest="pdfs", help="yalnızca bu fixture PDF'leri (ör. duz_metin.pdf)")
+    ap.add_argument("--no-unique", dest="unique", action="store_false",
+                    help="aynı fixture'ı kullanan belgelerin gövdeleri birebir aynı olsun (içerik deposu testi)")
+    ap.add_argument("--gunluk-since", type=date.fromisoformat, default=date(2020, 1, 1),
+                    help="bu tarihten itibaren günlük (GG.AA.YYYY) fihrist")
+    ap.add_argument("--pdf-before", type=date.fromisoformat, default=date(2006, 1, 1),
+                    help="bu tarihten önce yalnızca tam sayı PDF'i")
+    ap.add_argument("--mukerrer", type=int, default=0, help="günlük fihristten bağlantılı mükerrer sayının kalem sayısı")
+    ap.add_argument("--issue-pdf", action="store_true",
+                    help="fihristi olan günlerde de tam sayı PDF'i sun (eskiler/YYYY/AA/YYYYAAGG.pdf)")
+    ap.add_argument("--latency", type=float, default=0.0, help="yanıt başına ortalama gecikme (sn)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="gecikmeye eklenen ± rastgele sapma (sn)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="500/502/503 dönen isteklerin oranı")
+    ap.add_argument("--rate", type=float, default=0.0, help="istemci başına saniyedeki istek sınırı; aşılınca 429")
+    ap.add_argument("--burst", type=int, default=5)
+    ap.add_argument("--bandwidth", type=int, default=0, help="bağlantı başına KB/sn (0 sınırsız)")
+    ap.add_argument("--seed", type=int, default=0)
+
+
+def from_args(args):
+    corpus = Corpus(items=args.items, pdf_ratio=args.pdf_ratio, pdfs=args.pdfs, unique=args.unique, seed=args.seed,
+                    gunluk_since=args.gunluk_since, pdf_before=args.pdf_before, mukerrer=args.mukerrer,
+                    issue_pdf=args.issue_pdf)
+    behaviour = Behaviour(args.latency, args.jitter, args.error_rate, args.rate, args.burst, args.bandwidth, args.seed)
+    return corpus, behaviour
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Yerel Resmî Gazete yerine geçen test sunucusu")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8800)
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+    server = StandinServer((args.host, args.port), *from_args(args))
+    print(f"[+] {server.base_url} (SCRAPER_BASE={server.base_url})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from http_cache import link_or_copy
+
+# İndirilen gövdenin SHA-256 özetiyle adreslenen çıkarım deposu. Aynı PDF/HTML gövdesi farklı
+# URL'lerden (mükerrer sayılar, düzeltmeler, aynı güne giden farklı aday adresler) yeniden
+# geldiğinde metin, tablolar ve sayfa görselleri bu depodan alınır; çıkarma ve OCR atlanır.
+#
+#   <kök>/<özet[:2]>/<özet>/ham.json.gz     sayfa başına ham çıkarım (reprocess ile aynı biçim)
+#   <kök>/<özet[:2]>/<özet>/pages/...       sayfa görselleri (kayıt klasörlerine sabit bağlantı)
+#   <kök>/index.sqlite                      özet -> tür, görsel adları, tablolar, ilk URL
+
+RAW_NAME = "ham.json.gz"
+
+
+class BlobStore:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(self.root, exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), timeout=60, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                images TEXT,
+                tables TEXT NOT NULL,
+                first_url TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )""")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def blob_dir(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def get(self, sha256, need_images=False):
+        # need_images: görselsiz (parça modunda) oluşmuş kayıt, görsel isteyen klasör kaydına verilmez
+        with self._lock:
+            row = self._conn().execute("SELECT kind, images, tables, first_url FROM blobs WHERE sha256 = ?",
+                                       (sha256,)).fetchone()
+        if not row:
+            return None
+        kind, images, tables, first_url = row
+        if need_images and kind == "pdf" and images is None:
+            return None
+        blob_dir = self.blob_dir(sha256)
+        raw_path = os.path.join(blob_dir, RAW_NAME)
+        if not os.path.exists(raw_path):
+            return None
+        return {"sha256": sha256, "kind": kind, "dir": blob_dir, "raw_path": raw_path,
+                "images": json.loads(images) if images is not None else None,
+                "tablolar": json.loads(tables), "first_url": first_url}
+
+    def put(self, sha256, kind, url, raw_path, tablolar=(), images=None, pages_dir=None):
+        # Dosyalar depoya sabit bağlantıyla eklenir; kayıt klasörü ile depo aynı diski paylaşır.
+        # images None ise görseller bilinmiyor (parça modu); sonradan görselli kayıt gelirse tamamlanır.
+        existing = self.get(sha256)
+        if existing and (existing["images"] is not None or images is None):
+            return False
+        blob_dir = self.blob_dir(sha256)
+        os.makedirs(blob_dir, exist_ok=True)
+        if not existing:
+            tmp = os.path.join(blob_dir, f".{RAW_NAME}.{os.getpid()}.{threading.get_ident()}")
+            link_or_copy(raw_path, tmp)
+            os.replace(tmp, os.path.join(blob_dir, RAW_NAME))
+        if images and pages_dir and os.path.isdir(pages_dir):
+            dest = os.path.join(blob_dir, "pages")
+            os.makedirs(dest, exist_ok=True)
+            for name in os.listdir(pages_dir):
+                target = os.path.join(dest, name)
+                if not os.path.exists(target):
+                    link_or_copy(os.path.join(pages_dir, name), target)
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("""INSERT INTO blobs (sha256, kind, images, tables, first_url, created_at, used_at)
+                          VALUES (?, ?, ?, ?, ?, ?, ?)
+                          ON CONFLICT(sha256) DO UPDATE SET images = excluded.images""",
+                       (sha256, kind, json.dumps(images) if images is not None else None,
+                        json.dumps(list(tablolar), ensure_ascii=False), url, now, now))
+            db.commit()
+        return True
+
+    def link_pages(self, entry, dest_dir):
+        # Depodaki görselleri (varsa) hedef klasöre bağlar; PAGE_IMAGES=lazy görselleri depoda olmayabilir
+        src = os.path.join(entry["dir"], "pages")
+        if not entry["images"] or not os.path.isdir(src):
+            return
+        os.makedirs(dest_dir, exist_ok=True)
+        for name in os.listdir(src):
+            target = os.path.join(dest_dir, name)
+            if not os.path.exists(target):
+                link_or_copy(os.path.join(src, name), target)
+
+    def touch(self, sha256):
+        with self._lock:
+            db = self._conn()
+            db.execute("UPDATE blobs SET hits = hits + 1, used_at = ? WHERE sha256 = ?", (time.time(), sha256))
+            db.commit()
+
+    def stats(self):
+        with self._lock:
+            row = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM blobs").fetchone()
+        return {"blobs": row[0], "hits": row[1]}
@@ -0,0 +1,165 @@
+import re
+from itertools import islice
+
+# Metin temizleme kuralları. TextCleaner bunları bir kez derleyip birleşik
+# alternasyonlara çevirir; satır kuralları tek geçişte uygulanır.
+
+WS_CHARS = "\xa0\u2009\u202f\u2007\u200a\u2002\u2003\u2004\u2005\u2006"
+
+HEADER_FOOTER_PATTERNS = [
+    (r"\d{1,2} [A-Za-zÇĞİÖŞÜçğıöşü]+ \d{4}(,|\s)?(PAZAR|PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ)?", re.I),
+    (r"Sayı\s*:\s*\d{5}", 0),
+]
+HEADER_FOOTER_SUBSTRINGS = ["resmî gazete"]
+HEADER_FOOTER_LINES = ["YÖNETMELİK", "TEBLİĞ", "KURUL KARARI", "GENELGE", "İLAN"]
+
+HEADER_LINE_PATTERNS = [
+    r"^\s*\d{1,2}\s+[A-Za-zÇĞİÖŞÜçğıöşü]+\s+\d{4}(?:\s+[PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ|PAZAR]*)?$",
+    r"^\s*Resm[iî] Gazete\s*$",
+    r"^\s*Sayı\s*:\s*\d+",
+    r"^\s*Karar\s*No\s*:?\s*\d+",
+    r"^\s*Karar\s*Tarihi\s*:?\s*\d{1,2}/\d{1,2}/\d{4}",
+    r"^\s*\(.*?\)$",
+]
+
+APPENDIX_MARKERS = [
+    r"\bTARİHLİ\s+VE\s+\d+\s+SAYILI\s+CUMHURBAŞKANI\s+KARARININ\s+EK[İI]\b",
+    r"CUMHURBAŞKANI\s+KARARININ\s+EK[İI]",
+    r"\bEK[-–—]?\s*\d+\b",
+    r"\bEK[İI]\b",
+    r"\bL[İI]STE\b",
+    r"\bKROK[İI]\b",
+    r"\bKOORD[İI]NAT\s+L[İI]STES[İI]\b",
+    r"\bHAR[İI]TA\b",
+    r"\bTABLO\b",
+    r"\bŞEMA\b",
+    r"\bÇİZELGE\b",
+    r"\bGRAF[İI]K\b",
+    r"\bPROJE\s+ALANI\b",
+    r"\bALAN\s+BÜYÜKLÜĞÜ\b"
+]
+
+COORD_LETTERS = r"[A-Za-zÇĞİÖŞÜçğıöşü]"
+
+
+def _alternation(patterns, flags=0):
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+def _scoped(pattern, flags):
+    return f"(?i:{pattern})" if flags & re.I else f"(?:{pattern})"
+
+
+class TextCleaner:
+    def __init__(self, ws_chars=WS_CHARS, header_footer_patterns=HEADER_FOOTER_PATTERNS,
+                 header_footer_substrings=HEADER_FOOTER_SUBSTRINGS, header_footer_lines=HEADER_FOOTER_LINES,
+                 header_line_patterns=HEADER_LINE_PATTERNS, appendix_markers=APPENDIX_MARKERS,
+                 min_keep_chars=400, coord_max_letters=3, coord_min_digits=6):
+        # Özel boşluk karakterlerinin değiştirilmesi, boşluk/sekme dizilerinin teke indirilmesi ve
+        # satır sonu tirelerinin birleştirilmesi tek regex geçişinde yapılır. Tek bir " " zaten
+        # sonuçla aynı olduğundan eşleşmez; yalnızca değişecek diziler yakalanır.
+        ws = re.escape(ws_chars)
+        spaces = rf"[ \t{ws}]{{2,}}|[\t{ws}]"
+        self.ws_re = re.compile(rf"{spaces}|\n{{3,}}")
+        self.ws_dehyphen_re = re.compile(rf"{spaces}|\n{{3,}}|(\w)-\n(\w)")
+        self.dehyphen_re = re.compile(r"(\w)-\n(\w)")
+        self.header_footer_re = re.compile("|".join(_scoped(p, f) for p, f in header_footer_patterns))
+        self.header_footer_substrings = tuple(header_footer_substrings)
+        self.header_footer_lines = frozenset(header_footer_lines)
+        self.header_line_re = _alternation(header_line_patterns, re.I)
+        self.appendix_re = _alternation(appendix_markers, re.I)
+        self.min_keep_chars = min_keep_chars
+        self.coord_letter_re = re.compile(COORD_LETTERS)
+        self.digit_re = re.compile(r"\d")
+        self.coord_max_letters = coord_max_letters
+        self.coord_min_digits = coord_min_digits
+        self.blank_runs_re = re.compile(r"\n{3,}")
+
+    def normalize_ws(self, text):
+        return self.ws_re.sub(lambda m: "\n\n" if m.group(0)[0] == "\n" else " ", text or "").strip()
+
+    def dehyphenate(self, text):
+        return self.dehyphen_re.sub(r"\1\2", text)
+
+    def _normalize_dehyphenate(self, text):
+        def repl(m):
+            if m.group(1) is not None:
+                return m.group(1) + m.group(2)
+            return "\n\n" if m.group(0)[0] == "\n" else " "
+
+        return self.ws_dehyphen_re.sub(repl, text or "").strip()
+
+    def _is_header_footer(self, s):
+        if self.header_footer_re.match(s):
+            return True
+        low = s.lower()
+        if any(sub in low for sub in self.header_footer_substrings):
+            return True
+        return s in self.header_footer_lines
+
+    def strip_headers_footers(self, text):
+        return "\n".join(ln for ln in text.splitlines() if not self._is_header_footer(ln.strip())).strip()
+
+    def cut_after_appendix_markers(self, text, min_keep_chars=None):
+        if not text:
+            return text
+        min_keep_chars = self.min_keep_chars if min_keep_chars is None else min_keep_chars
+        m = self.appendix_re.search(text.upper())
+        if m and m.start() > min_keep_chars:
+            return text[:m.start()].rstrip()
+        return text
+
+    def _is_coordinate_like(self, s):
+        letters = sum(1 for _ in islice(self.coord_letter_re.finditer(s), self.coord_max_letters))
+        return letters < self.coord_max_letters and len(self.digit_re.findall(s)) >= self.coord_min_digits
+
+    def drop_coordinate_like_lines(self, text):
+        out = []
+        for ln in (text or "").splitlines():
+            s = ln.strip()
+            if s and self._is_coordinate_like(s):
+                continue
+            out.append(ln)
+        return "\n".join(out)
+
+    def strip_appendix_parts(self, text):
+        t = self.cut_after_appendix_markers(text)
+        t = self.drop_coordinate_like_lines(t)
+        return self.blank_runs_re.sub("\n\n", t).strip()
+
+    def strip_header_lines(self, text):
+        return "\n".join(ln for ln in text.splitlines() if not self.header_line_re.match(ln.strip())).strip()
+
+    def _tail_lines(self, text, header_lines):
+        # Ek sonrası satır kuralları tek geçişte: koordinat satırlarını at, üç ve daha fazla
+        # boş satırı ikiye indir (blank_runs_re ile aynı), ardından baş/son boşlukları kırp.
+        out, blanks = [], 0
+        for ln in text.split("\n"):
+            if ln == "":
+                blanks += 1
+                continue
+            s = ln.strip()
+            if s and self._is_coordinate_like(s):
+                continue
+            if blanks:
+                out.extend([""] * (1 if blanks >= 2 else blanks))
+                blanks = 0
+            out.append(ln)
+        while out and not out[0].strip():
+            out.pop(0)
+        while out and not out[-1].strip():
+            out.pop()
+        if not out:
+            return ""
+        out[0] = out[0].lstrip()
+        out[-1] = out[-1].rstrip()
+        if header_lines:
+            out = [ln for ln in out if not self.header_line_re.match(ln.strip())]
+            return "\n".join(out).strip()
+        return "\n".join(out)
+
+    def clean(self, text, header_lines=False):
+        text = self._normalize_dehyphenate(text)
+        text = self.strip_headers_footers(text)
+        text = self.cut_after_appendix_markers(text)
+        return self._tail_lines(text, header_lines)
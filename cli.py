@@ -0,0 +1,293 @@
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime
+
+from work_queue import STAGES, STATUSES, WorkQueue, enqueue_days
+
+# Komut satırı giriş noktası. main (requests, pydantic, BeautifulSoup ve ilk kullanımda PDF/OCR
+# yığını) yalnızca onu gerektiren alt komutlarda içe aktarılır; show, stats ve queue kayıtları,
+# manifest'i ve kuyruğu doğrudan okur.
+#
+#   python cli.py run --days 3 --out-dir /veri/rg
+#   python cli.py show output/15012024_32430_YÖNETMELİKLER_001
+#   python cli.py stats
+
+
+def _parse_day(s):
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"geçersiz tarih: {s} (YYYY-MM-DD ya da GG.AA.YYYY)")
+
+
+def _out_dir(args):
+    return args.out_dir or os.getenv("SCRAPER_OUT_DIR", "output")
+
+
+def _load_main(args):
+    # Modül sabitleri ortam değişkenlerinden okunduğu için ayarlar içe aktarmadan önce yazılır
+    if args.out_dir:
+        os.environ["SCRAPER_OUT_DIR"] = args.out_dir
+    import main
+
+    if args.offline:
+        main.set_offline()
+    return main
+
+
+def cmd_run(args):
+    main = _load_main(args)
+    main.main(days=args.days or main.DAY_WINDOW)
+
+
+def cmd_backfill(args):
+    _load_main(args).main_backfill(args)
+
+
+def cmd_watch(args):
+    _load_main(args).main_watch(args)
+
+
+def cmd_worker(args):
+    _load_main(args).main_worker(args)
+
+
+def cmd_reprocess(args):
+    _load_main(args).main_reprocess(args)
+
+
+def _queue(args):
+    return WorkQueue(args.queue or os.getenv("SCRAPER_QUEUE", os.path.join(_out_dir(args), "queue.sqlite")))
+
+
+def cmd_queue(args):
+    queue = _queue(args)
+    if args.queue_cmd == "add":
+        n = enqueue_days(queue, args.start, args.end or args.start)
+        print(f"[=] {n} gün kuyruğa eklendi.")
+    elif args.queue_cmd == "requeue":
+        print(f"[=] {queue.requeue_dead(args.stage)} iş yeniden kuyruğa alındı.")
+    elif args.queue_cmd == "dead":
+        for job in queue.dead(args.stage):
+            print(f"{job['stage']:<8} {job['key']}  ({job['attempts']} deneme)  {job['last_error']}")
+    else:
+        _print_queue_stats(queue.stats())
+
+
+def _print_queue_stats(stats):
+    print(f"{'aşama':<10}" + "".join(f"{s:>9}" for s in STATUSES))
+    for stage in STAGES:
+        counts = stats.get(stage, {})
+        print(f"{stage:<10}" + "".join(f"{counts.get(s, 0):>9}" for s in STATUSES))
+
+
+def _manifest_path(args):
+    return os.getenv("SCRAPER_MANIFEST", os.path.join(_out_dir(args), "manifest.sqlite"))
+
+
+def _find_record(args):
+    # Kayıt klasörü, data.json yolu, klasör adı ya da kaynak URL (manifest üzerinden)
+    target = args.target
+    for path in (target, os.path.join(target, "data.json"), os.path.join(_out_dir(args), target, "data.json")):
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f), path
+    if not os.path.exists(_manifest_path(args)):
+        return None, None
+    db = sqlite3.connect(_manifest_path(args))
+    try:
+        row = db.execute("SELECT record_path FROM items WHERE url = ? AND status = 'done'", (target,)).fetchone()
+    finally:
+        db.close()
+    if not row or not row[0]:
+        return None, None
+    path = row[0]
+    if not os.path.isabs(path) and not os.path.exists(path):
+        # Göreli yollar çalıştırmanın yapıldığı klasöre göredir (ör. "output/..." -> çıktı klasörünün üstü)
+        path = os.path.join(os.path.dirname(os.path.abspath(_out_dir(args))), path)
+    if os.path.isfile(path) and path.endswith("data.json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f), path
+    from sinks import is_shard_path, iter_shard
+
+    if is_shard_path(path) and os.path.isfile(path):
+        for rec in iter_shard(path):
+            if str(rec.kaynak_url) == target:
+                return rec.model_dump(mode="json"), path
+    return None, None
+
+
+def cmd_show(args):
+    data, path = _find_record(args)
+    if data is None:
+        print(f"Kayıt bulunamadı: {args.target}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+        return 0
+    print(f"{data['tarih']}  sayı {data['sayi']}  {data['kategori']}")
+    print(data["baslik"])
+    if data.get("karar_kanun_no"):
+        print(f"Karar/Kanun no: {data['karar_kanun_no']}")
+    print(f"Kaynak: {data['kaynak_url']}")
+    print(f"Kayıt:  {path}")
+    extras = []
+    if data.get("pdf_dosyasi"):
+        extras.append(data["pdf_dosyasi"])
+    if data.get("sayfa_resimleri"):
+        extras.append(f"{len(data['sayfa_resimleri'])} sayfa görseli")
+    if data.get("tablolar"):
+        extras.append(f"{len(data['tablolar'])} tablo")
+    if data.get("kismi"):
+        pages = ", ".join(str(p) for p in data.get("eksik_sayfalar") or [])
+        extras.append(f"KISMİ (eksik sayfalar: {pages or 'tablolar'})")
+    if extras:
+        print("Ekler:  " + ", ".join(extras))
+    if args.images:
+        _show_images(data, path)
+    metin = data.get("metin") or ""
+    print()
+    print(metin if args.full or len(metin) <= 1500 else metin[:1500] + f"\n… ({len(metin)} karakter, --full)")
+    return 0
+
+
+def _show_images(data, path):
+    # Eksik (PAGE_IMAGES=lazy) görseller kaynak.pdf'ten çizilir; main yalnızca bu seçenekte yüklenir
+    if not path.endswith("data.json") or not data.get("sayfa_resimleri"):
+        print("Görsel: kayıt klasörü ya da sayfa görseli yok")
+        return
+    from main import ensure_page_image
+
+    record_dir = os.path.dirname(path)
+    for rel in data["sayfa_resimleri"]:
+        print(f"Görsel: {ensure_page_image(record_dir, rel) or rel + ' [çizilemedi]'}")
+
+
+def cmd_stats(args):
+    out_dir = _out_dir(args)
+    folders = 0
+    if os.path.isdir(out_dir):
+        folders = sum(1 for name in os.listdir(out_dir) if os.path.isfile(os.path.join(out_dir, name, "data.json")))
+    print(f"Çıktı klasörü: {out_dir} ({folders} kayıt klasörü)")
+
+    if os.path.exists(_manifest_path(args)):
+        db = sqlite3.connect(_manifest_path(args))
+        try:
+            items = db.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()
+            try:
+                days = db.execute("SELECT status, COUNT(*), MIN(date), MAX(date) FROM days GROUP BY status").fetchall()
+            except sqlite3.OperationalError:
+                days = []
+        finally:
+            db.close()
+        print("Manifest: " + (", ".join(f"{s} {n}" for s, n in items) or "boş"))
+        for status, n, first, last in days:
+            print(f"  gün {status:<6} {n:>6}  ({first} … {last})")
+
+    blob_index = os.path.join(os.getenv("BLOB_STORE", os.path.join(out_dir, "blobs")), "index.sqlite")
+    if os.path.exists(blob_index):
+        db = sqlite3.connect(blob_index)
+        try:
+            n, hits = db.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM blobs").fetchone()
+        finally:
+            db.close()
+        print(f"İçerik deposu: {n} gövde, {hits} yeniden kullanım")
+
+    queue_path = args.queue or os.getenv("SCRAPER_QUEUE", os.path.join(out_dir, "queue.sqlite"))
+    if os.path.exists(queue_path):
+        print(f"Kuyruk: {queue_path}")
+        _print_queue_stats(WorkQueue(queue_path).stats())
+
+    metrics_path = os.getenv("METRICS_JSON", os.path.join(out_dir, "run_metrics.json"))
+    if metrics_path and os.path.exists(metrics_path):
+        with open(metrics_path, encoding="utf-8") as f:
+            summary = json.load(f)
+        finished = datetime.fromtimestamp(summary.get("finished_at", 0)).strftime("%Y-%m-%d %H:%M")
+        print(f"Son çalışma: {finished}, {summary.get('duration_seconds', 0):.0f} sn")
+        for name, value in sorted(summary.get("counters", {}).items()):
+            print(f"  {name:<40} {value:>10}")
+    return 0
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Resmî Gazete kayıt toplayıcı")
+    ap.add_argument("--offline", action="store_true", help="yalnızca HTTP önbelleğinden oku, ağa çıkma")
+    ap.add_argument("--out-dir", help="çıktı klasörü (varsayılan SCRAPER_OUT_DIR ya da output)")
+    sub = ap.add_subparsers(dest="cmd")
+
+    rn = sub.add_parser("run", help="son günleri işle (varsayılan komut)")
+    rn.add_argument("--days", type=int, help="bugünden geriye gün sayısı (varsayılan SCRAPER_DAYS ya da 7)")
+    rn.set_defaults(func=cmd_run)
+
+    bf = sub.add_parser("backfill", help="geçmiş tarih aralığını işle (kaldığı yerden devam eder)")
+    bf.add_argument("start", type=_parse_day)
+    bf.add_argument("end", type=_parse_day)
+    bf.add_argument("--partitions", type=int, default=int(os.getenv("BACKFILL_PARTITIONS", "4")),
+                    help="aynı anda işlenen gün sayısı")
+    bf.add_argument("--budget", type=int, default=int(os.getenv("BACKFILL_REQUEST_BUDGET", "0")),
+                    help="bu çalışmada yapılacak en fazla ağ isteği (0 sınırsız)")
+    bf.add_argument("--retry-empty", action="store_true", help="içerik bulunamamış günleri yeniden dene")
+    bf.set_defaults(func=cmd_backfill)
+
+    wt = sub.add_parser("watch", help="bugünün sayısını sürekli izle, yeni kayıtları kancalara gönder")
+    wt.add_argument("--interval", type=float, default=float(os.getenv("WATCH_INTERVAL", "120")),
+                    help="yoklama aralığı (sn)")
+    wt.add_argument("--hook", action="append", default=[],
+                    help="stdout | http(s)://adres | file:/klasör (birden fazla verilebilir)")
+    wt.add_argument("--once", action="store_true", help="tek yoklama yap ve çık")
+    wt.set_defaults(func=cmd_watch)
+
+    qu = sub.add_parser("queue", help="kalıcı iş kuyruğunu yönet")
+    qu.add_argument("--queue", help="kuyruk dosyası (varsayılan SCRAPER_QUEUE)")
+    qsub = qu.add_subparsers(dest="queue_cmd")
+    qa = qsub.add_parser("add", help="gün aralığını keşif aşamasına ekle")
+    qa.add_argument("start", type=_parse_day)
+    qa.add_argument("end", type=_parse_day, nargs="?")
+    qsub.add_parser("stats", help="aşama/durum başına iş sayıları")
+    for name, help_text in (("dead", "kalıcı olarak başarısız işleri listele"),
+                            ("requeue", "kalıcı olarak başarısız işleri yeniden kuyruğa al")):
+        qd = qsub.add_parser(name, help=help_text)
+        qd.add_argument("--stage", choices=STAGES)
+    qu.set_defaults(func=cmd_queue)
+
+    wk = sub.add_parser("worker", help="kuyruktaki bir aşamanın işlerini işle")
+    wk.add_argument("stage", choices=STAGES, help="ocr_retry: süre bütçesi yüzünden ertelenen OCR sayfaları")
+    wk.add_argument("--queue", help="kuyruk dosyası (varsayılan SCRAPER_QUEUE)")
+    wk.add_argument("--threads", type=int, default=1, help="aynı süreçte kiralanan iş sayısı")
+    wk.add_argument("--drain", action="store_true", help="önceki aşamalarda da iş kalmayınca çık")
+    wk.add_argument("--idle-sleep", type=float, default=5.0, help="iş yokken bekleme süresi (sn)")
+    wk.set_defaults(func=cmd_worker)
+
+    rp = sub.add_parser("reprocess", help="ham önbellekten metin, başlık ve karar no alanlarını yeniden türet")
+    rp.add_argument("--shard-dir", help="parça klasörü (varsayılan RECORD_SHARD_DIR ya da <çıktı>/records)")
+    rp.add_argument("--workers", type=int, default=0, help="süreç sayısı (0: çekirdek sayısı)")
+    rp.set_defaults(func=cmd_reprocess)
+
+    sh = sub.add_parser("show", help="tek kaydı göster (klasör, data.json yolu ya da kaynak URL)")
+    sh.add_argument("target")
+    sh.add_argument("--json", action="store_true", help="kaydı JSON olarak yaz")
+    sh.add_argument("--full", action="store_true", help="metnin tamamını yaz")
+    sh.add_argument("--images", action="store_true", help="sayfa görsellerinin yollarını yaz, eksikleri (lazy) çiz")
+    sh.set_defaults(func=cmd_show)
+
+    st = sub.add_parser("stats", help="kayıt, manifest, kuyruk ve son çalışma özetleri")
+    st.add_argument("--queue", help="kuyruk dosyası (varsayılan SCRAPER_QUEUE)")
+    st.set_defaults(func=cmd_stats)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.cmd is None:
+        args.days = None
+        args.func = cmd_run
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import lxml.html
+from lxml import etree
+from bs4.dammit import EncodingDetector
+
+# BeautifulSoup ağacı kurmadan doğrudan lxml üzerinde çalışan yardımcılar. Metin çıkarma
+# BeautifulSoup'un get_text kurallarıyla aynıdır: script/style/template/rt/rp içindeki
+# metinler ve yorumlar atlanır, parçalar strip edilip ayraçla birleştirilir.
+
+# BeautifulSoup'un HTML ağaç kurucusunda NavigableString dışı metin kabı sayılan etiketler
+_NON_TEXT = frozenset(("script", "style", "template", "rt", "rp"))
+
+
+def parse(content):
+    # Kodlama BeautifulSoup(..., "lxml") ile aynı sırayla denenir (EncodingDetector adayları);
+    # lxml'in meta etiketi olmayan sayfalarda latin-1 varsayması çıktıyı değiştirirdi.
+    if isinstance(content, bytes):
+        for encoding in EncodingDetector(content, is_html=True).encodings:
+            try:
+                parser = lxml.html.HTMLParser(encoding=encoding, recover=True)
+                return lxml.html.document_fromstring(content, parser=parser)
+            except (UnicodeDecodeError, LookupError, etree.ParserError):
+                continue
+    try:
+        return lxml.html.document_fromstring(content)
+    except etree.ParserError:
+        # Boş gövde (ya da yalnızca boşluk/yorum): BeautifulSoup boş bir ağaç döndürür
+        return lxml.html.document_fromstring("<html></html>")
+
+
+def is_element(el):
+    return isinstance(el.tag, str)
+
+
+def classes(el):
+    return (el.get("class") or "").split()
+
+
+def _strings(el, ctx, want, drop=frozenset()):
+    # ctx: metnin içinde bulunduğu en içteki metin kabı (yoksa None). BeautifulSoup bir öğenin
+    # get_text'inde yalnızca öğenin kendi türündeki metinleri döndürür.
+    if el.text and ctx == want:
+        yield el.text
+    for ch in el:
+        if is_element(ch) and ch.tag not in drop:
+            yield from _strings(ch, ch.tag if ch.tag in _NON_TEXT else ctx, want, drop)
+        if ch.tail and ctx == want:
+            yield ch.tail
+
+
+def _container(el):
+    for a in el.iterancestors():
+        if a.tag in _NON_TEXT:
+            return a.tag
+    return None
+
+
+def get_text(el, sep=""):
+    want = el.tag if el.tag in _NON_TEXT else None
+    ctx = want or _container(el)
+    return sep.join(s for s in (t.strip() for t in _strings(el, ctx, want)) if s)
+
+
+def find_id(root, value):
+    for el in root.iter():
+        if is_element(el) and el.get("id") == value:
+            return el
+    return None
+
+
+def find_tag(root, tag):
+    return next(root.iter(tag), None)
+
+
+def document_text(root, sep="\n", drop=("script", "style", "noscript")):
+    # clean_text(soup) karşılığı: verilen etiketler (decompose gibi) atlanır, kuyruk metinleri ayrı
+    # parça olarak kalır (ağaçtan silmek komşu metinleri birleştirirdi)
+    return sep.join(s for s in (t.strip() for t in _strings(root, None, None, frozenset(drop))) if s)
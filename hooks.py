@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import time
+import hashlib
+
+import requests
+
+# İzleme modunda biten her kayıt bu kancalara gönderilir:
+#   stdout              -> standart çıktıya JSON satırı
+#   http(s)://...       -> JSON gövdeli POST (yerel webhook)
+#   file:/klasör        -> klasöre atomik olarak yazılan <zaman>_<url özeti>.json dosyası
+
+# Webhook'a teslim edilemeyen kayıtların eklendiği JSON satırları dosyası; boşsa yalnızca uyarı yazılır
+DEAD_LETTER = os.getenv("WEBHOOK_DEAD_LETTER", "")
+
+
+class StdoutHook:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class WebhookHook:
+    def __init__(self, url, timeout=10, retries=3, dead_letter=None):
+        self.url, self.timeout, self.retries = url, timeout, retries
+        self.dead_letter = DEAD_LETTER if dead_letter is None else dead_letter
+
+    def __call__(self, record):
+        error = None
+        for attempt in range(self.retries):
+            if attempt:
+                time.sleep(2 ** (attempt - 1))
+            try:
+                r = requests.post(self.url, json=record, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = e
+                continue
+            if r.status_code < 500:
+                if r.status_code >= 400:
+                    print(f"   [UYARI] Webhook {self.url} {r.status_code} döndü: {record.get('kaynak_url')}",
+                          file=sys.stderr)
+                return
+            error = f"{r.status_code} döndü"
+        self._give_up(record, error)
+
+    def _give_up(self, record, error):
+        # Denemeler bitti; kayıt sessizce kaybolmasın, varsa ölü mektup dosyasına eklenir
+        where = ""
+        if self.dead_letter:
+            os.makedirs(os.path.dirname(self.dead_letter) or ".", exist_ok=True)
+            with open(self.dead_letter, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            where = f", {self.dead_letter} dosyasına yazıldı"
+        print(f"   [UYARI] Webhook {self.url} {self.retries} denemede teslim edilemedi ({error}): "
+              f"{record.get('kaynak_url')}{where}", file=sys.stderr)
+
+
+class FileDropHook:
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def __call__(self, record):
+        digest = hashlib.sha1(str(record.get("kaynak_url", "")).encode("utf-8")).hexdigest()[:12]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}_{digest}.json"
+        path = os.path.join(self.folder, name)
+        # Klasörü izleyen tüketiciler yarım dosya görmesin diye .tmp üzerinden taşınır
+        tmp = os.path.join(self.folder, f".{name}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def make_hook(spec, stdout=None):
+    if spec in ("-", "stdout"):
+        return StdoutHook(stdout)
+    if spec.startswith(("http://", "https://")):
+        return WebhookHook(spec)
+    if spec.startswith("file:"):
+        return FileDropHook(spec[len("file:"):])
+    raise ValueError(f"Bilinmeyen kanca: {spec} (stdout, http(s)://..., file:/klasör)")
@@ -0,0 +1,203 @@
+import os
+import time
+import sqlite3
+import shutil
+import hashlib
+import threading
+
+from requests.structures import CaseInsensitiveDict
+
+
+class CachedResponse:
+    def __init__(self, url, status_code, content=b"", headers=None, from_cache=True, path=None):
+        self.url = url
+        self.status_code = status_code
+        self._content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.from_cache = from_cache
+        # Gövde diskteki blob'dan okunur; büyük PDF'ler belleğe alınmadan kopyalanabilir
+        self.path = path
+
+    @property
+    def content(self):
+        if self._content is None and self.path:
+            with open(self.path, "rb") as f:
+                self._content = f.read()
+        return self._content
+
+    def iter_content(self, chunk_size=1024 * 1024):
+        if self.path is None:
+            yield self.content
+            return
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def close(self):
+        pass
+
+
+class HttpCache:
+    # Gövdeler SHA-256 ile adreslenir (blobs/ab/<hash>); URL -> gövde eşlemesi SQLite'ta tutulur.
+    # Aynı içerik farklı URL'lerden gelse de diskte tek kopya olur.
+
+    def __init__(self, root, max_bytes=2 * 1024 ** 3, offline=False):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+            db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self.root, "blobs", body_hash[:2], body_hash)
+
+    def lookup(self, url):
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT url, body_hash, size, content_type, etag, last_modified, fetched_at FROM entries WHERE url = ?",
+                (url,)).fetchone()
+        if not row:
+            return None
+        entry = dict(zip(("url", "body_hash", "size", "content_type", "etag", "last_modified", "fetched_at"), row))
+        if not os.path.exists(self._blob_path(entry["body_hash"])):
+            return None
+        return entry
+
+    def is_fresh(self, entry, ttl):
+        if ttl is None:
+            return False
+        return ttl < 0 or time.time() - entry["fetched_at"] < ttl
+
+    def response(self, entry):
+        with self._lock:
+            db = self._conn()
+            db.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), entry["url"]))
+            db.commit()
+        headers = {"Content-Type": entry["content_type"] or ""}
+        if entry["etag"]: headers["ETag"] = entry["etag"]
+        if entry["last_modified"]: headers["Last-Modified"] = entry["last_modified"]
+        return CachedResponse(entry["url"], 200, None, headers, path=self._blob_path(entry["body_hash"]))
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def revalidated(self, entry, resp_headers):
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, resp_headers.get("ETag"), resp_headers.get("Last-Modified"), entry["url"]))
+            db.commit()
+        entry["fetched_at"] = now
+
+    def store(self, url, body, headers):
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        self._index(url, body_hash, len(body), headers)
+
+    def store_file(self, url, src_path, headers, body_hash=None):
+        # Akışla diske yazılmış bir gövdeyi önbelleğe alır; mümkünse sabit bağlantıyla (kopyasız)
+        if body_hash is None:
+            h = hashlib.sha256()
+            with open(src_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            body_hash = h.hexdigest()
+        path = self._blob_path(body_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            link_or_copy(src_path, tmp)
+            os.replace(tmp, path)
+        self._index(url, body_hash, os.path.getsize(path), headers)
+
+    def _index(self, url, body_hash, size, headers):
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (url, body_hash, size, headers.get("Content-Type"), headers.get("ETag"),
+                        headers.get("Last-Modified"), now, now))
+            db.commit()
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            db = self._conn()
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT body_hash, size FROM entries)").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            target = self.max_bytes * 0.9
+            rows = db.execute("SELECT url, body_hash, size FROM entries ORDER BY accessed_at").fetchall()
+            for url, body_hash, size in rows:
+                if total <= target:
+                    break
+                db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                if not db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone():
+                    try:
+                        os.remove(self._blob_path(body_hash))
+                    except OSError:
+                        pass
+                    total -= size
+            db.commit()
+
+    def fetch(self, send, url, ttl=None, headers=None, **kwargs):
+        entry = self.lookup(url)
+        if entry and (self.offline or self.is_fresh(entry, ttl)):
+            return self.response(entry)
+        if self.offline:
+            # Çevrimdışı modda ağa hiç çıkılmaz; önbellekte yoksa 504 döner
+            return CachedResponse(url, 504, from_cache=False)
+
+        headers = dict(headers or {})
+        if entry:
+            headers.update(self.conditional_headers(entry))
+        r = send(url, headers=headers, **kwargs)
+        if r.status_code == 304 and entry:
+            r.close()
+            self.revalidated(entry, r.headers)
+            return self.response(entry)
+        # stream=True ile alınan gövdeyi çağıran diske yazar ve store_file ile önbelleğe ekler
+        if r.status_code == 200 and not kwargs.get("stream"):
+            self.store(url, r.content, r.headers)
+        return r
+
+
+def link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
@@ -0,0 +1,36 @@
+import importlib
+import importlib.util
+
+# Ağır bağımlılıklar (PyMuPDF, Tesseract, PIL, pdfminer, pyarrow) modül yüklenirken değil, ilk
+# kullanıldıkları anda içe aktarılır; indirme, izleme ve listeleme gibi kısa işler bu maliyeti ödemez.
+
+
+class LazyModule:
+    def __init__(self, name, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import is not None:
+                self._on_import(module)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<LazyModule {self._name} {'yüklü' if self._module else 'yüklenmedi'}>"
+
+
+def available(name):
+    # Modülü içe aktarmadan kurulu olup olmadığına bakar
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
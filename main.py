@@ -1,48 +1,62 @@
 import os
 import re
 import time
+import gzip
 import hashlib
 import json
+import mmap
+import multiprocessing
+import shlex
+import socket
+import sys
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from io import BytesIO
 
 import requests
 from bs4 import BeautifulSoup
 from dateutil import tz
-from models import ResmiGazeteKaydi
+from models import ResmiGazeteKaydi, Tablo
+from http_cache import HttpCache, link_or_copy
+from manifest import Manifest
+from work_queue import RETRY_STAGE, STAGES, WorkQueue
+from cleaning import TextCleaner
+from tables import TABLE_MARKER_RE, extract_tables
+from metrics import METRICS
+import fast_html
+from sinks import is_shard_path, open_sink, rewrite_shard, shard_paths
+from hooks import StdoutHook, make_hook
+from search_index import SearchIndex
+from blob_store import BlobStore
 
 
-from pdfminer.high_level import extract_text as pdf_extract_text, extract_pages
-from pdfminer.layout import LAParams, LTTextContainer
+from lazy import LazyModule, available
 
-try:
-    import fitz
+# PDF/OCR yığını ilk kullanımda yüklenir (bkz. lazy.py); bayraklar yalnızca kurulu olup olmadığını söyler
+PYMUPDF_OK = available("fitz")
+fitz = LazyModule("fitz")
 
-    PYMUPDF_OK = True
-except Exception:
-    fitz = None
-    PYMUPDF_OK = False
-
-try:
-    import pytesseract
 
+def _tesseract_setup(module):
     if os.getenv("TESSERACT_CMD"):
-        pytesseract.pytesseract.tesseract_cmd = os.getenv("TESSERACT_CMD")
-    TESSERACT_OK = True
-except Exception:
-    pytesseract = None
-    TESSERACT_OK = False
+        module.pytesseract.tesseract_cmd = os.getenv("TESSERACT_CMD")
+
 
-try:
-    from PIL import Image, ImageOps, ImageFilter
+TESSERACT_OK = available("pytesseract")
+pytesseract = LazyModule("pytesseract", on_import=_tesseract_setup)
 
-    PIL_OK = True
-except Exception:
-    Image = ImageOps = ImageFilter = None
-    PIL_OK = False
+PIL_OK = available("PIL")
+Image, ImageOps, ImageFilter = LazyModule("PIL.Image"), LazyModule("PIL.ImageOps"), LazyModule("PIL.ImageFilter")
 
-BASE = "https://www.resmigazete.gov.tr/"
+# Yük testlerinde yerel sunucuya yönlendirmek için (bkz. bench/standin_server.py)
+BASE = os.getenv("SCRAPER_BASE", "https://www.resmigazete.gov.tr/").rstrip("/") + "/"
 SESSION = requests.Session()
 SESSION.headers.update({
     "User-Agent": "Mozilla/5.0 (compatible; resmigazete-scraper/1.1)",
@@ -50,8 +64,59 @@ SESSION.headers.update({
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 })
 
-OUT_DIR = "output"
-os.makedirs(OUT_DIR, exist_ok=True)
+# Eşzamanlı detay indirme sayısı ve host başına nezaket sınırı (istek/sn)
+FETCH_CONCURRENCY = max(1, int(os.getenv("SCRAPER_CONCURRENCY", "4")))
+HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", "2.5"))
+HOST_BURST = max(1, int(os.getenv("SCRAPER_HOST_BURST", "1")))
+# PDF/OCR çıkarma süreçleri; 0 verilirse çıkarma indirme iş parçacığında yapılır
+EXTRACT_WORKERS = int(os.getenv("SCRAPER_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+# Tek bir PDF için indirme sınırı; 0 sınırsız
+MAX_PDF_BYTES = int(os.getenv("SCRAPER_MAX_PDF_MB", "256")) * 1024 * 1024
+
+# Disk önbelleği: günlük indeksler kısa, detay sayfaları uzun, PDF'ler süresiz (-1) tutulur
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".http_cache")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "2048")) * 1024 * 1024
+CACHE_TTL_INDEX = int(os.getenv("HTTP_CACHE_TTL_INDEX", "3600"))
+CACHE_TTL_DETAIL = int(os.getenv("HTTP_CACHE_TTL_DETAIL", str(30 * 24 * 3600)))
+CACHE_TTL_PDF = int(os.getenv("HTTP_CACHE_TTL_PDF", "-1"))
+HTTP_CACHE = None
+if os.getenv("HTTP_CACHE", "1") != "0":
+    HTTP_CACHE = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, offline=os.getenv("SCRAPER_OFFLINE") == "1")
+
+_adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(10, FETCH_CONCURRENCY))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+CLEANER = TextCleaner()
+
+OUT_DIR = os.getenv("SCRAPER_OUT_DIR", "output")
+# Varsayılan çalıştırmada bugünden geriye işlenecek gün sayısı
+DAY_WINDOW = max(1, int(os.getenv("SCRAPER_DAYS", "7")))
+
+# İşlenmiş kayıtlar defteri; SCRAPER_FORCE=1 tamamlanmış kayıtları da yeniden işler
+MANIFEST = Manifest(os.getenv("SCRAPER_MANIFEST", os.path.join(OUT_DIR, "manifest.sqlite")))
+FORCE_REPROCESS = os.getenv("SCRAPER_FORCE") == "1"
+# Sayfa başına ham çıkarım çıktısı (PyMuPDF/OCR/pdfminer metni, seçilen kaynak); reprocess bunu kullanır
+RAW_CACHE = os.getenv("RAW_CACHE", "1") != "0"
+RAW_CACHE_NAME = "ham.json.gz"
+# 2: pdfminer çıktısı sayfa başına (sayfalar[].pdfminer); belge düzeyi pdfminer yalnızca PyMuPDF açamazsa
+RAW_VERSION = 2
+
+# Tam metin arama dizini; kayıtlar kaydedildikçe eklenir. Boş verilirse kapanır.
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX", os.path.join(OUT_DIR, "search.sqlite"))
+SEARCH_INDEX = SearchIndex(SEARCH_INDEX_PATH) if SEARCH_INDEX_PATH else None
+
+# İçerik özetiyle (SHA-256) adreslenen çıkarım deposu: aynı gövde başka bir URL'den yeniden
+# geldiğinde metin, tablolar ve görseller buradan alınır, çıkarma/OCR yapılmaz. Boş verilirse kapanır.
+BLOB_STORE_DIR = os.getenv("BLOB_STORE", os.path.join(OUT_DIR, "blobs"))
+BLOBS = BlobStore(BLOB_STORE_DIR) if BLOB_STORE_DIR else None
+
+# Kayıt hedefi: "folder" (kayıt başına klasör + data.json) ya da gün bölümlü parçalar
+# (jsonl, jsonl.gz, jsonl.zst, parquet). Parça modunda PDF ve sayfa görselleri saklanmaz.
+RECORD_SINK = os.getenv("RECORD_SINK", "folder").lower()
+SINK = open_sink(RECORD_SINK, os.getenv("RECORD_SHARD_DIR", os.path.join(OUT_DIR, "records")),
+                 max_records=int(os.getenv("RECORD_SHARD_RECORDS", "10000")),
+                 max_bytes=int(os.getenv("RECORD_SHARD_MB", "64")) * 1024 * 1024)
 
 
 def ddmmyyyy(d): return d.strftime("%d.%m.%Y")
@@ -66,23 +131,168 @@ def y(d): return d.strftime("%Y")
 def m(d): return d.strftime("%m")
 
 
-def get_soup(url, referer=BASE):
-    try:
-        r = SESSION.get(url, timeout=30, allow_redirects=True, headers={"Referer": referer})
-        if r.status_code != 200:
+class _TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate, self.capacity = rate, burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_BUCKETS = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _throttle(url):
+    if HOST_RATE <= 0: return
+    host = urlparse(url).netloc
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(host)
+        if bucket is None:
+            bucket = _BUCKETS[host] = _TokenBucket(HOST_RATE, HOST_BURST)
+    bucket.acquire()
+
+
+class BudgetExhausted(requests.RequestException):
+    pass
+
+
+class _RequestBudget:
+    # Geçmiş taramasında tüm iş parçacıkları için ortak ağ isteği sınırı
+    def __init__(self, limit):
+        self.limit, self.used = limit, 0
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def exhausted(self):
+        return self.used >= self.limit
+
+
+REQUEST_BUDGET = None
+
+
+def _send(url, method="GET", **kwargs):
+    if REQUEST_BUDGET is not None and not REQUEST_BUDGET.take():
+        raise BudgetExhausted(f"istek bütçesi doldu ({REQUEST_BUDGET.limit})")
+    _throttle(url)
+    r = SESSION.request(method, url, **kwargs)
+    METRICS.inc("http_requests_total", status=str(r.status_code))
+    if not kwargs.get("stream"):
+        METRICS.inc("bytes_downloaded_total", len(r.content))
+    return r
+
+
+_INDEX_URL_RE = re.compile(r"/(\d{2}\.\d{2}\.\d{4}|eskiler/\d{4}/\d{2}/\d{8}\.htm)$", re.I)
+
+
+def cache_ttl(url):
+    path = urlparse(url).path
+    if path.lower().endswith(".pdf"):
+        return CACHE_TTL_PDF
+    if _INDEX_URL_RE.search(path):
+        return CACHE_TTL_INDEX
+    return CACHE_TTL_DETAIL
+
+
+def set_offline(offline=True):
+    global HTTP_CACHE
+    if HTTP_CACHE is None:
+        HTTP_CACHE = HttpCache(HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES)
+    HTTP_CACHE.offline = offline
+
+
+def http_get(url, ttl=None, **kwargs):
+    if HTTP_CACHE is None:
+        return _send(url, **kwargs)
+    r = HTTP_CACHE.fetch(_send, url, ttl=cache_ttl(url) if ttl is None else ttl, **kwargs)
+    if getattr(r, "from_cache", False):
+        METRICS.inc("http_requests_total", status="cache")
+    return r
+
+
+def parse_page(content):
+    # FAST_INDEX_PARSER=1 ise BeautifulSoup yerine lxml belge ağacı döner
+    return fast_html.parse(content) if FAST_INDEX_PARSER else BeautifulSoup(content, "lxml")
+
+
+class FetchError(Exception):
+    # Sunucu/ağ hatası (5xx, 429, bağlantı): "sayfa yok"tan (404) ayrı tutulur, gün boş sayılmaz
+    pass
+
+
+def _is_server_error(status):
+    return status >= 500 or status == 429
+
+
+def get_page(url, referer=BASE, timeout=30, strict=False):
+    # strict: sunucu/ağ hatasında None yerine FetchError
+    if not FAST_INDEX_PARSER:
+        return get_soup(url, referer, timeout, strict)
+    with METRICS.timer("get_soup"):
+        try:
+            r = http_get(url, timeout=timeout, allow_redirects=True, headers={"Referer": referer})
+            if r.status_code != 200:
+                if strict and _is_server_error(r.status_code):
+                    raise FetchError(f"{url}: HTTP {r.status_code}")
+                return None
+            return parse_page(r.content)
+        except requests.RequestException as e:
+            if strict:
+                raise FetchError(f"{url}: {e}") from e
+            return None
+
+
+def get_soup(url, referer=BASE, timeout=30, strict=False):
+    with METRICS.timer("get_soup"):
+        try:
+            r = http_get(url, timeout=timeout, allow_redirects=True, headers={"Referer": referer})
+            if r.status_code != 200:
+                if strict and _is_server_error(r.status_code):
+                    raise FetchError(f"{url}: HTTP {r.status_code}")
+                return None
+            return BeautifulSoup(r.content, "lxml")
+        except requests.RequestException as e:
+            if strict:
+                raise FetchError(f"{url}: {e}") from e
             return None
-        return BeautifulSoup(r.content, "lxml")
-    except requests.RequestException:
-        return None
 
 
 def boot_session():
+    if HTTP_CACHE is not None and HTTP_CACHE.offline:
+        return
     try:
-        SESSION.get(BASE, timeout=20)
+        _send(BASE, timeout=20)
     except requests.RequestException:
         pass
 
 
+# build_candidates sırasıyla adayların şema adları
+CANDIDATE_SCHEMES = ("gunluk", "eskiler_htm", "eskiler_pdf")
+# Günlük fihrist ve HTML detay sayfaları için BeautifulSoup yerine tek geçişli lxml ayrıştırıcı
+FAST_INDEX_PARSER = os.getenv("FAST_INDEX_PARSER") == "1"
+# Aday yoklama zaman aşımı (sn)
+PROBE_TIMEOUT = float(os.getenv("SCRAPER_PROBE_TIMEOUT", "8"))
+
+
 def build_candidates(d):
     return [
         urljoin(BASE, ddmmyyyy(d)),
@@ -132,7 +342,10 @@ def extract_no(text):
 def find_issue_and_date(page_soup: BeautifulSoup):
     s = page_soup.find(id="spanGazeteTarih")
     if not s: return None, None
-    text = s.get_text(" ", strip=True)
+    return _issue_and_date_from_text(s.get_text(" ", strip=True))
+
+
+def _issue_and_date_from_text(text):
     m_no = re.search(r"ve\s+(\d{4,6})\s+Sayılı\s+Resmî\s+Gazete", text, flags=re.I)
     issue = m_no.group(1) if m_no else None
     aylar = {"ocak": 1, "şubat": 2, "mart": 3, "nisan": 4, "mayıs": 5, "haziran": 6, "temmuz": 7, "ağustos": 8,
@@ -173,26 +386,163 @@ def collect_from_daily_page(day_url: str, soup: BeautifulSoup):
                 if prev_cat: cat = prev_cat.get_text(" ", strip=True)
             items.append({"category": cat or "GENEL", "url": href, "title_from_list": text, "issue": issue,
                           "date_from_header": date_from_header})
+    return _dedup_items(items), issue
+
+
+def _dedup_items(items):
     dedup, seen = [], set()
     for it in items:
         if it["url"] not in seen:
             seen.add(it["url"])
             dedup.append(it)
-    return dedup, issue
+    return dedup
+
+
+def collect_from_daily_tree(day_url: str, doc):
+    # collect_from_daily_page'in lxml karşılığı, sonuçları birebir aynı. Belge tek geçişte
+    # (belge sırasıyla) dolaşılır; find_previous yerine o ana kadar görülen son alt başlık tutulur.
+    span = root = last_subtitle = None
+    entries = []
+    for el in doc.iter():
+        if not fast_html.is_element(el):
+            continue
+        if span is None and el.get("id") == "spanGazeteTarih":
+            span = el
+        if root is None and el.get("id") == "html-content":
+            root = el
+        elif root is not None and el.getparent() is root:
+            entries.append((el, last_subtitle))
+        if "html-subtitle" in fast_html.classes(el):
+            last_subtitle = el
+    if root is None:
+        entries = [(doc, None)]
+
+    date_from_header, issue = _issue_and_date_from_text(fast_html.get_text(span, " ")) if span is not None else (None, None)
+    issue = issue or "NA"
+    items, current_category, in_ilan = [], None, False
+    for el, prev_subtitle in entries:
+        cls = fast_html.classes(el)
+        if "html-title" in cls:
+            txt = fast_html.get_text(el, " ")
+            if txt and ("İLÂN BÖLÜMÜ" in txt.upper() or "İLAN BÖLÜMÜ" in txt.upper()): in_ilan = True
+            continue
+        if "html-subtitle" in cls:
+            current_category = fast_html.get_text(el, " ") or None
+            continue
+        if in_ilan: continue
+        if "fihrist-item" in cls:
+            a = next((a for a in el.iterdescendants("a") if a.get("href") is not None), None)
+            if a is None: continue
+            href, text = urljoin(day_url, a.get("href")), fast_html.get_text(a, " ")
+            if not text or re.search(r"(Önceki|Sonraki|PDF Görün|Uygulaması)", text, flags=re.I): continue
+            cat = current_category
+            if not cat and prev_subtitle is not None:
+                cat = fast_html.get_text(prev_subtitle, " ")
+            items.append({"category": cat or "GENEL", "url": href, "title_from_list": text, "issue": issue,
+                          "date_from_header": date_from_header})
+    return _dedup_items(items), issue
+
 
+def collect_from_page(day_url: str, page):
+    if isinstance(page, BeautifulSoup):
+        return collect_from_daily_page(day_url, page)
+    return collect_from_daily_tree(day_url, page)
 
-def collect_for_date(d):
+
+def title_and_text_fast(body):
+    # extract_title + _normalize_ws(clean_text(...)) karşılığı; başlık bulunamazsa None
+    title, text = title_and_raw_text_fast(body)
+    return title, _normalize_ws(text)
+
+
+def title_and_raw_text_fast(body):
+    # (başlık, clean_text(...) karşılığı normalize edilmemiş metin)
+    doc = fast_html.parse(body)
+    title = None
+    for sel in ["h1", "h2", "h3", "strong", "b", "title"]:
+        el = fast_html.find_tag(doc, sel)
+        if el is not None and fast_html.get_text(el):
+            title = fast_html.get_text(el)
+            break
+    text = re.sub(r"\n{3,}", "\n\n", fast_html.document_text(doc))
+    if title is None and text:
+        title = text.splitlines()[0][:200]
+    return title, text
+
+
+def _pdf_exists(url, timeout):
+    # Tam sayı PDF'i indirilmeden yalnızca varlığı yoklanır; sunucu/ağ hatasında FetchError
+    if HTTP_CACHE is not None:
+        if HTTP_CACHE.lookup(url):
+            return True
+        if HTTP_CACHE.offline:
+            raise FetchError(f"{url}: önbellekte yok (çevrimdışı)")
+    try:
+        r = _send(url, method="HEAD", timeout=timeout, allow_redirects=True, headers={"Referer": BASE})
+        if r.status_code == 405:
+            r = _send(url, timeout=timeout, allow_redirects=True, stream=True, headers={"Referer": BASE})
+            r.close()
+    except requests.RequestException as e:
+        raise FetchError(f"{url}: {e}") from e
+    if _is_server_error(r.status_code):
+        raise FetchError(f"{url}: HTTP {r.status_code}")
+    return r.status_code == 200
+
+
+# Yoklaması hata veren aday: yok sayılır, ama hiçbir aday bulunamazsa gün boş değil hatalı sayılır
+_PROBE_ERROR = object()
+
+
+def _probe_candidate(url, timeout=PROBE_TIMEOUT):
+    try:
+        if url.lower().endswith(".pdf"):
+            return _pdf_exists(url, timeout)
+        return get_page(url, timeout=timeout, strict=True)
+    except FetchError:
+        return _PROBE_ERROR
+
+
+def _resolve_candidates(candidates, results):
+    # Sonuçlar aday sırasıyla değerlendirilir; sıralı denemeyle aynı paketi ve işe yarayan şemayı döndürür
     last_issue, last_page_url = "NA", None
-    for u in build_candidates(d):
-        s = get_soup(u)
-        if not s: continue
+    for scheme, u in candidates:
+        s = results.get(scheme)
+        if not s or s is _PROBE_ERROR: continue
         last_page_url = u
-        if u.lower().endswith(".pdf"): return {"pdf_index_url": u, "items": [], "issue": "NA"}
-        items, issue = collect_from_daily_page(u, s)
+        if u.lower().endswith(".pdf"): return {"pdf_index_url": u, "items": [], "issue": "NA"}, scheme
+        items, issue = collect_from_page(u, s)
         last_issue = issue or last_issue
-        if items: return {"page_url": u, "items": items, "issue": issue or "NA"}
-    if last_page_url: return {"page_url": last_page_url, "items": [], "issue": last_issue}
-    return None
+        if items: return {"page_url": u, "items": items, "issue": issue or "NA"}, scheme
+    if last_page_url: return {"page_url": last_page_url, "items": [], "issue": last_issue}, None
+    return None, None
+
+
+def collect_for_date(d, manifest: Manifest | None = MANIFEST):
+    # Dönem (yıl) için öğrenilmiş şema, yoksa en yakın yılınki, o da yoksa ilk aday önce tek başına
+    # denenir; olmazsa kalan adaylar kısa zaman aşımıyla aynı anda yoklanır.
+    candidates = list(zip(CANDIDATE_SCHEMES, build_candidates(d)))
+    urls = dict(candidates)
+    era = y(d)
+    learned = manifest.learned_scheme(era) if manifest is not None else None
+    first = learned or (manifest.nearest_scheme(era) if manifest is not None else None)
+    if first not in urls:
+        first = CANDIDATE_SCHEMES[0]
+    results = {first: _probe_candidate(urls[first])}
+    pack, scheme = _resolve_candidates([(first, urls[first])], results)
+    # Yalnızca kalem döndüren şemada durulur: tam sayı PDF'i (eskiler_pdf) fihristi olan günü tek kayda
+    # indirmesin; diğer adaylar da yoklanır ve kalemli şemalar aday sırasıyla önce gelir
+    if not (pack and pack["items"]):
+        rest = [c for c in candidates if c[0] not in results]
+        with ThreadPoolExecutor(max_workers=len(rest)) as pool:
+            for s, res in zip([c[0] for c in rest], pool.map(lambda c: _probe_candidate(c[1]), rest)):
+                results[s] = res
+        pack, scheme = _resolve_candidates(candidates, results)
+        if _PROBE_ERROR in results.values() and not (pack and pack["items"]):
+            # Hata veren aday kalemli fihrist olabilir; gün boş ya da tek PDF sayılmaz, yeniden denenir
+            raise FetchError(f"{ddmmyyyy(d)} fihristi alınamadı")
+    if scheme and scheme != learned and manifest is not None:
+        manifest.learn_scheme(era, scheme)
+    return pack
 
 
 def sanitize(s):
@@ -215,53 +565,16 @@ def save_rec(n, rec):
 
 
 def _normalize_ws(text: str) -> str:
-    text = text or ""
-    ws_chars = "\xa0\u2009\u202f\u2007\u200a\u2002\u2003\u2004\u2005\u2006"
-    for char in ws_chars: text = text.replace(char, " ")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+    return CLEANER.normalize_ws(text)
 
 
 def _strip_headers_footers(text: str) -> str:
-    lines = text.splitlines()
-    out = []
-
-    for ln in lines:
-        s = ln.strip()
-
-        if re.match(r"\d{1,2} [A-Za-zÇĞİÖŞÜçğıöşü]+ \d{4}(,|\s)?(PAZAR|PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ)?", s, re.I):
-            continue
-
-        if "resmî gazete" in s.lower():
-            continue
-
-        if re.match(r"Sayı\s*:\s*\d{5}", s):
-            continue
-
-        if s.isupper() and len(s) < 20 and s in ["YÖNETMELİK", "TEBLİĞ", "KURUL KARARI", "GENELGE", "İLAN"]:
-            continue
+    return CLEANER.strip_headers_footers(text)
 
-        out.append(ln)
 
-    return "\n".join(out).strip()
 def _strip_header_lines(text: str) -> str:
+    return CLEANER.strip_header_lines(text)
 
-    lines = text.splitlines()
-    cleaned = []
-    skip_patterns = [
-        r"^\s*\d{1,2}\s+[A-Za-zÇĞİÖŞÜçğıöşü]+\s+\d{4}(?:\s+[PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ|PAZAR]*)?$",
-        r"^\s*Resm[iî] Gazete\s*$",
-        r"^\s*Sayı\s*:\s*\d+",
-        r"^\s*Karar\s*No\s*:?\s*\d+",
-        r"^\s*Karar\s*Tarihi\s*:?\s*\d{1,2}/\d{1,2}/\d{4}",
-        r"^\s*\(.*?\)$",
-    ]
-    for ln in lines:
-        if any(re.match(pat, ln.strip(), flags=re.IGNORECASE) for pat in skip_patterns):
-            continue
-        cleaned.append(ln)
-    return "\n".join(cleaned).strip()
 
 def extract_title_from_text(text: str) -> str:
     lines = text.splitlines()
@@ -284,330 +597,1776 @@ def extract_title_from_text(text: str) -> str:
 
     return lines[0].strip() if lines else ""
 
-def save_rec_with_pdf_and_images(n, rec, pdf_bytes=None, page_images=None):
+def save_rec_with_pdf_and_images(n, rec, pdf_bytes=None, page_images=None, pdf_path=None):
     folder_name = f"{rec.tarih.replace('.', '')}_{rec.sayi}_{sanitize(rec.kategori).upper()}_{n:03d}"
     record_dir = os.path.join(OUT_DIR, folder_name)
     os.makedirs(record_dir, exist_ok=True)
+    staging = _staging_dir(str(rec.kaynak_url))
+
+    # Sayfa görselleri: çıkarma sırasında hazırlık klasörüne tek tek yazılmış dosya adları
+    # geldiyse klasör olduğu gibi taşınır; PIL görüntüleri geldiyse burada PNG olarak yazılır.
+    image_paths = []
+    if page_images:
+        pages_dir = os.path.join(record_dir, "pages")
+        if isinstance(page_images[0], str):
+            staged_pages = os.path.join(staging, "pages")
+            if os.path.isdir(staged_pages):
+                shutil.rmtree(pages_dir, ignore_errors=True)
+                os.replace(staged_pages, pages_dir)
+            else:
+                os.makedirs(pages_dir, exist_ok=True)
+            image_paths = [os.path.join("pages", name) for name in page_images]
+        else:
+            os.makedirs(pages_dir, exist_ok=True)
+            for i, img in enumerate(page_images, start=1):
+                img_filename = f"page_{i}.png"
+                img_path = os.path.join(pages_dir, img_filename)
+                img.save(img_path)
+                image_paths.append(os.path.relpath(img_path, record_dir))
 
     # PDF dosyasını kaydet
     pdf_filename = None
-    if pdf_bytes:
+    if pdf_path:
+        # Akışla indirilmiş dosya aynı dosya sisteminde; kopyalamadan yerine taşınır
+        pdf_filename = "kaynak.pdf"
+        os.replace(pdf_path, os.path.join(record_dir, pdf_filename))
+    elif pdf_bytes:
         pdf_filename = "kaynak.pdf"
-        pdf_path = os.path.join(record_dir, pdf_filename)
-        with open(pdf_path, "wb") as f:
+        with open(os.path.join(record_dir, pdf_filename), "wb") as f:
             f.write(pdf_bytes)
 
-    # Sayfa görsellerini kaydet
-    image_paths = []
-    if page_images:
-        pages_dir = os.path.join(record_dir, "pages")
-        os.makedirs(pages_dir, exist_ok=True)
-        for i, img in enumerate(page_images, start=1):
-            img_filename = f"page_{i}.png"
-            img_path = os.path.join(pages_dir, img_filename)
-            img.save(img_path)
-            image_paths.append(os.path.relpath(img_path, record_dir))
-
     rec.pdf_dosyasi = pdf_filename if pdf_filename else ""
     rec.sayfa_resimleri = image_paths
 
+    staged_raw = os.path.join(staging, RAW_CACHE_NAME)
+    if (RAW_CACHE or rec.kismi) and os.path.exists(staged_raw):
+        os.replace(staged_raw, os.path.join(record_dir, RAW_CACHE_NAME))
+    _discard_staging(staging)
+
+    # data.json en son ve atomik yazılır; varlığı kaydın tamamlandığını gösterir
     json_path = os.path.join(record_dir, "data.json")
-    with open(json_path, "w", encoding="utf-8") as f:
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(rec.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, json_path)
 
     return json_path
 
-def pdf_to_text_robust_with_images(pdf_bytes: bytes):
-    text_pieces, images, used_ocr = [], [], 0
+
+def record_is_complete(json_path, url=None) -> bool:
+    if is_shard_path(json_path):
+        # Parça dosyası yalnızca kapanınca (yeniden adlandırılınca) görünür olur
+        return os.path.exists(json_path)
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if url and data.get("kaynak_url") != url:
+        return False
+    record_dir = os.path.dirname(json_path)
+    pdf = data.get("pdf_dosyasi")
+    if pdf and not os.path.exists(os.path.join(record_dir, pdf)):
+        return False
+    # PAGE_IMAGES=lazy kayıtlarında görseller ilk istendiğinde kaynak.pdf'ten üretilir (ensure_page_image);
+    # diğer biçimlerde eksik görsel kaydı yarım bırakır
+    lazy = bool(pdf) and PAGE_IMAGE_MODE == "lazy"
+    return all(lazy or os.path.exists(os.path.join(record_dir, p)) for p in data.get("sayfa_resimleri") or [])
+
+def _open_pdf(pdf):
+    # pdf: bayt dizisi ya da diskteki dosya yolu; dosya yolu verilirse MuPDF dosyayı kendisi okur
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=pdf, filetype="pdf")
+    return fitz.open(pdf, filetype="pdf")
+
+
+@contextmanager
+def _pdf_stream(pdf):
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        yield BytesIO(pdf)
+        return
+    with open(pdf, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield f
+            return
+        with mm:
+            yield mm
+
+
+def pdf_to_text_robust_with_images(pdf, image_dir=None, raw=None, budget=None):
+    # raw (dict) verilirse sayfa başına ham çıktılar ve seçilen kaynak buraya yazılır
+    text_pieces, images, raw_pages = [], [], []
     if PYMUPDF_OK and PIL_OK:
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            for pg in doc:
-                txt = (pg.get_text("text") or "").strip()
-                if len(txt) < 200:
-                    ocr_txt = _ocr_page_with_tesseract(pg)
-                    if len(ocr_txt.strip()) > len(txt):
-                        txt = ocr_txt
-                        used_ocr += 1
-                text_pieces.append(txt)
-
-                pix = pg.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                images.append(img)
-            doc.close()
+            text_pieces, images, _, _ = _extract_pdf_pages(pdf, with_images=True, image_dir=image_dir,
+                                                           raw_pages=raw_pages, budget=budget)
         except Exception:
-            text_pieces, images = [], []
+            text_pieces, images, raw_pages = [], [], []
 
     text = "\n".join(text_pieces).strip()
+    source = "sayfalar"
 
     if len(text) < 200:
-        try:
-            params1 = LAParams(char_margin=2.0, line_margin=0.6, word_margin=0.10, boxes_flow=0.5)
-            params2 = LAParams(char_margin=2.5, line_margin=0.3, word_margin=0.05, boxes_flow=None)
-            t1 = pdf_extract_text(BytesIO(pdf_bytes), laparams=params1) or ""
-            t2 = pdf_extract_text(BytesIO(pdf_bytes), laparams=params2) or ""
-            text = t2 if len(t2) > len(t1) else t1
-        except Exception:
-            pass
+        found = _pdfminer_fallback(pdf, text_pieces)
+        if raw_pages:
+            # Sayfa başına: pdfminer yalnızca daha uzun metin bulduğu sayfalarda seçilir
+            for i, t in found.items():
+                text_pieces[i] = t
+                raw_pages[i].update(pdfminer=t, secilen="pdfminer")
+            text = "\n".join(text_pieces).strip()
+        elif found:
+            # PyMuPDF açamadı: tüm belge pdfminer'dan
+            text, source = "\n".join(found[i] for i in sorted(found)).strip(), "pdfminer"
+
+    if raw is not None:
+        raw.update(tur="pdf", sayfalar=raw_pages, pdfminer=text if source == "pdfminer" else None, secilen=source)
+    return CLEANER.clean(text).strip(), images
+
+
+# pdfminer yedeği yalnızca metni az kalan sayfaları çözümler. PDFMINER_WORKERS > 1 ise sayfalar
+# süreçlere bölünür; çıkarma zaten süreç havuzunda çalıştığından varsayılan tek süreçtir.
+PDFMINER_WORKERS = max(1, int(os.getenv("PDFMINER_WORKERS", "1")))
+
 
-    text = _normalize_ws(text)
-    text = _dehyphenate(text)
-    text = _strip_headers_footers(text)
-    text = _strip_appendix_parts(text)
+def _pdfminer_params():
+    from pdfminer.layout import LAParams
 
-    return text.strip(), images
+    return (LAParams(char_margin=2.0, line_margin=0.6, word_margin=0.10, boxes_flow=0.5),
+            LAParams(char_margin=2.5, line_margin=0.3, word_margin=0.05, boxes_flow=None))
+
+
+def _pdfminer_layout_text(ltpage, laparams) -> str:
+    # Gruplanmamış sayfanın karakterleri yeni bir LTPage'de laparams ile gruplanır; karakter nesneleri
+    # değişmediğinden aynı sayfa farklı parametrelerle tekrar tekrar çözümlenebilir.
+    # Metin pdfminer'ın TextConverter'ı ile aynı sırayla toplanır.
+    from pdfminer.layout import LTContainer, LTPage, LTText, LTTextBox
+
+    page = LTPage(ltpage.pageid, ltpage.bbox, ltpage.rotate)
+    page.extend(ltpage)
+    page.analyze(laparams)
+    out = []
+
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            out.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            out.append("\n")
+
+    render(page)
+    return "".join(out)
+
+
+def _pdfminer_pages(pdf, page_numbers=None) -> dict:
+    # {sayfa indeksi: metin}: her sayfa bir kez yorumlanır (extract_text'in iki tam geçişi yerine),
+    # iki düzen stratejisi aynı karakterlerden türetilir ve uzun olanı tutulur
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    params = _pdfminer_params()
+    rsrcmgr = PDFResourceManager(caching=True)
+    device = PDFPageAggregator(rsrcmgr, laparams=None)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    wanted = sorted(page_numbers) if page_numbers is not None else None
+    out = {}
+    with _pdf_stream(pdf) as fp:
+        for n, page in enumerate(PDFPage.get_pages(fp, wanted)):
+            interpreter.process_page(page)
+            ltpage = device.get_result()
+            out[wanted[n] if wanted is not None else n] = max(
+                (_pdfminer_layout_text(ltpage, p).strip() for p in params), key=len)
+    return out
+
+
+def _pdfminer_run(pdf, pages):
+    workers = min(PDFMINER_WORKERS, len(pages or ()))
+    if workers <= 1:
+        return _pdfminer_pages(pdf, pages)
+    found = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        for part in pool.map(_pdfminer_pages, [pdf] * workers, [pages[k::workers] for k in range(workers)]):
+            found.update(part)
+    return found
+
+
+def _pdfminer_fallback(pdf, pieces) -> dict:
+    # pieces: PyMuPDF/OCR sayfa metinleri; metni OCR_MIN_CHARS altında kalan sayfalar (pieces boşsa
+    # tüm belge) pdfminer ile çözümlenir. Yalnızca pdfminer'ın daha uzun metin bulduğu sayfalar döner.
+    pages = [i for i, t in enumerate(pieces) if len(t) < OCR_MIN_CHARS] if pieces else None
+    if pages == []:
+        return {}
+    METRICS.inc("pdfminer_fallback_total")
+    with METRICS.timer("pdfminer_fallback"):
+        try:
+            found = _pdfminer_run(pdf, pages)
+        except Exception:
+            return {}
+    METRICS.inc("pdfminer_pages_total", len(found))
+    return {i: t for i, t in found.items() if not pieces or len(t) > len(pieces[i])}
 
 
 def _dehyphenate(text: str) -> str:
-    return re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+    return CLEANER.dehyphenate(text)
 
 
 # --- PDF İŞLEME ---
-def _ocr_page_with_tesseract(page, dpi=350, lang=None, config=None) -> str:
-    if not (PYMUPDF_OK and PIL_OK and TESSERACT_OK): return ""
-    lang = lang or os.getenv("OCR_LANG", "tur+eng")
-    config = config or os.getenv("OCR_CONFIG", "--psm 6 --oem 3")
-    zoom = dpi / 72.0
-    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+OCR_DPI = 350
+OCR_MIN_CHARS = 200
+OCR_BATCH = max(1, int(os.getenv("OCR_BATCH", "8")))
+# Sayfa görselleri: png (kayıpsız, varsayılan), jpeg, webp, thumb (küçük JPEG), lazy (istendiğinde
+# kaynak.pdf'ten çizilir) ya da off
+PAGE_IMAGE_MODE = os.getenv("PAGE_IMAGES", "png").lower()
+PAGE_IMAGE_ZOOM = float(os.getenv("PAGE_IMAGE_ZOOM", "2"))
+PAGE_IMAGE_QUALITY = int(os.getenv("PAGE_IMAGE_QUALITY", "80"))
+PAGE_THUMB_WIDTH = int(os.getenv("PAGE_THUMB_WIDTH", "300"))
+_IMAGE_EXT = {"png": "png", "jpeg": "jpg", "webp": "webp", "thumb": "jpg", "lazy": "png"}
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", ".ocr_cache") if os.getenv("OCR_CACHE", "1") != "0" else None
+# Taranmış sayfalar önce ilk basamakta okunur; güven (tesserocr) ya da metin verimi düşükse üst
+# basamaklarda yeniden okunur ve en iyi sonuç tutulur
+OCR_DPI_LADDER = tuple(int(x) for x in os.getenv("OCR_DPI_LADDER", "200,300,400").split(",") if x.strip()) or (OCR_DPI,)
+OCR_MIN_CONF = float(os.getenv("OCR_MIN_CONF", "70"))
+OCR_MIN_WORD_RATIO = 0.6
+# Bundan az kelimeli sayfa boşa yakın (boş, ayraç, harita) sayılır; yükseltmek metin çıkarmaz
+OCR_BLANK_TOKENS = 20
+# OCR çağrısı hata verdiğinde (tesseract yok ya da çöktü) güven yerine dönen işaret; sayfa boş kalır,
+# üst basamaklarda yeniden okunmaz ve ertelenmez
+OCR_FAILED = object()
+_OCR_WORD_RE = re.compile(r"[A-Za-zÇĞİÖŞÜçğıöşüÂÎÛâîû]{2,}")
+# Belge başına süre ve CPU bütçesi, sayfa başına OCR süresi (sn, 0 sınırsız). Bütçe dolunca kalan
+# taranmış sayfalar ertelenir, kayıt kismi olarak yazılır ve sayfalar ocr_retry kuyruğunda okunur.
+DOC_TIME_BUDGET = float(os.getenv("DOC_TIME_BUDGET", "300"))
+DOC_CPU_BUDGET = float(os.getenv("DOC_CPU_BUDGET", "0"))
+PAGE_TIME_BUDGET = float(os.getenv("PAGE_TIME_BUDGET", "60"))
+OCR_RETRY_PAGE_BUDGET = float(os.getenv("OCR_RETRY_PAGE_BUDGET", "600"))
+
+TESSEROCR_OK = available("tesserocr")
+tesserocr = LazyModule("tesserocr")
+
+_OCR_LOCAL = threading.local()
+
+
+def _ocr_settings(lang=None, config=None):
+    return lang or os.getenv("OCR_LANG", "tur+eng"), config or os.getenv("OCR_CONFIG", "--psm 6 --oem 3")
+
+
+def _ocr_preprocess(img):
     g = ImageOps.grayscale(img)
     g = ImageOps.autocontrast(g, cutoff=1)
     g = g.filter(ImageFilter.SHARPEN)
-    bw = g.point(lambda x: 255 if x > 180 else 0)
+    return g.point(lambda x: 255 if x > 180 else 0)
+
+
+def _ocr_cache_key(bw, lang, config) -> str:
+    h = hashlib.sha256(bw.tobytes())
+    h.update(f"|{bw.width}x{bw.height}|{lang}|{config}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _ocr_cache_get(key):
+    if not OCR_CACHE_DIR: return None
+    try:
+        with open(os.path.join(OCR_CACHE_DIR, key[:2], key + ".txt"), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _ocr_cache_put(key, text):
+    if not OCR_CACHE_DIR: return
+    path = os.path.join(OCR_CACHE_DIR, key[:2], key + ".txt")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _tesserocr_api(lang, config):
+    # Her iş parçacığı kendi uzun ömürlü Tesseract motorunu tutar (sayfa başına süreç açılmaz)
+    key = (lang, config)
+    api = getattr(_OCR_LOCAL, "api", None)
+    if api is not None and _OCR_LOCAL.key == key:
+        return api
+    if api is not None:
+        api.End()
+    psm = re.search(r"--psm\s+(\d+)", config)
+    oem = re.search(r"--oem\s+(\d+)", config)
+    api = tesserocr.PyTessBaseAPI(lang=lang,
+                                  psm=int(psm.group(1)) if psm else tesserocr.PSM.AUTO,
+                                  oem=int(oem.group(1)) if oem else tesserocr.OEM.DEFAULT)
+    for name, value in re.findall(r"-c\s+(\w+)=(\S+)", config):
+        api.SetVariable(name, value)
+    _OCR_LOCAL.api, _OCR_LOCAL.key = api, key
+    return api
+
+
+def _tesseract_batch(images, lang, config, timeout=None) -> list[str]:
+    # Tesseract'a tek çağrıda bir görüntü listesi verilir; sayfalar çıktıda \f ile ayrılır
+    with tempfile.TemporaryDirectory(prefix="ocr_") as tmp:
+        paths = []
+        for i, img in enumerate(images):
+            p = os.path.join(tmp, f"{i:04d}.png")
+            img.save(p)
+            paths.append(p)
+        list_path = os.path.join(tmp, "list.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(paths) + "\n")
+        cmd = [pytesseract.pytesseract.tesseract_cmd, list_path, "stdout", "-l", lang, *shlex.split(config)]
+        out = subprocess.run(cmd, capture_output=True, check=True, timeout=timeout).stdout.decode("utf-8", errors="replace")
+    pages = out.split("\f")
+    if len(pages) >= len(images) + 1:
+        return pages[:len(images)]
+    # Beklenmeyen çıktı: sayfa sayfa çalıştır
     try:
-        return pytesseract.image_to_string(bw, lang=lang, config=config)
-    except Exception:
-        return ""
+        return [pytesseract.image_to_string(img, lang=lang, config=config, timeout=timeout or 0) for img in images]
+    except RuntimeError as e:
+        # pytesseract zaman aşımını RuntimeError olarak bildirir
+        raise subprocess.TimeoutExpired(cmd, timeout) from e
+
+
+def _tesserocr_read(api, img, deadline=None):
+    # (metin, ortalama güven); süre dolduysa metin None
+    api.SetImage(img)
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None, None
+        try:
+            ok = api.Recognize(timeout=int(remaining * 1000))
+        except TypeError:
+            # tesserocr < 2.5: Recognize zaman aşımı almaz
+            ok = True
+        if not ok:
+            return None, None
+    return api.GetUTF8Text(), api.MeanTextConf()
+
+
+def _ocr_images_scored(images, lang=None, config=None, timeout=None) -> list[tuple]:
+    # [(metin, güven)]: timeout (sn) tüm çağrı içindir, süresi dolan sayfalarda metin None döner;
+    # hata veren sayfalarda ("", OCR_FAILED). Güven yalnızca tesserocr ile bilinir; CLI ve
+    # önbellekten gelen sonuçlarda None.
+    if not images or not (TESSERACT_OK or TESSEROCR_OK): return [("", None)] * len(images)
+    lang, config = _ocr_settings(lang, config)
+    keys = [_ocr_cache_key(img, lang, config) for img in images]
+    results = [(_ocr_cache_get(k), None) for k in keys]
+    missing = [i for i, (t, _) in enumerate(results) if t is None]
+    METRICS.inc("pages_ocr_cached_total", len(results) - len(missing))
+    if missing:
+        METRICS.inc("pages_ocr_total", len(missing))
+        t0 = time.perf_counter()
+        try:
+            if TESSEROCR_OK:
+                api = _tesserocr_api(lang, config)
+                deadline = time.monotonic() + timeout if timeout else None
+                fresh = [_tesserocr_read(api, images[i], deadline) for i in missing]
+            else:
+                fresh = [(t, None) for t in _tesseract_batch([images[i] for i in missing], lang, config, timeout)]
+        except subprocess.TimeoutExpired:
+            fresh = [(None, None)] * len(missing)
+        except Exception:
+            fresh = [("", OCR_FAILED)] * len(missing)
+            METRICS.inc("pages_ocr_failed_total", len(missing))
+        else:
+            for i, (t, _) in zip(missing, fresh):
+                if t is not None:
+                    _ocr_cache_put(keys[i], t)
+        for i, r in zip(missing, fresh):
+            results[i] = r
+        timed_out = sum(1 for t, _ in fresh if t is None)
+        if timed_out:
+            METRICS.inc("pages_ocr_timeout_total", timed_out)
+        per_page = (time.perf_counter() - t0) / len(missing)
+        for _ in missing:
+            METRICS.observe("stage_seconds", per_page, stage="ocr_page")
+    return results
 
 
-def pdf_to_text_robust(pdf_bytes: bytes) -> str:
-    pieces, used_ocr = [], 0
+def _ocr_images(images, lang=None, config=None) -> list[str]:
+    return [t or "" for t, _ in _ocr_images_scored(images, lang, config)]
+
+
+def _ocr_poor(text, conf=None) -> bool:
+    # Düşük güven ya da bozuk kelime: üst çözünürlük basamağında yeniden okunmaya değer.
+    # Boşa yakın sayfa zayıf sayılmaz.
+    tokens = text.split()
+    if len(tokens) < OCR_BLANK_TOKENS:
+        return False
+    if conf is not None and 0 <= conf < OCR_MIN_CONF:
+        return True
+    words = sum(1 for t in tokens if _OCR_WORD_RE.fullmatch(t.strip(".,;:()\"'-/")))
+    return words / len(tokens) < OCR_MIN_WORD_RATIO
+
+
+def _ocr_score(text, conf=None) -> float:
+    words = sum(1 for t in text.split() if _OCR_WORD_RE.fullmatch(t.strip(".,;:()\"'-/")))
+    return words * (conf / 100.0 if conf is not None and conf >= 0 else 1.0)
+
+
+def _ocr_escalate(page, text, conf, budget=None, ladder=OCR_DPI_LADDER):
+    # (metin, dpi, tamamlandı): ilk basamağın sonucu zayıfsa üst basamaklar denenir. Hata veren
+    # sayfa yükseltilmez; OCR_DPI'ın üstündeki basamağa yalnızca önceki basamak sonucu iyileştirdiyse
+    # çıkılır. Bütçe üst basamağa izin vermezse sayfa tamamlanmamış sayılır ve arka planda yeniden okunur.
+    if conf is OCR_FAILED:
+        return text, ladder[0], True
+    best, best_dpi, best_score = text, ladder[0], _ocr_score(text, conf)
+    poor, improved = _ocr_poor(text, conf), True
+    for dpi in ladder[1:]:
+        if not poor or (dpi > OCR_DPI and not improved):
+            break
+        if budget is not None and budget.expired():
+            return best, best_dpi, False
+        METRICS.inc("pages_ocr_escalated_total")
+        txt, conf = _ocr_images_scored([_ocr_preprocess(_render(page, dpi / 72.0))],
+                                       timeout=budget.timeout() if budget is not None else None)[0]
+        if txt is None:
+            return best, best_dpi, False
+        if conf is OCR_FAILED:
+            break
+        score = _ocr_score(txt, conf)
+        improved = score > best_score
+        if improved:
+            best, best_dpi, best_score = txt, dpi, score
+        poor = _ocr_poor(txt, conf)
+    return best, best_dpi, True
+
+
+def _cpu_seconds():
+    # Süreç ve beklenmiş alt süreçlerin (tesseract CLI) CPU süresi
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class _DocBudget:
+    # Belge başına süre/CPU bütçesi (0 sınırsız). CPU süreç genelidir: çıkarma süreçlerinde belgeye
+    # özgüdür, SCRAPER_EXTRACT_WORKERS=0 iken aynı süreçteki diğer işleri de sayar.
+    def __init__(self, seconds=DOC_TIME_BUDGET, cpu_seconds=DOC_CPU_BUDGET, page_seconds=PAGE_TIME_BUDGET):
+        self.seconds, self.cpu_seconds, self.page_seconds = seconds, cpu_seconds, page_seconds
+        self.t0, self.cpu0 = time.monotonic(), _cpu_seconds()
+        self.exceeded = False
+
+    def expired(self):
+        if not self.exceeded and ((self.seconds and time.monotonic() - self.t0 >= self.seconds) or
+                                  (self.cpu_seconds and _cpu_seconds() - self.cpu0 >= self.cpu_seconds)):
+            self.exceeded = True
+            METRICS.inc("documents_over_budget_total")
+        return self.exceeded
+
+    def timeout(self, pages=1):
+        # OCR çağrısı için zaman aşımı: sayfa bütçesi × sayfa sayısı, belgenin kalan süresiyle sınırlı
+        limits = []
+        if self.page_seconds:
+            limits.append(self.page_seconds * pages)
+        if self.seconds:
+            limits.append(max(1.0, self.seconds - (time.monotonic() - self.t0)))
+        return min(limits) if limits else None
+
+
+def _render(page, zoom):
+    METRICS.inc("pages_rendered_total")
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+def _ocr_page_with_tesseract(page, dpi=OCR_DPI, lang=None, config=None) -> str:
+    if not (PYMUPDF_OK and PIL_OK and (TESSERACT_OK or TESSEROCR_OK)): return ""
+    return _ocr_images([_ocr_preprocess(_render(page, dpi / 72.0))], lang, config)[0]
+
+
+PAGE_CLASSIFIER = os.getenv("PAGE_CLASSIFIER", "1") != "0"
+_MAP_HINT_RE = re.compile(r"HAR[İI]TA|KROK[İI]|KOORD[İI]NAT|ÖLÇEK|PAFTA", re.I)
+
+
+def _classify_page(pg, text=None) -> str:
+    # Yalnızca PyMuPDF meta verisiyle (görüntü alanı, vektör çizim sayısı, metin blokları,
+    # rakam oranı) sayfayı "prose" / "table" / "map" / "scan" olarak etiketler.
+    area = abs(pg.rect) or 1.0
+    text = pg.get_text("text") if text is None else text
+    chars = [c for c in text if not c.isspace()]
+    digit_ratio = sum(c.isdigit() for c in chars) / len(chars) if chars else 0.0
+    blocks = [b for b in pg.get_text("blocks") if b[6] == 0]
+    image_cover = 0.0
+    for info in pg.get_image_info():
+        r = fitz.Rect(info["bbox"]) & pg.rect
+        image_cover += abs(r)
+    image_cover = min(1.0, image_cover / area)
+    drawings = len(pg.get_cdrawings())
+
+    if _MAP_HINT_RE.search(text) and (image_cover > 0.3 or drawings > 200):
+        return "map"
+    if drawings > 1500 and len(chars) < 1500:
+        return "map"
+    if len(chars) < OCR_MIN_CHARS and image_cover > 0.5:
+        return "scan"
+    if len(blocks) >= 12 and digit_ratio > 0.35:
+        return "table"
+    if drawings > 60 and len(blocks) >= 12 and digit_ratio > 0.15:
+        return "table"
+    if len(chars) < OCR_MIN_CHARS and image_cover > 0.1:
+        return "scan"
+    return "prose"
+
+
+def _extract_pdf_pages(pdf, with_images=False, image_dir=None, raw_pages=None, budget=None):
+    # Her sayfa en fazla bir kez rasterleştirilir: az metinli sayfalar OCR çözünürlüğünde
+    # çizilir ve sayfa görseli bu çizimden küçültülerek elde edilir.
+    # image_dir verilirse görseller üretildikleri anda PAGE_IMAGES biçiminde diske yazılır ve
+    # dosya adları döner; verilmezse (with_images) PNG ayarlarıyla PIL listesi döner.
+    # raw_pages (liste) verilirse sayfa başına PyMuPDF/OCR metni ve seçilen kaynak eklenir.
+    # budget (_DocBudget) dolarsa kalan taranmış sayfalar okunmaz, raw_pages'te "ertelendi" işaretlenir.
+    mode = PAGE_IMAGE_MODE if image_dir else ("png" if with_images else "off")
+    eager = mode in _IMAGE_EXT and mode != "lazy"
+    doc = _open_pdf(pdf)
+    try:
+        pieces = [(pg.get_text("text") or "").strip() for pg in doc]
+        native = list(pieces)
+        images = [None] * len(pieces) if eager else []
+        if mode == "lazy":
+            images = [page_image_name(i + 1, mode) for i in range(len(pieces))]
+        if image_dir and eager:
+            os.makedirs(image_dir, exist_ok=True)
+
+        def emit(i, img):
+            if image_dir:
+                name = page_image_name(i + 1, mode)
+                _write_page_image(img, os.path.join(image_dir, name), mode)
+                images[i] = name
+            else:
+                images[i] = img
+
+        low = [i for i, t in enumerate(pieces) if len(t) < OCR_MIN_CHARS] if PIL_OK else []
+        classes = [None] * len(pieces)
+        if PAGE_CLASSIFIER:
+            # Harita/tablo sayfalarının OCR çıktısı zaten ek temizliğinde atılıyor;
+            # OCR ve yüksek çözünürlüklü çizim yalnızca taranmış metin sayfalarına yapılır.
+            # Yeterli metni olan sayfalar zaten OCR'a girmez, sınıflandırılmaz (sinif None kalır).
+            for i in low:
+                classes[i] = _classify_page(doc[i], pieces[i])
+            low = [i for i in low if classes[i] == "scan"]
+        used_ocr, ocr_texts, ocr_dpi, deferred = 0, {}, {}, set()
+        ocr_ok = TESSERACT_OK or TESSEROCR_OK
+        first_zoom = OCR_DPI_LADDER[0] / 72.0
+        for start in range(0, len(low), OCR_BATCH):
+            batch = low[start:start + OCR_BATCH]
+            if ocr_ok and budget is not None and budget.expired():
+                # Kalan sayfalar beklemeden ertelenir; görselleri aşağıda yine çizilir
+                deferred.update(low[start:])
+                break
+            bws = []
+            for i in batch:
+                pg = doc[i]
+                if ocr_ok:
+                    full = _render(pg, first_zoom)
+                    bws.append(_ocr_preprocess(full))
+                    zoom = _page_image_zoom(pg, mode)
+                    if eager and zoom <= first_zoom:
+                        size = (pg.rect * fitz.Matrix(zoom)).irect
+                        emit(i, full.resize((size.width, size.height), Image.LANCZOS))
+                    del full
+                elif eager:
+                    emit(i, _render(pg, _page_image_zoom(pg, mode)))
+            if not bws:
+                continue
+            timeout = budget.timeout(len(bws)) if budget is not None else None
+            for i, (ocr_txt, conf) in zip(batch, _ocr_images_scored(bws, timeout=timeout)):
+                if ocr_txt is None:
+                    deferred.add(i)
+                    continue
+                ocr_txt, ocr_dpi[i], done = _ocr_escalate(doc[i], ocr_txt, conf, budget)
+                if not done:
+                    deferred.add(i)
+                ocr_texts[i] = ocr_txt
+                if len(ocr_txt.strip()) > len(pieces[i]):
+                    pieces[i] = ocr_txt
+                    used_ocr += 1
+        if eager:
+            for i in range(len(images)):
+                if images[i] is None:
+                    emit(i, _render(doc[i], _page_image_zoom(doc[i], mode)))
+        METRICS.inc("pages_ocr_used_total", used_ocr)
+        METRICS.inc("pages_ocr_deferred_total", len(deferred))
+        if raw_pages is not None:
+            raw_pages.extend({"pymupdf": native[i], "ocr": ocr_texts.get(i),
+                              "secilen": "ocr" if i in ocr_texts and pieces[i] is ocr_texts[i] else "pymupdf",
+                              "sinif": classes[i], "dpi": ocr_dpi.get(i), "ertelendi": i in deferred}
+                             for i in range(len(pieces)))
+        return pieces, images, used_ocr, classes
+    finally:
+        doc.close()
+
+
+def _page_image_zoom(pg, mode):
+    if mode == "thumb":
+        return PAGE_THUMB_WIDTH / max(pg.rect.width, 1)
+    return PAGE_IMAGE_ZOOM
+
+
+def page_image_name(page_no, mode=None):
+    return f"page_{page_no}.{_IMAGE_EXT[mode or PAGE_IMAGE_MODE]}"
+
+
+def _write_page_image(img, path, mode):
+    if mode in ("jpeg", "thumb"):
+        img.save(path, "JPEG", quality=PAGE_IMAGE_QUALITY, optimize=True)
+    elif mode == "webp":
+        img.save(path, "WEBP", quality=PAGE_IMAGE_QUALITY, method=4)
+    else:
+        img.save(path, "PNG")
+
+
+def ensure_page_image(record_dir, rel_path):
+    # PAGE_IMAGES=lazy: görsel ilk istendiğinde kayıttaki kaynak.pdf'ten çizilir
+    path = os.path.join(record_dir, rel_path)
+    if os.path.exists(path):
+        return path
+    m_page = re.search(r"page_(\d+)\.(\w+)$", rel_path)
+    if not (m_page and PYMUPDF_OK and PIL_OK):
+        return None
+    ext = m_page.group(2).lower()
+    mode = {"jpg": "jpeg", "webp": "webp"}.get(ext, "png")
+    with _open_pdf(os.path.join(record_dir, "kaynak.pdf")) as doc:
+        pg = doc[int(m_page.group(1)) - 1]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_page_image(_render(pg, _page_image_zoom(pg, mode)), path, mode)
+    return path
+
+
+def _render_missing_page(record_dir, page_no, name):
+    if os.path.exists(os.path.join(record_dir, "pages", name)):
+        return name
+    name = page_image_name(page_no)
+    ensure_page_image(record_dir, os.path.join("pages", name))
+    return name
+
+
+def pdf_to_text_robust(pdf) -> str:
+    pieces = []
     if PYMUPDF_OK:
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            for pg in doc:
-                txt = (pg.get_text("text") or "").strip()
-                if len(txt) < 200:
-                    ocr_txt = _ocr_page_with_tesseract(pg)
-                    if len(ocr_txt.strip()) > len(txt):
-                        txt = ocr_txt
-                        used_ocr += 1
-                pieces.append(txt)
-            doc.close()
+            pieces, _, _, _ = _extract_pdf_pages(pdf)
         except Exception:
             pieces = []
     base = "\n".join(pieces).strip()
     if len(base) < 200:
-        try:
-            params1 = LAParams(char_margin=2.0, line_margin=0.6, word_margin=0.10, boxes_flow=0.5)
-            params2 = LAParams(char_margin=2.5, line_margin=0.3, word_margin=0.05, boxes_flow=None)
-            t1 = pdf_extract_text(BytesIO(pdf_bytes), laparams=params1) or ""
-            t2 = pdf_extract_text(BytesIO(pdf_bytes), laparams=params2) or ""
-            base = t2 if len(t2) > len(t1) else t1
-        except Exception:
-            pass
-    base = _normalize_ws(base)
-    base = _dehyphenate(base)
-    base = _strip_headers_footers(base)
-    base = _strip_appendix_parts(base)
-    base = _strip_header_lines(base)
-    return base.strip()
+        found = _pdfminer_fallback(pdf, pieces)
+        if found:
+            pieces = [found.get(i, t) for i, t in enumerate(pieces)] if pieces else [found[i] for i in sorted(found)]
+            base = "\n".join(pieces).strip()
+    return CLEANER.clean(base, header_lines=True).strip()
 
 def _cut_after_appendix_markers(text: str, min_keep_chars: int = 400) -> str:
-    if not text:
-        return text
-    upper = text.upper()
-
-    markers = [
-        r"\bTARİHLİ\s+VE\s+\d+\s+SAYILI\s+CUMHURBAŞKANI\s+KARARININ\s+EK[İI]\b",
-        r"CUMHURBAŞKANI\s+KARARININ\s+EK[İI]",
-        r"\bEK[-–—]?\s*\d+\b",
-        r"\bEK[İI]\b",
-        r"\bL[İI]STE\b",
-        r"\bKROK[İI]\b",
-        r"\bKOORD[İI]NAT\s+L[İI]STES[İI]\b",
-        r"\bHAR[İI]TA\b",
-        r"\bTABLO\b",
-        r"\bŞEMA\b",
-        r"\bÇİZELGE\b",
-        r"\bGRAF[İI]K\b",
-        r"\bPROJE\s+ALANI\b",
-        r"\bALAN\s+BÜYÜKLÜĞÜ\b"
-    ]
-
-    first_idx = None
-    for pat in markers:
-        m = re.search(pat, upper, flags=re.IGNORECASE)
-        if m:
-            idx = m.start()
-            if first_idx is None or idx < first_idx:
-                first_idx = idx
+    return CLEANER.cut_after_appendix_markers(text, min_keep_chars)
 
-    if first_idx is not None and first_idx > min_keep_chars:
-        return text[:first_idx].rstrip()
-    return text
 
 def _drop_coordinate_like_lines(text: str) -> str:
-    out = []
-    for ln in (text or "").splitlines():
-        s = ln.strip()
-        if not s:
-            out.append(ln)
-            continue
-        # Eğer satırda neredeyse hiç harf yoksa ve çok sayıda sayı varsa, atla
-        if len(re.findall(r"[A-Za-zÇĞİÖŞÜçğıöşü]", s)) < 3 and len(re.findall(r"\d", s)) > 5:
-            continue
-        out.append(ln)
-    return "\n".join(out)
+    return CLEANER.drop_coordinate_like_lines(text)
 
-def _strip_appendix_parts(text: str) -> str:
 
-    t = _cut_after_appendix_markers(text)
-    t = _drop_coordinate_like_lines(t)
-    return re.sub(r"\n{3,}", "\n\n", t).strip()
+def _strip_appendix_parts(text: str) -> str:
+    return CLEANER.strip_appendix_parts(text)
 
 
 
 # ----------------------------------------------------------------------
-def parse_table_from_ocr_text(ocr_text: str) -> list[dict]:
+def _ocr_words(page, dpi=OCR_DPI, timeout=0):
+    # Taranmış sayfa için OCR kelime kutuları (PDF noktası cinsinden)
+    if not (PIL_OK and TESSERACT_OK):
+        return []
+    lang, config = _ocr_settings()
+    data = pytesseract.image_to_data(_ocr_preprocess(_render(page, dpi / 72.0)), lang=lang, config=config,
+                                     output_type=pytesseract.Output.DICT, timeout=timeout)
+    scale = 72.0 / dpi
+    words = []
+    for i, text in enumerate(data["text"]):
+        if text.strip() and float(data["conf"][i]) >= 0:
+            x, y_, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
+            words.append((x * scale, y_ * scale, (x + w) * scale, (y_ + h) * scale, text.strip()))
+    return words
+
+
+def pdf_tables(pdf, budget=None, raw=None) -> list[dict]:
+    # Bütçe dolduysa taranmış sayfalar OCR'sız geçilir ve raw'da "tablolar_ertelendi" işaretlenir
+    if not PYMUPDF_OK:
+        return []
+
+    def ocr_words(pg):
+        if budget is not None and budget.expired():
+            if raw is not None:
+                raw["tablolar_ertelendi"] = True
+            return []
+        try:
+            return _ocr_words(pg, timeout=budget.timeout() or 0 if budget is not None else 0)
+        except RuntimeError:
+            if raw is not None:
+                raw["tablolar_ertelendi"] = True
+            return []
 
+    with METRICS.timer("tables"):
+        try:
+            with _open_pdf(pdf) as doc:
+                return extract_tables(doc, ocr_words=ocr_words if PIL_OK and TESSERACT_OK else None,
+                                      is_scan=lambda pg, text: _classify_page(pg, text) == "scan")
+        except Exception as e:
+            print(f"   [UYARI] Tablolar çıkarılamadı: {e}")
+            return []
 
-    pattern = re.compile(
-        r"^\s*(\d+)\s+" 
-        r"(\d{1,2}\s+[A-Za-zŞşİıĞğÜüÖöÇç]+\s+\d{4}\s+[A-Za-zŞşİıĞğÜüÖöÇç]+)\s+" 
-        r'["“]?(.*?)["”]?\s+'  
-        r"(\d{1,2}\s+[A-Za-zŞşİıĞğÜüÖöÇç]+\s+\d{4})\s*$",
-        re.MULTILINE
-    )
 
-    matches = pattern.findall(ocr_text)
+def _staging_dir(url: str) -> str:
+    # Kayıt klasörü (seq numarası) çıkarma bitince belli olur; PDF o zamana kadar
+    # aynı dosya sistemindeki bu klasörde bekler ve sonra yeniden adlandırılarak taşınır.
+    return os.path.join(OUT_DIR, ".staging", hashlib.sha1(url.encode("utf-8")).hexdigest()[:20])
 
-    results = []
-    for match in matches:
-        results.append({
-            "sira_no": match[0].strip(),
-            "imza_tarihi_yeri": match[1].strip(),
-            "anlasma_adi": match[2].strip().replace('”', '').replace('“', ''),
-            "yururluk_tarihi": match[3].strip(),
-        })
 
-    if not results:
-        print("   [UYARI] Tablo yapısı regex ile ayrıştırılamadı. Ham OCR metni kullanılacak.")
+def _discard_staging(path: str):
+    shutil.rmtree(path, ignore_errors=True)
 
-    return results
+
+def _spool_pdf(resp, dest: str, max_bytes: int = MAX_PDF_BYTES):
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = dest + ".part"
+    if getattr(resp, "path", None):
+        # Önbellekten geliyor: blob adı zaten içeriğin SHA-256 özeti
+        link_or_copy(resp.path, tmp)
+        os.replace(tmp, dest)
+        return os.path.basename(resp.path)
+    h, size = hashlib.sha256(), 0
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ValueError(f"PDF boyut sınırı aşıldı ({max_bytes // (1024 * 1024)} MB)")
+                h.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    finally:
+        METRICS.inc("bytes_downloaded_total", size)
+    os.replace(tmp, dest)
+    return h.hexdigest()
+
+
+def fetch_detail(item: dict):
+    url = item["url"]
+    with METRICS.timer("fetch_detail"):
+        try:
+            resp = http_get(url, timeout=40, stream=True)
+            try:
+                if resp.status_code != 200:
+                    return None
+                content_type = (resp.headers.get("Content-Type") or "").lower()
+                from_cache = getattr(resp, "from_cache", False)
+                if url.lower().endswith(".pdf") or "pdf" in content_type:
+                    pdf_path = os.path.join(_staging_dir(url), "kaynak.pdf")
+                    sha = _spool_pdf(resp, pdf_path)
+                    if HTTP_CACHE is not None and not from_cache:
+                        HTTP_CACHE.store_file(url, pdf_path, resp.headers, sha)
+                    return {"body": None, "content_type": content_type, "pdf_path": pdf_path, "sha256": sha}
+                body = resp.content
+                if HTTP_CACHE is not None and not from_cache:
+                    HTTP_CACHE.store(url, body, resp.headers)
+                return {"body": body, "content_type": content_type, "pdf_path": None,
+                        "sha256": hashlib.sha256(body).hexdigest()}
+            finally:
+                resp.close()
+        except (requests.RequestException, ValueError, OSError) as e:
+            if isinstance(e, ValueError):
+                print(f"   [UYARI] {url}: {e}")
+            return None
 
 
-def format_table_as_text(table_data: list[dict]) -> str:
-    if not table_data:
-        return ""
+def raw_text(raw) -> str:
+    # Ham önbellekten temizlik öncesi metin: seçilen kaynağa göre sayfalar ya da pdfminer çıktısı
+    if raw.get("tur") == "html":
+        return raw.get("html_metin") or ""
+    if raw.get("secilen") == "pdfminer":
+        return raw.get("pdfminer") or ""
+    # Sayfanın seçilen kaynağı ("pymupdf", "ocr", "pdfminer") aynı adlı alandadır
+    return "\n".join(p.get(p["secilen"]) or "" for p in raw.get("sayfalar") or []).strip()
 
-    lines = []
-    lines.append(f"{'SIRA NO':<10} | {'İMZA TARİHİ VE YERİ':<25} | {'ANLAŞMANIN ADI':<80} | {'YÜRÜRLÜK TARİHİ':<20}")
-    lines.append("-" * 140)
 
-    for row in table_data:
-        lines.append(
-            f"{row.get('sira_no', ''):<10} | "
-            f"{row.get('imza_tarihi_yeri', ''):<25} | "
-            f"{row.get('anlasma_adi', ''):<80} | "
-            f"{row.get('yururluk_tarihi', '')}"
-        )
-    return "\n".join(lines)
+def derive_fields(raw, tablolar=None):
+    # (baslik, metin, karar_kanun_no): ağ ve OCR olmadan, yalnızca temizlik ve üst veri adımları
+    title = (raw.get("liste_basligi") or "").strip()
+    if raw.get("tur") == "html":
+        if raw.get("html_baslik"):
+            title = raw["html_baslik"]
+        text = _normalize_ws(raw_text(raw))
+    else:
+        text = CLEANER.clean(raw_text(raw)).strip()
+        marker = TABLE_MARKER_RE.search(text) if tablolar else None
+        if marker:
+            # Ek tabloları tablolar alanında; metinde eke kadar olan kısım kalır
+            text = text[:marker.end()]
+    if not title or title.lower() == "resmî gazete":
+        title = extract_title_from_text(text)
+    return title, (text or "").strip(), extract_no(text) or ""
+
 
+def raw_cache_path(record_path, url):
+    # Klasör kayıtlarında kaydın yanında; parça kayıtlarında OUT_DIR/ham altında URL özetiyle
+    if record_path and not is_shard_path(record_path):
+        return os.path.join(os.path.dirname(record_path), RAW_CACHE_NAME)
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(OUT_DIR, "ham", h[:2], h + ".json.gz")
 
 
-def parse_detail(item: dict, date_str: str, seq_num: int) -> ResmiGazeteKaydi | None:
-    url = item["url"]
+def write_raw(path, raw):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path + ".tmp", "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(raw, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def load_raw(path):
     try:
-        resp = SESSION.get(url, timeout=40)
-        if resp.status_code != 200:
-            return None
-    except requests.RequestException:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
         return None
 
-    content_type = (resp.headers.get("Content-Type") or "").lower()
-    title = item.get("title_from_list", "").strip()
-    text = ""
-    pdf_bytes, images = None, []
-
-    if url.lower().endswith(".pdf") or "pdf" in content_type:
-        pdf_bytes = resp.content
-        text, images = pdf_to_text_robust_with_images(pdf_bytes)
-
-        if "CUMHURBAŞKANI KARARININ EKİ" in text or "LİSTE" in text:
-            table_data = parse_table_from_ocr_text(text)
-            if table_data:
-                header_part = ""
-                if "LİSTE" in text:
-                    header_part = text.split("LİSTE")[0] + "LİSTE\n"
-                elif "CUMHURBAŞKANI KARARININ EKİ" in text:
-                    parts = text.split("CUMHURBAŞKANI KARARININ EKİ")
-                    header_part = parts[0] + "CUMHURBAŞKANI KARARININ EKİ\n"
-
-                formatted_table = format_table_as_text(table_data)
-                text = header_part + "\n" + formatted_table
+
+def extract_detail(item: dict, date_str: str, fetched: dict):
+    url = item["url"]
+    raw = {"surum": RAW_VERSION, "liste_basligi": item.get("title_from_list", "")}
+    pdf_path, images, tablolar = fetched.get("pdf_path"), [], []
+    budget = _DocBudget()
+
+    if pdf_path:
+        image_dir = os.path.join(os.path.dirname(pdf_path), "pages") if SINK is None else None
+        _, images = pdf_to_text_robust_with_images(pdf_path, image_dir=image_dir, raw=raw, budget=budget)
+    elif FAST_INDEX_PARSER:
+        raw["tur"] = "html"
+        raw["html_baslik"], raw["html_metin"] = title_and_raw_text_fast(fetched["body"])
     else:
-        soup = BeautifulSoup(resp.content, "lxml")
+        raw["tur"] = "html"
+        soup = BeautifulSoup(fetched["body"], "lxml")
         try:
-            t = extract_title(soup)
-            if t:
-                title = t
+            raw["html_baslik"] = extract_title(soup) or None
         except Exception:
-            pass
-        text = _normalize_ws(clean_text(soup))
+            raw["html_baslik"] = None
+        raw["html_metin"] = clean_text(soup)
+
+    title, text, karar_kanun_no = derive_fields(raw)
+    # Ek başlığı temizlenmiş metinde olmayabilir (temizlik eke gelince keser); ham sayfa metnine bakılır
+    if pdf_path and TABLE_MARKER_RE.search(raw_text(raw)):
+        tablolar = pdf_tables(pdf_path, budget=budget, raw=raw)
+        if tablolar:
+            title, text, karar_kanun_no = derive_fields(raw, tablolar)
+    eksik = [i + 1 for i, p in enumerate(raw.get("sayfalar") or []) if p.get("ertelendi")]
+    kismi = bool(eksik or raw.get("tablolar_ertelendi"))
+    if RAW_CACHE or BLOBS is not None or kismi:
+        # Kayıt yazılırken kaydın yanına (reprocess, ocr_retry) ve içerik deposuna taşınır
+        write_raw(os.path.join(_staging_dir(url), RAW_CACHE_NAME), raw)
+
+    # Pydantic model nesnesi oluştur
+    rec = ResmiGazeteKaydi(
+        tarih=item.get("date_from_header") or date_str,
+        sayi=item.get("issue") or "NA",
+        kategori=item["category"],
+        baslik=title,
+        karar_kanun_no=karar_kanun_no,
+        kaynak_url=url,
+        metin=text,
+        tablolar=tablolar,
+        icerik_ozeti=fetched.get("sha256") or "",
+        kismi=kismi,
+        eksik_sayfalar=eksik,
+    )
 
-    karar_kanun_no = extract_no(text)
-    tarih = item.get("date_from_header") or date_str
+    return rec, pdf_path, images
 
-    if not title or title.lower() == "resmî gazete":
-        title = extract_title_from_text(text)
 
-    # Pydantic model nesnesi oluştur
+def reuse_extraction(item: dict, date_str: str, fetched: dict):
+    # Aynı gövde daha önce çıkarıldıysa ham çıktı depodan alınır, alanlar bu kalemin liste
+    # başlığıyla yeniden türetilir; görseller hazırlık klasörüne bağlanır. Depoda yoksa None.
+    sha = fetched.get("sha256")
+    if BLOBS is None or not sha:
+        return None
+    entry = BLOBS.get(sha, need_images=SINK is None and PAGE_IMAGE_MODE != "off")
+    if entry is None or (entry["kind"] == "pdf") != bool(fetched.get("pdf_path")):
+        return None
+    raw = load_raw(entry["raw_path"])
+    if raw is None:
+        return None
+    url = item["url"]
+    raw["liste_basligi"] = item.get("title_from_list", "")
+    staging = _staging_dir(url)
+    images = []
+    if entry["kind"] == "pdf" and SINK is None:
+        BLOBS.link_pages(entry, os.path.join(staging, "pages"))
+        images = entry["images"] or []
+        if PAGE_IMAGE_MODE != "lazy":
+            # PAGE_IMAGES=lazy çalıştırmasından gelen kayıtta görsel dosyası yok; eksikler şimdi
+            # kaynak.pdf'ten çizilir, yoksa kayıt her çalıştırmada yarım kalıp yeniden indirilirdi
+            images = [_render_missing_page(staging, i + 1, name) for i, name in enumerate(images)]
+    tablolar = entry["tablolar"]
+    title, text, karar_kanun_no = derive_fields(raw, tablolar)
+    if RAW_CACHE:
+        write_raw(os.path.join(staging, RAW_CACHE_NAME), raw)
+    BLOBS.touch(sha)
+    METRICS.inc("blob_reuse_total")
     rec = ResmiGazeteKaydi(
-        tarih=tarih,
+        tarih=item.get("date_from_header") or date_str,
         sayi=item.get("issue") or "NA",
         kategori=item["category"],
         baslik=title,
-        karar_kanun_no=karar_kanun_no or "",
+        karar_kanun_no=karar_kanun_no,
         kaynak_url=url,
-        metin=(text or "").strip(),
+        metin=text,
+        tablolar=tablolar,
+        icerik_ozeti=sha,
     )
+    return rec, fetched.get("pdf_path"), images
+
+
+def publish_blob(rec, staging, page_images=None):
+    # İlk çıkarımın ham çıktısı ve görselleri depoya bağlanır (kayıt klasörüne taşınmadan önce)
+    staged_raw = os.path.join(staging, RAW_CACHE_NAME)
+    if BLOBS is None or not rec.icerik_ozeti or rec.kismi or not os.path.exists(staged_raw):
+        # Kısmi çıkarımlar depoya girmez; aynı gövdenin sonraki gelişi yeniden çıkarılır
+        return
+    names = [p for p in page_images or [] if isinstance(p, str)]
+    kind = "pdf" if os.path.exists(os.path.join(staging, "kaynak.pdf")) else "html"
+    try:
+        BLOBS.put(rec.icerik_ozeti, kind, str(rec.kaynak_url), staged_raw,
+                  tablolar=[t.model_dump() for t in rec.tablolar or []],
+                  images=names if SINK is None and (names or kind == "html") else None,
+                  pages_dir=os.path.join(staging, "pages"))
+    except (OSError, sqlite3.Error) as e:
+        print(f"   [UYARI] İçerik deposu güncellenemedi: {e}")
 
-    save_rec_with_pdf_and_images(seq_num, rec, pdf_bytes=pdf_bytes, page_images=images)
 
+def _timed_extract(item: dict, date_str: str, fetched: dict):
+    with METRICS.timer("extract_detail"):
+        return extract_detail(item, date_str, fetched)
+
+
+def _extract_job(item: dict, date_str: str, fetched: dict):
+    # Çıkarma süreçte çalışır; sayaçlar sonuçla birlikte ana sürece taşınır
+    built = _timed_extract(item, date_str, fetched)
+    return built, METRICS.drain()
+
+
+def build_detail(item: dict, date_str: str):
+    fetched = fetch_detail(item)
+    if not fetched:
+        return None
+    built = reuse_extraction(item, date_str, fetched) or _timed_extract(item, date_str, fetched)
+    if not built and fetched["pdf_path"]:
+        _discard_staging(os.path.dirname(fetched["pdf_path"]))
+    return built
+
+
+def save_record(seq_num, rec, pdf_path=None, page_images=None):
+    with METRICS.timer("save"):
+        staging = _staging_dir(str(rec.kaynak_url))
+        publish_blob(rec, staging, page_images)
+        if SINK is not None:
+            rec.pdf_dosyasi, rec.sayfa_resimleri = "", []
+            path = SINK.write(rec)
+            staged_raw = os.path.join(staging, RAW_CACHE_NAME)
+            if (RAW_CACHE or rec.kismi) and os.path.exists(staged_raw):
+                dest = raw_cache_path(path, str(rec.kaynak_url))
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                os.replace(staged_raw, dest)
+            _discard_staging(staging)
+        else:
+            path = save_rec_with_pdf_and_images(seq_num, rec, page_images=page_images, pdf_path=pdf_path)
+    if SEARCH_INDEX is not None:
+        with METRICS.timer("index"):
+            try:
+                SEARCH_INDEX.add(rec, path)
+            except sqlite3.Error as e:
+                print(f"   [UYARI] Arama dizini güncellenemedi: {e}")
+    if rec.kismi:
+        defer_ocr(rec, path)
+    METRICS.inc("records_saved_total")
+    return path
+
+
+def parse_detail(item: dict, date_str: str, seq_num: int) -> ResmiGazeteKaydi | None:
+    with METRICS.timer("parse_detail"):
+        built = build_detail(item, date_str)
+    if not built:
+        METRICS.inc("records_failed_total")
+        return None
+    rec, pdf_path, images = built
+    save_record(seq_num, rec, pdf_path=pdf_path, page_images=images)
     return rec
 
 
+def _init_extract_worker():
+    # Modül yüklenirken sayılanlar (ör. önbellek açılışı) ana süreçte de sayıldı; işçide tekrar sayılmasın
+    METRICS.reset()
+
+
+def process_context():
+    # Havuzlar ilk submit'te, indirme iş parçacıkları çalışırken süreç açar. fork o anda başka bir iş
+    # parçacığının tuttuğu kilidi (METRICS, önbellek) kilitli kopyalayabilir; işçiler spawn ile temiz
+    # başlar. (forkserver işçileri bu sürecin değil sunucunun çocuğu olur, CPU/RSS ölçümünde görünmez.)
+    return multiprocessing.get_context("spawn")
+
 
-def main():
+def extract_executor(workers: int = EXTRACT_WORKERS):
+    # PDF/OCR işi CPU'ya bağlı; GIL'e takılmasın diye ayrı süreçlerde çalışır
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=process_context(), initializer=_init_extract_worker)
+
+
+def process_items(items: list[dict], date_str: str, issue: str, concurrency: int = FETCH_CONCURRENCY,
+                  extract_pool=None, manifest: Manifest | None = MANIFEST, on_record=None):
+    for it in items:
+        it["issue"] = issue
+
+    done = {}
+    if manifest is not None and not FORCE_REPROCESS:
+        done = {u: e for u, e in manifest.done_entries([it["url"] for it in items]).items()
+                if record_is_complete(e["record_path"], u)}
+    todo = [it for it in items if it["url"] not in done]
+    if done:
+        print(f"   {len(done)} kayıt önceki çalışmada tamamlanmış, atlanıyor.")
+
+    def fetch_then_extract(item):
+        t0 = time.perf_counter()
+        if manifest is not None:
+            manifest.mark_started(item["url"], date_str)
+        fetched = fetch_detail(item)
+        if not fetched:
+            return None, None
+        content_hash = fetched["sha256"]
+        reused = reuse_extraction(item, date_str, fetched)
+        if reused:
+            METRICS.observe("stage_seconds", time.perf_counter() - t0, stage="parse_detail")
+            return content_hash, reused
+        if extract_pool is None:
+            built = _timed_extract(item, date_str, fetched)
+            METRICS.observe("stage_seconds", time.perf_counter() - t0, stage="parse_detail")
+            return content_hash, built
+        fut = extract_pool.submit(_extract_job, item, date_str, fetched)
+        fut.add_done_callback(
+            lambda _: METRICS.observe("stage_seconds", time.perf_counter() - t0, stage="parse_detail"))
+        return content_hash, fut
+
+    # İndirmeler paralel biter, ama sonuçlar liste sırasıyla alındığı için
+    # seq numaraları (ve klasör adları) tamamlanma sırasından bağımsızdır.
+    # Önceki çalışmalarda verilmiş numaralar korunur, yeni kayıtlar boştakileri alır. Aynı sayı
+    # numarasını taşıyan mükerrer sayfalar aynı klasör adlarını üretir; günün diğer sayfalarındaki
+    # kayıtların numaraları da dolu sayılır.
+    used_seqs = {e["seq"] for e in done.values()}
+    if manifest is not None:
+        used_seqs |= manifest.day_seqs(date_str, exclude={it["url"] for it in items})
+    seq, saved = 1, 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(fetch_then_extract, it) for it in todo]
+        for it, fut in zip(todo, futures):
+            try:
+                content_hash, built = fut.result()
+                if isinstance(built, Future):
+                    built, snap = built.result()
+                    METRICS.merge(snap)
+            except Exception as e:
+                print(f"   [UYARI] {it['url']} işlenemedi: {e}")
+                built = None
+            if not built:
+                METRICS.inc("records_failed_total")
+                _discard_staging(_staging_dir(it["url"]))
+                if manifest is not None:
+                    manifest.mark_failed(it["url"])
+                continue
+            while seq in used_seqs:
+                seq += 1
+            rec, pdf_path, images = built
+            json_path = save_record(seq, rec, pdf_path=pdf_path, page_images=images)
+            if manifest is not None:
+                manifest.mark_done(it["url"], date_str, content_hash, json_path, seq)
+            print(f"   -> {rec.baslik[:60]}... [kaydedildi]")
+            if on_record is not None:
+                on_record(rec, json_path)
+            seq += 1
+            saved += 1
+    if SINK is not None:
+        # Günün parçaları kapanır; manifest'teki yollar bundan sonra okunabilir
+        SINK.close()
+    return saved, len(todo) - saved
+
+
+def main(days=DAY_WINDOW):
     boot_session()
     today = datetime.now(tz=tz.tzlocal()).date()
     # son kaç gün olacağı belirleniyor
-    dates = [today - timedelta(days=i) for i in range(0, 7)]
-    for d in dates:
-        ds = ddmmyyyy(datetime.combine(d, datetime.min.time()))
-        print(f"[+] Gün: {ds}")
+    dates = [today - timedelta(days=i) for i in range(0, days)]
+    extract_pool = extract_executor()
+    try:
+        run_dates(dates, extract_pool)
+    finally:
+        if extract_pool:
+            extract_pool.shutdown()
+        if SINK is not None:
+            SINK.close()
+        write_metrics()
+
+
+def write_metrics():
+    # Boş değer verilirse ilgili çıktı kapanır
+    json_path = os.getenv("METRICS_JSON", os.path.join(OUT_DIR, "run_metrics.json"))
+    prom_path = os.getenv("METRICS_PROM", os.path.join(OUT_DIR, "metrics.prom"))
+    try:
+        METRICS.write(json_path or None, prom_path or None)
+    except OSError as e:
+        print(f"[UYARI] Metrikler yazılamadı: {e}")
+
+
+def pdf_index_item(pack, ds):
+    # Eski sayılarda günün fihristi yalnızca tam sayı PDF'i olarak yayımlanmış; tek kayıt olarak işlenir
+    return {"category": "TAM SAYI", "url": pack["pdf_index_url"], "title_from_list": f"{ds} tarihli Resmî Gazete",
+            "issue": pack.get("issue", "NA"), "date_from_header": ds}
+
+
+def process_day(d, extract_pool=None):
+    # (durum, kaydedilen, başarısız): durum "done", içerik bulunamadıysa "empty", fihrist
+    # sunucu/ağ hatası yüzünden alınamadıysa "error"
+    ds = ddmmyyyy(datetime.combine(d, datetime.min.time()))
+    print(f"[+] Gün: {ds}")
+    try:
         pack = collect_for_date(d)
-        if not pack:
-            print("   (Hiçbir aday URL’den içerik alınamadı)")
-            continue
-        items, issue = pack["items"], pack.get("issue", "NA")
-        if not items:
-            if pack.get("pdf_index_url"):
-                print(f"   Liste HTML’i yerine PDF indeks bulundu: {pack['pdf_index_url']}")
-            else:
-                print("   Sayfa açıldı ama listelenecek bağlantı bulunamadı.")
-            continue
+    except FetchError as e:
+        print(f"   [UYARI] {e}; gün yeniden denenecek.")
+        return "error", 0, 0
+    if not pack:
+        print("   (Hiçbir aday URL’den içerik alınamadı)")
+        return "empty", 0, 0
+    items, issue = pack["items"], pack.get("issue", "NA")
+    if not items:
+        if not pack.get("pdf_index_url"):
+            print("   Sayfa açıldı ama listelenecek bağlantı bulunamadı.")
+            return "empty", 0, 0
+        print(f"   Liste HTML’i yerine PDF indeks bulundu: {pack['pdf_index_url']} (tek kayıt olarak işleniyor)")
+        items = [pdf_index_item(pack, ds)]
+    else:
         print(f"   {len(items)} bağlantı bulundu (İlan Bölümü hariç). Ayrıştırılıyor...")
-        seq = 1
-        for it in items:
-            it["issue"] = issue
-            rec = parse_detail(it, ds, seq)
-            if rec:
-                print(f"   -> {rec.baslik[:60]}... [kaydedildi]")
-                seq += 1
-            time.sleep(0.4)
+    saved, failed = process_items(items, ds, issue, extract_pool=extract_pool)
+    return "done", saved, failed
+
+
+def run_dates(dates, extract_pool=None):
+    for d in dates:
+        process_day(d, extract_pool)
+
+
+def _fmt_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600} sa {seconds % 3600 // 60} dk"
+    return f"{seconds // 60} dk {seconds % 60} sn"
+
+
+def backfill(start, end, partitions=4, budget=None, retry_empty=False, extract_pool=None,
+             manifest: Manifest = MANIFEST):
+    # Tarih aralığını eski günlerden yeniye işler. Günler ortak bir kuyruktan birden fazla iş
+    # parçacığına dağıtılır; host başına hız sınırı tüm parçalar için ortaktır. Tamamlanan günler
+    # manifest'e yazılır, yeniden başlatıldığında atlanır.
+    global REQUEST_BUDGET
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    finished = set() if FORCE_REPROCESS else manifest.finished_days(("done",) if retry_empty else ("done", "empty"))
+    todo = [d for d in days if d.isoformat() not in finished]
+    print(f"[=] {len(days)} gün, {len(days) - len(todo)} gün daha önce tamamlanmış, {len(todo)} gün işlenecek.")
+    if not todo:
+        return 0
+    REQUEST_BUDGET = _RequestBudget(budget) if budget else None
+
+    queue = list(reversed(todo))
+    lock = threading.Lock()
+    stats = {"days": 0, "saved": 0, "failed": 0}
+    t0 = time.monotonic()
+
+    def report():
+        elapsed = time.monotonic() - t0
+        rate = stats["days"] / elapsed if elapsed > 0 else 0.0
+        eta = (len(todo) - stats["days"]) / rate if rate else 0.0
+        print(f"[=] {stats['days']}/{len(todo)} gün, {stats['saved']} kayıt ({stats['saved'] / max(elapsed, 1e-9):.2f} kayıt/sn, "
+              f"{rate * 3600:.0f} gün/sa), {stats['failed']} hata, tahmini kalan {_fmt_duration(eta)}")
+
+    def worker():
+        while True:
+            with lock:
+                if not queue or (REQUEST_BUDGET is not None and REQUEST_BUDGET.exhausted):
+                    return
+                d = queue.pop()
+            try:
+                status, saved, failed = process_day(d, extract_pool)
+            except Exception as e:
+                print(f"   [UYARI] {d.isoformat()} işlenemedi: {e}")
+                continue
+            # Bütçe gün ortasında dolduysa gün yarım kalmıştır; işaretlenmez, sonraki çalışmada sürer
+            if REQUEST_BUDGET is not None and REQUEST_BUDGET.exhausted:
+                return
+            # Kaydı başarısız olan ya da fihristi alınamayan gün tamamlanmış sayılmaz; sonraki
+            # çalışmada yeniden ele alınır (tamamlanan kayıtlar manifest sayesinde atlanır)
+            if status == "done" and failed:
+                status = "partial"
+            manifest.mark_day(d.isoformat(), status, saved)
+            with lock:
+                stats["days"] += 1
+                stats["saved"] += saved
+                stats["failed"] += failed
+                report()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, partitions))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if REQUEST_BUDGET is not None and REQUEST_BUDGET.exhausted:
+        print(f"[=] İstek bütçesi ({REQUEST_BUDGET.limit}) doldu; kalan günler bir sonraki çalışmada işlenecek.")
+    REQUEST_BUDGET = None
+    return stats["days"]
+
+
+_MUKERRER_RE = re.compile(r"m[üu]kerrer", re.I)
+_MUKERRER_HREF_RE = re.compile(r"m[üu]kerrer|\d{8}M\d+\.", re.I)
+
+
+def mukerrer_links(page_url, page, exclude=()):
+    # Günün sayfasındaki mükerrer sayı bağlantıları (metni "mükerrer" içeren ya da adresi
+    # ...20240115M1.htm biçiminde olanlar); fihristteki belge bağlantıları exclude ile elenir
+    if isinstance(page, BeautifulSoup):
+        anchors = [(a["href"], a.get_text(" ", strip=True)) for a in page.find_all("a", href=True)]
+    else:
+        anchors = [(a.get("href"), fast_html.get_text(a, " ")) for a in page.iter("a") if a.get("href") is not None]
+    out = []
+    for href, text in anchors:
+        if _MUKERRER_RE.search(text) or _MUKERRER_HREF_RE.search(href):
+            url = urljoin(page_url, href)
+            if url != page_url and url not in exclude and url not in out:
+                out.append(url)
+    return out
+
+
+class _PagePoller:
+    # Koşullu istekle (If-None-Match / If-Modified-Since) sayfa yoklar; içerik değişmediyse None döner
+    def __init__(self):
+        self.state = {}
+
+    def poll(self, url, timeout=30):
+        st = self.state.setdefault(url, {})
+        headers = {"Referer": BASE}
+        if st.get("etag"): headers["If-None-Match"] = st["etag"]
+        if st.get("last_modified"): headers["If-Modified-Since"] = st["last_modified"]
+        r = _send(url, timeout=timeout, allow_redirects=True, headers=headers)
+        if r.status_code != 200:
+            return None
+        digest = hashlib.sha256(r.content).hexdigest()
+        st.update(etag=r.headers.get("ETag"), last_modified=r.headers.get("Last-Modified"))
+        if digest == st.get("sha256"):
+            return None
+        st["sha256"] = digest
+        return r.content
+
+
+def watch(interval=120, hooks=(), extract_pool=None, once=False):
+    # Bugünün sayfasını (ve bulunan mükerrer sayılarını) aralıklarla yoklar; sayfa değiştiğinde
+    # yalnızca manifest'te olmayan kalemler işlenir, biten her kayıt kancalara gönderilir.
+    poller = _PagePoller()
+    day, pages = None, []
+
+    def emit(rec, json_path):
+        record = rec.model_dump(mode="json")
+        record["kayit_yolu"] = json_path
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                print(f"   [UYARI] Kanca çalıştırılamadı: {e}")
+
+    while True:
+        today = datetime.now(tz=tz.tzlocal()).date()
+        ds = ddmmyyyy(today)
+        if today != day:
+            day, pages, poller.state = today, [urljoin(BASE, ds)], {}
+        # Döngü sırasında bulunan mükerrer sayfalar listeye eklenir ve aynı turda yoklanır
+        for url in pages:
+            try:
+                content = poller.poll(url)
+            except requests.RequestException as e:
+                print(f"   [UYARI] {url} yoklanamadı: {e}")
+                continue
+            if content is None:
+                continue
+            page = parse_page(content)
+            items, issue = collect_from_page(url, page)
+            for link in mukerrer_links(url, page, exclude={it["url"] for it in items}):
+                if link not in pages:
+                    print(f"[+] Mükerrer sayı bulundu: {link}")
+                    pages.append(link)
+            if not items:
+                continue
+            print(f"[+] {ds} sayı {issue}: {len(items)} bağlantı, yeni olanlar işleniyor...")
+            process_items(items, ds, issue, extract_pool=extract_pool, on_record=emit)
+        write_metrics()
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main_watch(args):
+    # stdout kancası varken ilerleme mesajları stderr'e gider, stdout yalnızca JSON satırı taşır
+    real_stdout = sys.stdout
+    hooks = [make_hook(spec, real_stdout) for spec in args.hook]
+    redirect = redirect_stdout(sys.stderr) if any(isinstance(h, StdoutHook) for h in hooks) else nullcontext()
+    extract_pool = extract_executor()
+    with redirect:
+        try:
+            boot_session()
+            watch(args.interval, hooks, extract_pool, once=args.once)
+        except KeyboardInterrupt:
+            print("[=] İzleme durduruldu.")
+        finally:
+            if extract_pool:
+                extract_pool.shutdown()
+            if SINK is not None:
+                SINK.close()
+            write_metrics()
+
+
+# Kuyruk modu: keşif -> indirme -> çıkarma -> kayıt aşamaları ayrı işçi komutlarıyla çalışır.
+# Aşamalar arası yükler JSON'dur; indirilen gövdeler hazırlık klasöründe (OUT_DIR/.staging) bekler.
+QUEUE_PATH = os.getenv("SCRAPER_QUEUE", os.path.join(OUT_DIR, "queue.sqlite"))
+QUEUE_LEASE = float(os.getenv("QUEUE_LEASE", "300"))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "5"))
+QUEUE_STAGES = STAGES
+
+
+class StageError(Exception):
+    # retryable=False: yeniden denemenin anlamı yok, iş doğrudan "dead" olur
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def open_queue(path=None):
+    return WorkQueue(path or QUEUE_PATH, max_attempts=QUEUE_MAX_ATTEMPTS)
+
+
+def _discover_stage(payload, manifest=MANIFEST):
+    # seq numaraları burada, fihrist sırasıyla verilir; kayıt klasör adları işçi sayısından bağımsızdır
+    d = datetime.strptime(payload["date"], "%Y-%m-%d").date()
+    ds = ddmmyyyy(d)
+    print(f"[+] Gün: {ds}")
+    pack = collect_for_date(d)
+    items = (pack or {}).get("items") or []
+    if pack and not items and pack.get("pdf_index_url"):
+        items = [pdf_index_item(pack, ds)]
+    if not items:
+        print("   (İçerik bulunamadı)")
+        if manifest is not None:
+            manifest.mark_day(payload["date"], "empty")
+        return []
+    issue = pack.get("issue", "NA")
+    done = {}
+    if manifest is not None and not FORCE_REPROCESS:
+        done = {u: e for u, e in manifest.done_entries([it["url"] for it in items]).items()
+                if record_is_complete(e["record_path"], u)}
+    used_seqs = {e["seq"] for e in done.values()}
+    if manifest is not None:
+        used_seqs |= manifest.day_seqs(ds, exclude={it["url"] for it in items})
+    jobs, seq = [], 1
+    for it in items:
+        it["issue"] = issue
+        if it["url"] in done:
+            continue
+        while seq in used_seqs:
+            seq += 1
+        jobs.append((it["url"], {"item": it, "date_str": ds, "seq": seq}))
+        seq += 1
+    print(f"   {len(items)} bağlantı, {len(jobs)} tanesi kuyruğa alındı.")
+    return jobs
+
+
+def _fetch_stage(payload, manifest=MANIFEST):
+    item = payload["item"]
+    url = item["url"]
+    if manifest is not None:
+        manifest.mark_started(url, payload["date_str"])
+    fetched = fetch_detail(item)
+    if not fetched:
+        raise StageError(f"{url} indirilemedi")
+    body = fetched.pop("body")
+    if body is not None:
+        # HTML gövdesi de PDF gibi hazırlık klasöründe bekler; kuyrukta yalnızca yolu taşınır
+        body_path = os.path.join(_staging_dir(url), "kaynak.html")
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        with open(body_path + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(body_path + ".tmp", body_path)
+        fetched["body_path"] = body_path
+    return [(url, dict(payload, fetched=fetched))]
+
+
+def _extract_stage(payload):
+    item, fetched = payload["item"], dict(payload["fetched"])
+    for key in ("pdf_path", "body_path"):
+        if fetched.get(key) and not os.path.exists(fetched[key]):
+            raise StageError(f"Hazırlık dosyası yok: {fetched[key]}", retryable=False)
+    if fetched.get("body_path"):
+        with open(fetched["body_path"], "rb") as f:
+            fetched["body"] = f.read()
+    built = reuse_extraction(item, payload["date_str"], fetched) or _timed_extract(item, payload["date_str"], fetched)
+    if not built:
+        raise StageError(f"{item['url']} ayrıştırılamadı")
+    rec, pdf_path, images = built
+    # Parça modunda görseller saklanmaz; PIL görüntüleri kuyruğa taşınmaz
+    names = [i for i in images if isinstance(i, str)]
+    return [(item["url"], {"item": item, "date_str": payload["date_str"], "seq": payload["seq"],
+                           "content_hash": fetched["sha256"], "rec": rec.model_dump(mode="json"),
+                           "pdf_path": pdf_path, "images": names})]
+
+
+def _store_stage(payload, manifest=MANIFEST):
+    url = payload["item"]["url"]
+    if manifest is not None:
+        # Önceki deneme kaydı yazıp kuyruğu güncelleyemeden öldüyse tekrar yazılmaz
+        entry = manifest.get(url)
+        if entry and entry["status"] == "done" and entry["seq"] == payload["seq"] \
+                and record_is_complete(entry["record_path"], url):
+            return []
+    pdf_path = payload["pdf_path"]
+    if pdf_path and not os.path.exists(pdf_path):
+        raise StageError(f"Hazırlık dosyası yok: {pdf_path}", retryable=False)
+    rec = ResmiGazeteKaydi(**payload["rec"])
+    json_path = save_record(payload["seq"], rec, pdf_path=pdf_path, page_images=payload["images"] or None)
+    _discard_staging(_staging_dir(url))
+    if manifest is not None:
+        manifest.mark_done(url, payload["date_str"], payload["content_hash"], json_path, payload["seq"])
+    print(f"   -> {rec.baslik[:60]}... [kaydedildi]")
+    return []
+
+
+_retry_queue = None
+_retry_queue_lock = threading.Lock()
+
+
+def set_retry_queue(queue):
+    # Kuyruk işçisi kısmi kayıtları kendi kuyruğuna (--queue) erteler; verilmezse QUEUE_PATH açılır
+    global _retry_queue
+    with _retry_queue_lock:
+        _retry_queue = queue
+
+
+def defer_ocr(rec, record_path):
+    # Kısmi kayıt ocr_retry aşamasına alınır; kuyruk modu dışında da (run/backfill) aynı kuyruk dosyası
+    # kullanılır, sayfalar "python cli.py worker ocr_retry" ile tamamlanır
+    global _retry_queue
+    with _retry_queue_lock:
+        if _retry_queue is None:
+            _retry_queue = open_queue()
+    url = str(rec.kaynak_url)
+    try:
+        _retry_queue.put(RETRY_STAGE, url, {"url": url, "record_path": record_path}, reset=True)
+    except sqlite3.Error as e:
+        print(f"   [UYARI] OCR yeniden deneme kuyruğa alınamadı: {e}")
+        return
+    METRICS.inc("ocr_retry_queued_total")
+    print(f"   [UYARI] Süre bütçesi doldu, {len(rec.eksik_sayfalar or [])} sayfa arka planda yeniden okunacak")
+
+
+def _retry_pages(pdf_path, raw):
+    # Ertelenen sayfalar belge bütçesi olmadan, sayfa başına OCR_RETRY_PAGE_BUDGET ile okunur.
+    # Tablolar ertelendiyse yeniden çıkarılır (değilse None döner).
+    pages, tablolar = raw.get("sayfalar") or [], None
+    with _open_pdf(pdf_path) as doc:
+        for i, p in enumerate(pages):
+            if not p.get("ertelendi"):
+                continue
+            budget = _DocBudget(0, 0, OCR_RETRY_PAGE_BUDGET)
+            txt, conf = _ocr_images_scored([_ocr_preprocess(_render(doc[i], OCR_DPI_LADDER[0] / 72.0))],
+                                           timeout=budget.timeout())[0]
+            if txt is None:
+                continue
+            txt, dpi, done = _ocr_escalate(doc[i], txt, conf, budget)
+            other = "pdfminer" if p.get("pdfminer") else "pymupdf"
+            p.update(ocr=txt, dpi=dpi, ertelendi=not done,
+                     secilen="ocr" if len(txt.strip()) > len(p[other]) else other)
+            METRICS.inc("pages_ocr_retried_total")
+    if raw.get("tablolar_ertelendi"):
+        status = {}
+        tablolar = pdf_tables(pdf_path, budget=_DocBudget(0, 0, OCR_RETRY_PAGE_BUDGET), raw=status)
+        if not status.get("tablolar_ertelendi"):
+            raw.pop("tablolar_ertelendi")
+    if raw.get("secilen") == "pdfminer":
+        # Sayfalar artık pdfminer çıktısından uzunsa sayfa metnine dönülür
+        pages_text = raw_text(dict(raw, secilen="sayfalar"))
+        if len(pages_text) >= len(raw.get("pdfminer") or ""):
+            raw.update(secilen="sayfalar", pdfminer=None)
+    return tablolar
+
+
+def _ocr_retry_stage(payload):
+    url, record_path = payload["url"], payload["record_path"]
+    shard = is_shard_path(record_path)
+    if shard and not os.path.exists(record_path):
+        raise StageError(f"Parça henüz kapanmadı: {record_path}")
+    raw_path = raw_cache_path(record_path, url)
+    raw = load_raw(raw_path)
+    if raw is None:
+        raise StageError(f"Ham önbellek yok: {raw_path}", retryable=False)
+
+    tablolar = None
+    if any(p.get("ertelendi") for p in raw.get("sayfalar") or []) or raw.get("tablolar_ertelendi"):
+        # Klasör kaydında kaynak.pdf kaydın yanındadır; parça modunda (HTTP önbelleğinden) yeniden indirilir
+        pdf_path, staging = None if shard else os.path.join(os.path.dirname(record_path), "kaynak.pdf"), None
+        if not pdf_path or not os.path.exists(pdf_path):
+            fetched = fetch_detail({"url": url})
+            if not fetched or not fetched.get("pdf_path"):
+                raise StageError(f"{url} indirilemedi")
+            pdf_path, staging = fetched["pdf_path"], os.path.dirname(fetched["pdf_path"])
+        try:
+            tablolar = _retry_pages(pdf_path, raw)
+        finally:
+            if staging:
+                _discard_staging(staging)
+        write_raw(raw_path, raw)
+
+    eksik = [i + 1 for i, p in enumerate(raw.get("sayfalar") or []) if p.get("ertelendi")]
+
+    def update(rec):
+        if str(rec.kaynak_url) != url:
+            return False
+        if tablolar is not None:
+            rec.tablolar = [Tablo(**t) for t in tablolar]
+        _rederive(rec, raw)
+        rec.kismi, rec.eksik_sayfalar = bool(eksik or raw.get("tablolar_ertelendi")), eksik
+        return True
+
+    if shard:
+        _, changed = rewrite_shard(record_path, update)
+    else:
+        with open(record_path, encoding="utf-8") as f:
+            rec = ResmiGazeteKaydi(**json.load(f))
+        changed = [rec] if update(rec) else []
+        if changed:
+            tmp_path = record_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(rec.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, record_path)
+    if not changed:
+        raise StageError(f"Kayıt bulunamadı: {record_path}", retryable=False)
+    rec = changed[0]
+    if SEARCH_INDEX is not None:
+        try:
+            SEARCH_INDEX.add(rec, record_path)
+        except sqlite3.Error as e:
+            print(f"   [UYARI] Arama dizini güncellenemedi: {e}")
+    if rec.kismi:
+        # Sayfa bütçesi de yetmedi; ilerleme ham önbellekte, iş geri çekilerek yeniden denenir
+        raise StageError(f"{len(eksik)} sayfa hâlâ okunamadı")
+    if BLOBS is not None and rec.icerik_ozeti:
+        try:
+            BLOBS.put(rec.icerik_ozeti, "pdf", url, raw_path, tablolar=[t.model_dump() for t in rec.tablolar or []],
+                      images=None if shard else [os.path.basename(p) for p in rec.sayfa_resimleri or []],
+                      pages_dir=None if shard else os.path.join(os.path.dirname(record_path), "pages"))
+        except (OSError, sqlite3.Error) as e:
+            print(f"   [UYARI] İçerik deposu güncellenemedi: {e}")
+    print(f"   -> {rec.baslik[:60]}... [tamamlandı]")
+    return []
+
+
+STAGE_HANDLERS = {"discover": _discover_stage, "fetch": _fetch_stage, "extract": _extract_stage,
+                  "store": _store_stage, RETRY_STAGE: _ocr_retry_stage}
+
+
+def _next_stage(stage):
+    i = QUEUE_STAGES.index(stage)
+    return QUEUE_STAGES[i + 1] if i + 1 < len(QUEUE_STAGES) else None
+
+
+def run_job(queue, job, worker, lease=QUEUE_LEASE):
+    # İş sürdükçe kira arka planda uzatılır; uzun bir OCR başka işçiye kaptırılmaz
+    stage = job["stage"]
+    finished = threading.Event()
+
+    def heartbeat():
+        while not finished.wait(lease / 3):
+            queue.extend(job["id"], worker, lease)
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    t0 = time.perf_counter()
+    try:
+        next_jobs = STAGE_HANDLERS[stage](job["payload"])
+    except Exception as e:
+        dead = queue.fail(job["id"], worker, job["attempts"], e, retryable=getattr(e, "retryable", True))
+        METRICS.inc("queue_jobs_failed_total", stage=stage)
+        if dead is None:
+            print(f"   [UYARI] {stage} {job['key']} başarısız, kira başka işçiye geçmiş: {e}")
+        elif dead:
+            METRICS.inc("queue_jobs_dead_total", stage=stage)
+            print(f"   [UYARI] {stage} {job['key']} kalıcı olarak başarısız: {e}")
+            if stage not in ("discover", RETRY_STAGE):
+                # Ertelenen OCR ölse de kayıt yazılmıştır (kismi); manifest'e dokunulmaz
+                _discard_staging(_staging_dir(job["key"]))
+                if MANIFEST is not None:
+                    MANIFEST.mark_failed(job["key"])
+        else:
+            print(f"   [UYARI] {stage} {job['key']} ({job['attempts']}. deneme) başarısız, yeniden denenecek: {e}")
+        return False
+    finally:
+        finished.set()
+        METRICS.observe("stage_seconds", time.perf_counter() - t0, stage=f"queue_{stage}")
+    if not queue.complete(job["id"], worker, _next_stage(stage), next_jobs):
+        # Kira dolmuş; iş başka işçide yeniden çalışıyor, sonraki aşamanın işlerini o ekler
+        print(f"   [UYARI] {stage} {job['key']} bitti ama kira başka işçiye geçmiş, sonuç yazılmadı.")
+        METRICS.inc("queue_jobs_lost_total", stage=stage)
+        return False
+    METRICS.inc("queue_jobs_done_total", stage=stage)
+    return True
+
+
+def run_worker(queue, stage, threads=1, drain=False, idle_sleep=5.0, lease=QUEUE_LEASE):
+    # drain: bu aşamada ve öncesinde bekleyen iş kalmayınca çık
+    upstream = QUEUE_STAGES[:QUEUE_STAGES.index(stage) + 1]
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    def loop(n):
+        name = f"{worker}:{n}"
+        while True:
+            job = queue.lease(stage, name, lease)
+            if job is not None:
+                run_job(queue, job, name, lease)
+                continue
+            if stage == "store" and SINK is not None:
+                # Boşta kalınca açık parçalar kapanır; manifest'teki yollar okunabilir olur
+                SINK.close()
+            if drain and queue.pending(upstream) == 0:
+                return
+            time.sleep(idle_sleep)
+
+    if threads <= 1:
+        loop(0)
+        return
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for f in [pool.submit(loop, n) for n in range(threads)]:
+            f.result()
+
+
+def main_worker(args):
+    if args.stage in ("discover", "fetch", RETRY_STAGE):
+        boot_session()
+    queue = open_queue(args.queue)
+    set_retry_queue(queue)
+    try:
+        run_worker(queue, args.stage, threads=args.threads, drain=args.drain,
+                   idle_sleep=args.idle_sleep)
+    except KeyboardInterrupt:
+        print("[=] İşçi durduruldu.")
+    finally:
+        if SINK is not None:
+            SINK.close()
+        write_metrics()
+
+
+def _rederive(rec, raw):
+    baslik, metin, karar_kanun_no = derive_fields(raw, rec.tablolar)
+    if (baslik, metin, karar_kanun_no) == (rec.baslik, rec.metin, rec.karar_kanun_no or ""):
+        return False
+    rec.baslik, rec.metin, rec.karar_kanun_no = baslik, metin, karar_kanun_no
+    return True
+
+
+def _reprocess_folder_record(json_path):
+    # (incelenen, değişen kayıtlar, ham önbelleği olmayan)
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            rec = ResmiGazeteKaydi(**json.load(f))
+    except (OSError, ValueError):
+        return 0, [], 0
+    raw = load_raw(raw_cache_path(json_path, str(rec.kaynak_url)))
+    if raw is None:
+        return 1, [], 1
+    if not _rederive(rec, raw):
+        return 1, [], 0
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rec.model_dump(mode="json"), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, json_path)
+    return 1, [(rec.model_dump(mode="json"), json_path)], 0
+
+
+def _reprocess_shard(path):
+    missing = 0
+
+    def fn(rec):
+        nonlocal missing
+        raw = load_raw(raw_cache_path(path, str(rec.kaynak_url)))
+        if raw is None:
+            missing += 1
+            return False
+        return _rederive(rec, raw)
+
+    n, changed = rewrite_shard(path, fn)
+    return n, [(rec.model_dump(mode="json"), path) for rec in changed], missing
+
+
+def reprocess(out_dir=OUT_DIR, shard_dir=None, workers=None):
+    # Ham önbellekten metin/başlık/karar no yeniden türetilir; ağ ve OCR kullanılmaz
+    jobs = []
+    for name in sorted(os.listdir(out_dir)) if os.path.isdir(out_dir) else []:
+        path = os.path.join(out_dir, name, "data.json")
+        if os.path.isfile(path):
+            jobs.append((_reprocess_folder_record, path))
+    if shard_dir:
+        jobs.extend((_reprocess_shard, path) for path in shard_paths(shard_dir))
+    print(f"[+] {len(jobs)} kayıt/parça yeniden işlenecek...")
+    t0 = time.perf_counter()
+    seen = changed = missing = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=process_context()) as pool:
+        futures = [pool.submit(fn, path) for fn, path in jobs]
+        for i, fut in enumerate(futures, start=1):
+            try:
+                n, recs, miss = fut.result()
+            except Exception as e:
+                print(f"   [UYARI] {jobs[i - 1][1]} yeniden işlenemedi: {e}")
+                continue
+            seen, changed, missing = seen + n, changed + len(recs), missing + miss
+            if recs and SEARCH_INDEX is not None:
+                try:
+                    SEARCH_INDEX.add_many((ResmiGazeteKaydi(**data), path) for data, path in recs)
+                except sqlite3.Error as e:
+                    print(f"   [UYARI] Arama dizini güncellenemedi: {e}")
+            if i % 1000 == 0:
+                print(f"   {i}/{len(jobs)} ({_fmt_duration(time.perf_counter() - t0)})")
+    print(f"[=] {seen} kayıt incelendi, {changed} kayıt güncellendi, {missing} kaydın ham önbelleği yok "
+          f"({_fmt_duration(time.perf_counter() - t0)}).")
+    return seen, changed, missing
+
+
+def main_reprocess(args):
+    reprocess(OUT_DIR, args.shard_dir or os.getenv("RECORD_SHARD_DIR", os.path.join(OUT_DIR, "records")),
+              args.workers)
+
+
+def main_backfill(args):
+    boot_session()
+    extract_pool = extract_executor()
+    try:
+        backfill(args.start, args.end, partitions=args.partitions, budget=args.budget,
+                 retry_empty=args.retry_empty, extract_pool=extract_pool)
+    finally:
+        if extract_pool:
+            extract_pool.shutdown()
+        if SINK is not None:
+            SINK.close()
+        write_metrics()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Komut satırı cli.py'de (python main.py ... eskisi gibi çalışır). cli, --out-dir gibi ayarları
+    # ortama yazdıktan sonra bu modülü "main" adıyla yeniden yükler.
+    import cli
+
+    sys.exit(cli.main())
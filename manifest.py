@@ -0,0 +1,120 @@
+import os
+import time
+import sqlite3
+import threading
+
+
+class Manifest:
+    # Kaynak URL başına durum: started -> done. Yarıda kalan çalışmada
+    # "started" olarak kalanlar bir sonraki çalışmada yeniden işlenir.
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("""CREATE TABLE IF NOT EXISTS items (
+                url TEXT PRIMARY KEY,
+                date TEXT,
+                status TEXT NOT NULL,
+                content_hash TEXT,
+                record_path TEXT,
+                seq INTEGER,
+                updated_at REAL NOT NULL
+            )""")
+            db.execute("CREATE INDEX IF NOT EXISTS items_hash ON items(content_hash)")
+            db.execute("CREATE INDEX IF NOT EXISTS items_date ON items(date)")
+            # Dönem (yıl) başına işe yarayan fihrist URL şeması
+            db.execute("""CREATE TABLE IF NOT EXISTS schemes (
+                era TEXT PRIMARY KEY,
+                scheme TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )""")
+            # Geçmiş taramasında tamamlanan günler (checkpoint)
+            db.execute("""CREATE TABLE IF NOT EXISTS days (
+                date TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                items INTEGER,
+                updated_at REAL NOT NULL
+            )""")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT url, date, status, content_hash, record_path, seq FROM items WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        return dict(zip(("url", "date", "status", "content_hash", "record_path", "seq"), row))
+
+    def done_entries(self, urls):
+        out = {}
+        for url in urls:
+            e = self.get(url)
+            if e and e["status"] == "done":
+                out[url] = e
+        return out
+
+    def day_seqs(self, date, exclude=()):
+        # Günün tamamlanmış kayıtlarına verilmiş sıra numaraları; exclude'daki URL'ler hariç
+        with self._lock:
+            rows = self._conn().execute("SELECT url, seq FROM items WHERE date = ? AND status = 'done'",
+                                        (date,)).fetchall()
+        return {seq for url, seq in rows if seq is not None and url not in exclude}
+
+    def mark_started(self, url, date):
+        with self._lock:
+            db = self._conn()
+            db.execute("""INSERT INTO items (url, date, status, updated_at) VALUES (?, ?, 'started', ?)
+                          ON CONFLICT(url) DO UPDATE SET status = 'started', date = excluded.date,
+                          updated_at = excluded.updated_at""", (url, date, time.time()))
+            db.commit()
+
+    def mark_done(self, url, date, content_hash, record_path, seq):
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO items VALUES (?, ?, 'done', ?, ?, ?, ?)",
+                       (url, date, content_hash, record_path, seq, time.time()))
+            db.commit()
+
+    def mark_failed(self, url):
+        with self._lock:
+            db = self._conn()
+            db.execute("UPDATE items SET status = 'failed', updated_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+
+    def finished_days(self, statuses=("done", "empty")):
+        marks = ",".join("?" * len(statuses))
+        with self._lock:
+            rows = self._conn().execute(f"SELECT date FROM days WHERE status IN ({marks})", statuses).fetchall()
+        return {r[0] for r in rows}
+
+    def mark_day(self, date, status, items=0):
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?)", (date, status, items, time.time()))
+            db.commit()
+
+    def learned_scheme(self, era):
+        with self._lock:
+            row = self._conn().execute("SELECT scheme FROM schemes WHERE era = ?", (era,)).fetchone()
+        return row[0] if row else None
+
+    def nearest_scheme(self, era):
+        # Öğrenilmemiş yıl için en yakın yılın şeması; şemalar yıllar boyunca art arda değişir
+        with self._lock:
+            rows = self._conn().execute("SELECT era, scheme FROM schemes").fetchall()
+        rows = [(abs(int(e) - int(era)), e, s) for e, s in rows if str(e).isdigit()]
+        return min(rows)[2] if rows and str(era).isdigit() else None
+
+    def learn_scheme(self, era, scheme):
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT OR REPLACE INTO schemes VALUES (?, ?, ?)", (era, scheme, time.time()))
+            db.commit()
@@ -0,0 +1,162 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+PREFIX = "resmigazete"
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+HELP = {
+    "stage_seconds": "Aşama süresi (saniye)",
+    "bytes_downloaded_total": "Ağdan indirilen gövde baytı",
+    "http_requests_total": "HTTP istekleri (önbellek durumuna göre)",
+    "pages_rendered_total": "Rasterleştirilen PDF sayfaları",
+    "pages_ocr_total": "Tesseract'a gönderilen sayfalar",
+    "pages_ocr_cached_total": "OCR önbelleğinden gelen sayfalar",
+    "pages_ocr_used_total": "Metni OCR çıktısından alınan sayfalar",
+    "pdfminer_fallback_total": "pdfminer yedek çıkarma çağrıları",
+    "records_saved_total": "Kaydedilen kayıtlar",
+    "records_failed_total": "İşlenemeyen kayıtlar",
+}
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Metrics:
+    # Süreç içi sayaç ve histogramlar. Çıkarma işçileri kendi anlık görüntülerini
+    # drain() ile döndürür, ana süreç merge() ile toplar.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started_at = time.time()
+
+    def inc(self, name, value=1, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            self.counters[k] = self.counters.get(k, 0) + value
+
+    def observe(self, name, value, **labels):
+        k = _key(name, labels)
+        with self._lock:
+            h = self.histograms.get(k)
+            if h is None:
+                h = self.histograms[k] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+            for i, b in enumerate(BUCKETS):
+                if value <= b:
+                    h["buckets"][i] += 1
+            h["sum"] += value
+            h["count"] += 1
+
+    @contextmanager
+    def timer(self, stage):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - t0, stage=stage)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [[n, list(l), v] for (n, l), v in self.counters.items()],
+                "histograms": [[n, list(l), dict(h, buckets=list(h["buckets"]))] for (n, l), h in self.histograms.items()],
+            }
+
+    def drain(self):
+        snap = self.snapshot()
+        with self._lock:
+            self.counters, self.histograms = {}, {}
+        return snap
+
+    def merge(self, snap):
+        with self._lock:
+            for n, l, v in snap["counters"]:
+                k = (n, tuple(tuple(x) for x in l))
+                self.counters[k] = self.counters.get(k, 0) + v
+            for n, l, h in snap["histograms"]:
+                k = (n, tuple(tuple(x) for x in l))
+                cur = self.histograms.get(k)
+                if cur is None:
+                    self.histograms[k] = dict(h, buckets=list(h["buckets"]))
+                    continue
+                cur["buckets"] = [a + b for a, b in zip(cur["buckets"], h["buckets"])]
+                cur["sum"] += h["sum"]
+                cur["count"] += h["count"]
+
+    def summary(self):
+        finished = time.time()
+        out = {"started_at": self.started_at, "finished_at": finished,
+               "duration_seconds": finished - self.started_at, "counters": {}, "stages": {}}
+        with self._lock:
+            for (n, l), v in sorted(self.counters.items()):
+                label = ",".join(f"{a}={b}" for a, b in l)
+                out["counters"][f"{n}{{{label}}}" if label else n] = v
+            for (n, l), h in sorted(self.histograms.items()):
+                stage = dict(l).get("stage", n)
+                out["stages"][stage] = {"count": h["count"], "sum_seconds": round(h["sum"], 6),
+                                        "mean_seconds": round(h["sum"] / h["count"], 6) if h["count"] else 0.0,
+                                        "buckets": dict(zip([str(b) for b in BUCKETS], h["buckets"]))}
+        return out
+
+    def prometheus(self):
+        lines, seen = [], set()
+
+        def header(name, kind):
+            if name in seen:
+                return
+            seen.add(name)
+            lines.append(f"# HELP {PREFIX}_{name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        def fmt(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{a}="{b}"' for a, b in items) + "}"
+
+        with self._lock:
+            for (n, l), v in sorted(self.counters.items()):
+                header(n, "counter")
+                lines.append(f"{PREFIX}_{n}{fmt(l)} {v}")
+            for (n, l), h in sorted(self.histograms.items()):
+                header(n, "histogram")
+                for b, c in zip(BUCKETS, h["buckets"]):
+                    lines.append(f"{PREFIX}_{n}_bucket{fmt(l, [('le', b)])} {c}")
+                lines.append(f"{PREFIX}_{n}_bucket{fmt(l, [('le', '+Inf')])} {h['count']}")
+                lines.append(f"{PREFIX}_{n}_sum{fmt(l)} {h['sum']}")
+                lines.append(f"{PREFIX}_{n}_count{fmt(l)} {h['count']}")
+        now = time.time()
+        lines += [f"# HELP {PREFIX}_last_run_timestamp_seconds Son çalışmanın bitiş zamanı",
+                  f"# TYPE {PREFIX}_last_run_timestamp_seconds gauge",
+                  f"{PREFIX}_last_run_timestamp_seconds {now}",
+                  f"# HELP {PREFIX}_last_run_duration_seconds Son çalışmanın süresi",
+                  f"# TYPE {PREFIX}_last_run_duration_seconds gauge",
+                  f"{PREFIX}_last_run_duration_seconds {now - self.started_at}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=None, prom_path=None):
+        # node_exporter textfile collector yarım dosya okumasın diye atomik yazılır
+        if json_path:
+            _atomic_write(json_path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+        if prom_path:
+            _atomic_write(prom_path, self.prometheus())
+
+
+def _atomic_write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+METRICS = Metrics()
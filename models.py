@@ -2,6 +2,13 @@ from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
 
 
+class Tablo(BaseModel):
+    sayfa: int
+    kaynak: str = ""
+    basliklar: List[str] = []
+    satirlar: List[List[str]] = []
+
+
 class ResmiGazeteKaydi(BaseModel):
     tarih: str
     sayi: str
@@ -12,3 +19,10 @@ class ResmiGazeteKaydi(BaseModel):
     metin: str
     pdf_dosyasi: Optional[str] = ""
     sayfa_resimleri: Optional[List[str]] = []
+    tablolar: Optional[List[Tablo]] = []
+    # İndirilen gövdenin SHA-256 özeti; aynı içerikli kayıtlar içerik deposundaki tek çıkarımı paylaşır
+    icerik_ozeti: Optional[str] = ""
+    # Süre bütçesi dolduğu için OCR'ı ertelenen ya da düşük çözünürlükte kalan sayfalar (1'den başlar);
+    # kismi kayıtlar ocr_retry kuyruğunda tamamlanınca bu alanlar temizlenir
+    kismi: Optional[bool] = False
+    eksik_sayfalar: Optional[List[int]] = []
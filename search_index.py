@@ -0,0 +1,241 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+
+# Kayıtlar üzerinde SQLite FTS5 tam metin dizini. Sütunlar Türkçe kurallarıyla normalize
+# edilerek saklanır (İ->i, I->ı, küçük harf, şapkalı harfler ve ı -> i); sorgu da aynı
+# normalizasyondan geçtiği için "RESMİ", "Resmî" ve "resmi" aynı kaydı bulur. Metnin özgün hâli
+# dizinlenmeyen bir sütunda durur; sonuç parçaları ondan üretilir.
+
+FIELDS = ("baslik", "metin", "karar_kanun_no", "kategori", "tarih")
+# bm25 ağırlıkları: başlık ve karar numarası eşleşmeleri metindekinden önde gelir
+WEIGHTS = (10.0, 1.0, 5.0, 2.0, 1.0)
+
+_UPPER = str.maketrans({"İ": "i", "I": "ı"})
+_FOLD = str.maketrans({"â": "a", "î": "i", "û": "u", "ı": "i"})
+_TERM_RE = re.compile(r"\w+\*?")
+# snippet() işaretleri; özgün metne taşınırken köşeli paranteze çevrilir
+_HL_START, _HL_END, _ELLIPSIS = "\x02", "\x03", " … "
+
+
+def normalize_tr(text):
+    # Karakter başına birebir dönüşüm; "İ".lower() gibi iki karaktere açılan durumlar önce ele alınır
+    return (text or "").translate(_UPPER).lower().translate(_FOLD)
+
+
+def build_match(query):
+    # Her kelime (ör. "2024/123") kendi içinde öbek olarak, kelimeler arası VE ile aranır
+    parts = []
+    for word in normalize_tr(query).split():
+        terms = _TERM_RE.findall(word)
+        if not terms:
+            continue
+        if len(terms) == 1 and terms[0].endswith("*"):
+            parts.append(f'"{terms[0][:-1]}"*')
+        else:
+            parts.append('"' + " ".join(t.rstrip("*") for t in terms) + '"')
+    return " ".join(parts)
+
+
+def original_snippet(snippet, folded, original):
+    # normalize_tr karakter başına birebir olduğundan katlanmış metindeki konumlar özgün metinde de geçerlidir
+    snippet = snippet or ""
+    body = snippet
+    head = body.startswith(_ELLIPSIS)
+    if head:
+        body = body[len(_ELLIPSIS):]
+    tail = body.endswith(_ELLIPSIS)
+    if tail:
+        body = body[:-len(_ELLIPSIS)]
+    pos = (folded or "").find(body.replace(_HL_START, "").replace(_HL_END, ""))
+    if pos >= 0 and original and len(original) == len(folded):
+        out = []
+        for ch in body:
+            if ch in (_HL_START, _HL_END):
+                out.append(ch)
+            else:
+                out.append(original[pos])
+                pos += 1
+        body = "".join(out)
+    body = body.replace(_HL_START, "[").replace(_HL_END, "]")
+    return (_ELLIPSIS if head else "") + body + (_ELLIPSIS if tail else "")
+
+
+def _iso(tarih):
+    try:
+        d, m, y = tarih.split(".")
+        return f"{y}-{m}-{d}"
+    except ValueError:
+        return None
+
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS docs (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                tarih TEXT,
+                iso_date TEXT,
+                kategori TEXT,
+                baslik TEXT,
+                karar_kanun_no TEXT,
+                record_path TEXT
+            )""")
+            db.execute("CREATE INDEX IF NOT EXISTS docs_date ON docs(iso_date)")
+            cols = [r[1] for r in db.execute("PRAGMA table_info(fts)")]
+            if cols and "ozgun_metin" not in cols:
+                # Eski biçimli dizin (özgün metin yok); boşaltılır, kayıtlar yeniden eklenmeli
+                print(f"[UYARI] {self.path} eski biçimde, boşaltıldı; 'python search_index.py reindex' çalıştırın")
+                db.execute("DROP TABLE fts")
+                db.execute("DELETE FROM docs")
+            db.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(
+                {", ".join(FIELDS)}, ozgun_metin UNINDEXED,
+                tokenize='unicode61 remove_diacritics 0', prefix='2 3')""")
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _upsert(self, db, rec, record_path):
+        url = str(rec.kaynak_url)
+        row = db.execute("SELECT id FROM docs WHERE url = ?", (url,)).fetchone()
+        meta = (rec.tarih, _iso(rec.tarih), rec.kategori, rec.baslik, rec.karar_kanun_no or "", record_path)
+        if row:
+            doc_id = row[0]
+            db.execute("UPDATE docs SET tarih = ?, iso_date = ?, kategori = ?, baslik = ?, karar_kanun_no = ?, "
+                       "record_path = ? WHERE id = ?", meta + (doc_id,))
+            db.execute("DELETE FROM fts WHERE rowid = ?", (doc_id,))
+        else:
+            doc_id = db.execute("INSERT INTO docs (url, tarih, iso_date, kategori, baslik, karar_kanun_no, "
+                                "record_path) VALUES (?, ?, ?, ?, ?, ?, ?)", (url,) + meta).lastrowid
+        db.execute(f"INSERT INTO fts (rowid, {', '.join(FIELDS)}, ozgun_metin) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   (doc_id,) + tuple(normalize_tr(getattr(rec, f) or "") for f in FIELDS) + (rec.metin or "",))
+
+    def add(self, rec, record_path=None):
+        with self._lock:
+            db = self._conn()
+            self._upsert(db, rec, record_path)
+            db.commit()
+
+    def add_many(self, pairs):
+        n = 0
+        with self._lock:
+            db = self._conn()
+            for rec, record_path in pairs:
+                self._upsert(db, rec, record_path)
+                n += 1
+                if n % 1000 == 0:
+                    db.commit()
+            db.commit()
+        return n
+
+    def search(self, query, limit=20, kategori=None, start=None, end=None):
+        match = build_match(query)
+        if not match:
+            return []
+        sql = [f"""SELECT d.url, d.tarih, d.kategori, d.baslik, d.karar_kanun_no, d.record_path,
+                          bm25(fts, {", ".join(map(str, WEIGHTS))}) AS score,
+                          snippet(fts, 1, ?, ?, ?, 12), fts.metin, fts.ozgun_metin
+                   FROM fts JOIN docs d ON d.id = fts.rowid WHERE fts MATCH ?"""]
+        args = [_HL_START, _HL_END, _ELLIPSIS, match]
+        if kategori:
+            sql.append("AND d.kategori = ?")
+            args.append(kategori)
+        if start:
+            sql.append("AND d.iso_date >= ?")
+            args.append(start)
+        if end:
+            sql.append("AND d.iso_date <= ?")
+            args.append(end)
+        sql.append("ORDER BY score LIMIT ?")
+        args.append(limit)
+        with self._lock:
+            rows = self._conn().execute(" ".join(sql), args).fetchall()
+        keys = ("url", "tarih", "kategori", "baslik", "karar_kanun_no", "record_path", "score", "snippet")
+        return [dict(zip(keys, r[:7] + (original_snippet(*r[7:]),))) for r in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def optimize(self):
+        with self._lock:
+            db = self._conn()
+            db.execute("INSERT INTO fts (fts) VALUES ('optimize')")
+            db.commit()
+
+
+def iter_saved_records(out_dir, shard_dir=None):
+    # Klasör kayıtları (output/*/data.json) ve varsa parça kayıtları
+    from models import ResmiGazeteKaydi
+    from sinks import iter_records
+
+    for name in sorted(os.listdir(out_dir)) if os.path.isdir(out_dir) else []:
+        path = os.path.join(out_dir, name, "data.json")
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, encoding="utf-8") as f:
+                yield ResmiGazeteKaydi(**json.load(f)), path
+        except (OSError, ValueError) as e:
+            print(f"[UYARI] {path} okunamadı: {e}")
+    if shard_dir:
+        yield from iter_records(shard_dir, with_path=True)
+
+
+def main(argv=None):
+    # Varsayılanlar main ile aynı: SCRAPER_OUT_DIR, SEARCH_INDEX, RECORD_SHARD_DIR
+    out_dir = os.getenv("SCRAPER_OUT_DIR", "output")
+    ap = argparse.ArgumentParser(description="Kayıtlarda tam metin arama")
+    ap.add_argument("--index", default=os.getenv("SEARCH_INDEX") or os.path.join(out_dir, "search.sqlite"))
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    q = sub.add_parser("search", help="sorgula")
+    q.add_argument("query", nargs="+")
+    q.add_argument("--limit", type=int, default=20)
+    q.add_argument("--kategori")
+    q.add_argument("--from", dest="start", help="YYYY-MM-DD")
+    q.add_argument("--to", dest="end", help="YYYY-MM-DD")
+    q.add_argument("--json", action="store_true", help="sonuçları JSON satırları olarak yaz")
+    r = sub.add_parser("reindex", help="mevcut kayıtları dizine ekle")
+    r.add_argument("--out-dir", default=out_dir)
+    r.add_argument("--shard-dir", default=os.getenv("RECORD_SHARD_DIR", os.path.join(out_dir, "records")))
+    args = ap.parse_args(argv)
+
+    index = SearchIndex(args.index)
+    if args.cmd == "reindex":
+        t0 = time.perf_counter()
+        n = index.add_many(iter_saved_records(args.out_dir, args.shard_dir))
+        index.optimize()
+        print(f"{n} kayıt dizinlendi ({time.perf_counter() - t0:.1f} s).")
+        return 0
+
+    t0 = time.perf_counter()
+    hits = index.search(" ".join(args.query), args.limit, args.kategori, args.start, args.end)
+    elapsed = (time.perf_counter() - t0) * 1000
+    for h in hits:
+        if args.json:
+            print(json.dumps(h, ensure_ascii=False))
+            continue
+        print(f"{h['tarih']}  {h['kategori']}  {h['baslik'][:90]}")
+        print(f"    {h['snippet']}")
+        print(f"    {h['record_path'] or h['url']}")
+    if not args.json:
+        print(f"{len(hits)} sonuç, {elapsed:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
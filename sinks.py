@@ -0,0 +1,234 @@
+import io
+import os
+import gzip
+import json
+import time
+import threading
+
+from models import ResmiGazeteKaydi
+
+from lazy import LazyModule, available
+
+# zstandard ve pyarrow yalnızca ilgili biçim kullanıldığında yüklenir
+ZSTD_OK = available("zstandard")
+zstandard = LazyModule("zstandard")
+
+PYARROW_OK = available("pyarrow")
+pa, pq = LazyModule("pyarrow"), LazyModule("pyarrow.parquet")
+
+# Kayıtlar gün bölümlü parçalara (shard) eklenir: <root>/date=YYYY-MM-DD/part-<zaman>-<pid>-<n>.<uzantı>
+# Açık parça ".part" uzantısıyla yazılır; kapanırken fsync edilip atomik olarak yeniden adlandırılır.
+# Okuyucular ".part" dosyalarını görmez, yarıda kalan bir çalışma yarım parça bırakmaz.
+
+# Parquet'te iç içe yapılar JSON metni olarak saklanır
+_JSON_FIELDS = ("tablolar",)
+EXTENSIONS = {"jsonl": ".jsonl", "jsonl.gz": ".jsonl.gz", "jsonl.zst": ".jsonl.zst", "parquet": ".parquet"}
+PART_SUFFIX = ".part"
+
+
+def is_shard_path(path):
+    return bool(path) and any(path.endswith(ext) for ext in EXTENSIONS.values())
+
+
+def _partition(tarih):
+    # "15.01.2024" -> "date=2024-01-15"
+    d, m, y = tarih.split(".")
+    return f"date={y}-{m}-{d}"
+
+
+class _JsonlShard:
+    def __init__(self, path, fmt):
+        self.path = path
+        self.tmp = path + PART_SUFFIX
+        self.records = 0
+        self.bytes = 0
+        self._raw = open(self.tmp, "wb")
+        if fmt == "jsonl.gz":
+            self._out = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=6)
+        elif fmt == "jsonl.zst":
+            self._out = zstandard.ZstdCompressor(level=10).stream_writer(self._raw, closefd=False)
+        else:
+            self._out = self._raw
+
+    def write(self, rec):
+        line = (json.dumps(rec.model_dump(mode="json"), ensure_ascii=False) + "\n").encode("utf-8")
+        self._out.write(line)
+        self.records += 1
+        self.bytes += len(line)
+
+    def close(self):
+        if self._out is not self._raw:
+            self._out.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        os.replace(self.tmp, self.path)
+
+
+class _ParquetShard:
+    ROW_GROUP = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp = path + PART_SUFFIX
+        self.records = 0
+        self.bytes = 0
+        self._rows = []
+        self._writer = pq.ParquetWriter(self.tmp, _parquet_schema(), compression="zstd")
+
+    def write(self, rec):
+        row = rec.model_dump(mode="json")
+        for name in _JSON_FIELDS:
+            row[name] = json.dumps(row.get(name) or [], ensure_ascii=False)
+        self._rows.append(row)
+        self.records += 1
+        self.bytes += len(row.get("metin") or "") + 512
+        if len(self._rows) >= self.ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self._writer.schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        with open(self.tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(self.tmp, self.path)
+
+
+def _parquet_type(name):
+    if name == "sayfa_resimleri":
+        return pa.list_(pa.string())
+    if name == "eksik_sayfalar":
+        return pa.list_(pa.int32())
+    if name == "kismi":
+        return pa.bool_()
+    return pa.string()
+
+
+def _parquet_schema():
+    return pa.schema([pa.field(name, _parquet_type(name)) for name in ResmiGazeteKaydi.model_fields])
+
+
+class ShardSink:
+    def __init__(self, root, fmt="jsonl.gz", max_records=10000, max_bytes=64 * 1024 * 1024):
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Bilinmeyen kayıt biçimi: {fmt}")
+        if fmt == "jsonl.zst" and not ZSTD_OK:
+            print("[UYARI] zstandard kurulu değil, jsonl.gz kullanılıyor.")
+            fmt = "jsonl.gz"
+        if fmt == "parquet" and not PYARROW_OK:
+            print("[UYARI] pyarrow kurulu değil, jsonl.gz kullanılıyor.")
+            fmt = "jsonl.gz"
+        self.root = root
+        self.fmt = fmt
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._open = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def _new_shard(self, partition):
+        folder = os.path.join(self.root, partition)
+        os.makedirs(folder, exist_ok=True)
+        self._counter += 1
+        name = f"part-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{self._counter:04d}{EXTENSIONS[self.fmt]}"
+        path = os.path.join(folder, name)
+        return _ParquetShard(path) if self.fmt == "parquet" else _JsonlShard(path, self.fmt)
+
+    def write(self, rec):
+        # Kaydın düşeceği (kapanışta oluşacak) parça yolunu döndürür
+        partition = _partition(rec.tarih)
+        with self._lock:
+            shard = self._open.get(partition)
+            if shard is None:
+                shard = self._open[partition] = self._new_shard(partition)
+            shard.write(rec)
+            if shard.records >= self.max_records or shard.bytes >= self.max_bytes:
+                shard.close()
+                del self._open[partition]
+            return shard.path
+
+    def close(self):
+        with self._lock:
+            for shard in self._open.values():
+                shard.close()
+            self._open = {}
+
+
+def shard_paths(root, start=None, end=None):
+    # start/end: "YYYY-MM-DD" (dahil)
+    if not os.path.isdir(root):
+        return
+    for partition in sorted(os.listdir(root)):
+        if not partition.startswith("date="):
+            continue
+        day = partition[5:]
+        if (start and day < start) or (end and day > end):
+            continue
+        folder = os.path.join(root, partition)
+        for name in sorted(os.listdir(folder)):
+            if is_shard_path(name):
+                yield os.path.join(folder, name)
+
+
+def _iter_jsonl(path):
+    if path.endswith(".gz"):
+        f = gzip.open(path, "rb")
+    elif path.endswith(".zst"):
+        if not ZSTD_OK:
+            raise RuntimeError(f"zstandard kurulu değil: {path}")
+        f = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    else:
+        f = open(path, "rb")
+    with f:
+        for line in f:
+            if line.strip():
+                yield ResmiGazeteKaydi.model_validate_json(line)
+
+
+def _iter_parquet(path, batch_size=256):
+    if not PYARROW_OK:
+        raise RuntimeError(f"pyarrow kurulu değil: {path}")
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            for name in _JSON_FIELDS:
+                if isinstance(row.get(name), str):
+                    row[name] = json.loads(row[name])
+            yield ResmiGazeteKaydi(**row)
+
+
+def iter_shard(path):
+    return _iter_parquet(path) if path.endswith(".parquet") else _iter_jsonl(path)
+
+
+def iter_records(root, start=None, end=None, with_path=False):
+    # Parçaları sırayla ve satır satır (Parquet'te küçük yığınlarla) okur; hiçbir parça
+    # tümüyle belleğe alınmaz.
+    for path in shard_paths(root, start, end):
+        for rec in iter_shard(path):
+            yield (rec, path) if with_path else rec
+
+
+def rewrite_shard(path, fn):
+    # fn(rec) True dönerse kayıt değişmiştir; parça yalnızca değişiklik varsa aynı adla (.part
+    # üzerinden atomik olarak) yeniden yazılır. Değişen kayıtlar döner.
+    recs = list(iter_shard(path))
+    changed = [rec for rec in recs if fn(rec)]
+    if changed:
+        fmt = next(f for f, ext in EXTENSIONS.items() if path.endswith(ext))
+        shard = _ParquetShard(path) if fmt == "parquet" else _JsonlShard(path, fmt)
+        for rec in recs:
+            shard.write(rec)
+        shard.close()
+    return len(recs), changed
+
+
+def open_sink(kind, root, max_records=10000, max_bytes=64 * 1024 * 1024):
+    # "folder": her kayıt kendi klasöründe (varsayılan); diğerleri ShardSink
+    if kind in ("", "folder"):
+        return None
+    return ShardSink(root, kind, max_records=max_records, max_bytes=max_bytes)
@@ -0,0 +1,169 @@
+import re
+from statistics import median
+
+# Ek tablolarının (ör. "CUMHURBAŞKANI KARARININ EKİ", "LİSTE") satır/sütun olarak çıkarılması.
+# Vektör PDF'lerde önce PyMuPDF find_tables() (çizgili tablolar), bulamazsa kelime kutularından
+# sütun hizası çıkarılır; taranmış sayfalarda aynı hizalama OCR kelime kutularına uygulanır.
+# Sütun düzeni sabit değildir: sütunlar satırlardaki boşlukların ortak dikey izdüşümünden bulunur.
+
+# İşaret yalnızca kendi satırında duran bir ek başlığıdır ("LİSTE", "(1) SAYILI LİSTE", "KOORDİNAT LİSTESİ",
+# "... CUMHURBAŞKANI KARARININ EKİ"); "İTHALAT LİSTESİNDE ..." gibi başlık ve metin içi geçişler sayılmaz
+TABLE_MARKER_RE = re.compile(r"^[^\S\n]*(?:[^\n]*CUMHURBAŞKANI KARARININ EK[İI]"
+                             r"|(?:[^\n]{0,30}[^\S\n])?(?:KOORD[İI]NAT[^\S\n]+L[İI]STES[İI]|L[İI]STE))[^\S\n]*:?[^\S\n]*$",
+                             re.M)
+MIN_ROWS = 3
+MIN_COLS = 2
+_NUM_RE = re.compile(r"^\d+[.)]?$")
+
+
+def _clean(cell):
+    return re.sub(r"\s+", " ", cell or "").strip()
+
+
+def _table(page_no, rows, source):
+    rows = [[_clean(c) for c in r] for r in rows]
+    rows = [r for r in rows if any(r)]
+    if len(rows) < MIN_ROWS:
+        return None
+    width = max(len(r) for r in rows)
+    if width < MIN_COLS:
+        return None
+    rows = [r + [""] * (width - len(r)) for r in rows]
+    header = []
+    # İlk satır başlık sayılır: gövdede sıra numarası olan sütun başlıkta sayı değilse
+    if not _NUM_RE.match(rows[0][0]) and any(_NUM_RE.match(r[0]) for r in rows[1:]):
+        header, rows = rows[0], rows[1:]
+    return {"sayfa": page_no, "kaynak": source, "basliklar": header, "satirlar": rows}
+
+
+def _group_lines(words):
+    # words: (x0, y0, x1, y1, metin); dikey merkezleri yakın kelimeler aynı satırdır
+    if not words:
+        return []
+    tol = median(w[3] - w[1] for w in words) * 0.5
+    lines, current, cy = [], [], None
+    for w in sorted(words, key=lambda w: ((w[1] + w[3]) / 2, w[0])):
+        mid = (w[1] + w[3]) / 2
+        if current and mid - cy > tol:
+            lines.append(sorted(current))
+            current = []
+        if not current:
+            cy = mid
+        current.append(w)
+    if current:
+        lines.append(sorted(current))
+    return lines
+
+
+def _segments(line, gap):
+    # Satırı, kelime arası boşluğu gap'ten büyük olan yerlerden hücre parçalarına böler
+    segs = [[line[0]]]
+    for w in line[1:]:
+        if w[0] - segs[-1][-1][2] > gap:
+            segs.append([w])
+        else:
+            segs[-1].append(w)
+    return [(s[0][0], s[-1][2], " ".join(w[4] for w in s)) for s in segs]
+
+
+def _columns(lines_segs):
+    # Çok parçalı satırlardaki hücre aralıklarının birleşimi; aralar sütun sınırıdır
+    spans = sorted((x0, x1) for segs in lines_segs if len(segs) >= MIN_COLS for x0, x1, _ in segs)
+    cols = []
+    for x0, x1 in spans:
+        if cols and x0 <= cols[-1][1]:
+            cols[-1][1] = max(cols[-1][1], x1)
+        else:
+            cols.append([x0, x1])
+    return cols
+
+
+def table_from_words(words, page_no, source="words"):
+    lines = _group_lines(words)
+    if len(lines) < MIN_ROWS:
+        return None
+    heights = [w[3] - w[1] for w in words]
+    gap = median(heights) * 1.2
+    lines_segs = [_segments(line, gap) for line in lines]
+    cols = _columns(lines_segs)
+    if len(cols) < MIN_COLS:
+        return None
+
+    def col_of(x0, x1):
+        mid = (x0 + x1) / 2
+        for i, (c0, c1) in enumerate(cols):
+            if c0 <= mid <= c1:
+                return i
+        return min(range(len(cols)), key=lambda i: min(abs(cols[i][0] - mid), abs(cols[i][1] - mid)))
+
+    # Tablo bölgesi: en az iki sütuna yayılan ilk satırdan itibaren; ilk sütunu boş satırlar
+    # (çok satırlı hücrelerin devamı) bir önceki satıra eklenir
+    rows, started = [], False
+    for segs in lines_segs:
+        cells = [""] * len(cols)
+        for x0, x1, text in segs:
+            i = col_of(x0, x1)
+            cells[i] = f"{cells[i]} {text}".strip()
+        if not started:
+            if sum(1 for c in cells if c) < MIN_COLS:
+                continue
+            started = True
+        if rows and not cells[0] and sum(1 for c in cells if c) < len(cols):
+            rows[-1] = [f"{a} {b}".strip() for a, b in zip(rows[-1], cells)]
+        else:
+            rows.append(cells)
+    # Düzyazı sayfalarında tek tük geniş boşluklu satırlar tablo sayılmasın
+    if sum(1 for r in rows if sum(1 for c in r if c) >= MIN_COLS) < MIN_ROWS:
+        return None
+    return _table(page_no, rows, source)
+
+
+def vector_tables(page, page_no):
+    # Çizgili tablolar için PyMuPDF'in kendi algılayıcısı (1.23+)
+    finder = getattr(page, "find_tables", None)
+    if finder is None:
+        return []
+    try:
+        found = finder()
+    except Exception:
+        return []
+    out = []
+    for tab in found.tables:
+        rows = [[c or "" for c in row] for row in tab.extract()]
+        names = [_clean(n) for n in (tab.header.names if tab.header and not tab.header.external else [])]
+        t = _table(page_no, rows, "vector")
+        if not t:
+            continue
+        if not t["basliklar"] and names and any(names) and t["satirlar"][0] == names:
+            t["basliklar"], t["satirlar"] = names, t["satirlar"][1:]
+        out.append(t)
+    return out
+
+
+def page_words(page):
+    return [(w[0], w[1], w[2], w[3], w[4]) for w in page.get_text("words")]
+
+
+def extract_tables(doc, ocr_words=None, is_scan=None, start_page=None):
+    # doc: açık fitz belgesi. Tablo işaretinin geçtiği ilk sayfadan sona kadar bakılır.
+    # ocr_words(page) -> kelime kutuları; is_scan(page, metin) -> taranmış sayfa mı
+    if start_page is None:
+        start_page = next((i for i, pg in enumerate(doc) if TABLE_MARKER_RE.search(pg.get_text("text"))), None)
+        if start_page is None:
+            return []
+    tables = []
+    for i in range(start_page, len(doc)):
+        pg = doc[i]
+        text = pg.get_text("text")
+        if ocr_words is not None and is_scan is not None and is_scan(pg, text):
+            words, source = ocr_words(pg), "ocr"
+        else:
+            found = vector_tables(pg, i + 1)
+            if found:
+                tables.extend(found)
+                continue
+            words, source = page_words(pg), "words"
+        t = table_from_words(words, i + 1, source) if words else None
+        if t:
+            tables.append(t)
+    return tables
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "bench", "fixtures")
+sys.path.insert(0, ROOT)
+
+# main ayarlarını modül yüklenirken ortamdan okur; testler çalışma klasörüne ve önbelleklere yazmasın
+_TMP = tempfile.mkdtemp(prefix="rg_test_")
+for key, value in {"SCRAPER_OUT_DIR": os.path.join(_TMP, "output"),
+                   "HTTP_CACHE_DIR": os.path.join(_TMP, ".http_cache"),
+                   "OCR_CACHE": "0",
+                   "SCRAPER_HOST_RATE": "0",
+                   "BLOB_STORE": "",
+                   "SEARCH_INDEX": "",
+                   "METRICS_JSON": "",
+                   "METRICS_PROM": ""}.items():
+    os.environ.setdefault(key, value)
+
+
+# Duvar saati ölçen testler (içe aktarma/komut süresi bütçeleri) makine yüküne bağlı; varsayılan
+# çalıştırmada atlanır, RUN_BENCHMARKS=1 ile açılır
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: duvar saati bütçesi ölçen test (RUN_BENCHMARKS=1 ile çalışır)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; RUN_BENCHMARKS=1 ile çalıştırın")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,48 @@
+import os
+import sys
+from datetime import date
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+DAYS = [date(2023, 3, d).isoformat() for d in range(1, 5)]
+
+
+def _kinds(server):
+    kinds = server.stats.summary()["kinds"]
+    return kinds.get("index", 0), kinds.get("detail_html", 0)
+
+
+def test_interrupted_backfill_resumes_without_refetching(tmp_path, monkeypatch):
+    import main
+
+    manifest = main.MANIFEST
+    server = standin_server.start(standin_server.Corpus(items=2, pdf_ratio=0))
+    monkeypatch.setattr(main, "BASE", server.base_url)
+    monkeypatch.setattr(main, "OUT_DIR", str(tmp_path))
+    # İstek sayıları sunucuda ölçülür; HTTP önbelleği taze fihristleri ağa çıkmadan verirdi
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    try:
+        # Gün başına 1 fihrist + 2 detay isteği: bütçe ikinci günün ortasında dolar
+        main.backfill(date(2023, 3, 1), date(2023, 3, 4), partitions=1, budget=5, manifest=manifest)
+        assert manifest.finished_days(("done",)) & set(DAYS) == {DAYS[0]}
+        assert _kinds(server) == (2, 3)
+
+        server.stats.reset()
+        assert main.backfill(date(2023, 3, 1), date(2023, 3, 4), partitions=1, manifest=manifest) == 3
+        assert manifest.finished_days(("done",)) & set(DAYS) == set(DAYS)
+        # Tamamlanan gün yeniden istenmez; yarım kalan günün kaydedilmiş kalemi yeniden indirilmez
+        assert _kinds(server) == (3, 5)
+
+        server.stats.reset()
+        assert main.backfill(date(2023, 3, 1), date(2023, 3, 4), partitions=1, manifest=manifest) == 0
+        assert _kinds(server) == (0, 0)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    records = [n for n in os.listdir(tmp_path) if os.path.isfile(os.path.join(tmp_path, n, "data.json"))]
+    assert len(records) == 8
@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+
+from blob_store import BlobStore
+from conftest import ROOT
+from manifest import Manifest
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+def test_put_get_and_image_upgrade(tmp_path):
+    raw = tmp_path / "ham.json.gz"
+    raw.write_bytes(b"ham")
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "page_1.png").write_bytes(b"png")
+    store = BlobStore(str(tmp_path / "blobs"))
+    sha = "ab" * 32
+
+    assert store.get(sha) is None
+    assert store.put(sha, "pdf", "https://example.org/1.pdf", str(raw))
+    assert store.get(sha)["images"] is None
+    assert store.get(sha, need_images=True) is None
+    assert not store.put(sha, "pdf", "https://example.org/2.pdf", str(raw))
+
+    # Görselsiz kayıt, görselli bir çıkarım gelince tamamlanır; ilk URL korunur
+    assert store.put(sha, "pdf", "https://example.org/2.pdf", str(raw), images=["page_1.png"], pages_dir=str(pages))
+    entry = store.get(sha, need_images=True)
+    assert entry["images"] == ["page_1.png"] and entry["first_url"] == "https://example.org/1.pdf"
+    store.link_pages(entry, str(tmp_path / "kayit" / "pages"))
+    assert (tmp_path / "kayit" / "pages" / "page_1.png").read_bytes() == b"png"
+
+    store.touch(sha)
+    assert store.stats() == {"blobs": 1, "hits": 1}
+
+
+@pytest.fixture
+def same_pdf_server(tmp_path, monkeypatch):
+    pytest.importorskip("fitz")
+    pytest.importorskip("PIL")
+    import main
+
+    # Aynı gün üç kalem, hepsi aynı PDF gövdesi
+    srv = standin_server.start(standin_server.Corpus(items=3, pdf_ratio=1, pdfs=["duz_metin.pdf"], unique=False))
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    monkeypatch.setattr(main, "OUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    monkeypatch.setattr(main, "SINK", None)
+    monkeypatch.setattr(main, "BLOBS", BlobStore(str(tmp_path / "blobs")))
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _records(out_dir):
+    for name in sorted(os.listdir(out_dir)):
+        path = os.path.join(out_dir, name, "data.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                yield os.path.dirname(path), json.load(f)
+
+
+def test_same_body_is_extracted_once_and_lazy_pages_render_on_reuse(same_pdf_server, tmp_path, monkeypatch):
+    import main
+
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    pack = main.collect_for_date(date(2024, 1, 15), manifest)
+    extracted = []
+    real_extract = main._timed_extract
+    monkeypatch.setattr(main, "_timed_extract", lambda *a: extracted.append(a[0]["url"]) or real_extract(*a))
+
+    def run(mode):
+        monkeypatch.setattr(main, "PAGE_IMAGE_MODE", mode)
+        same_pdf_server.stats.reset()
+        saved, failed = main.process_items([dict(it) for it in pack["items"]], "15.01.2024", pack["issue"],
+                                           concurrency=1, manifest=manifest)
+        return saved, failed, same_pdf_server.stats.summary()["kinds"].get("detail_pdf", 0)
+
+    assert run("lazy") == (3, 0, 3)
+    assert len(extracted) == 1
+    assert main.BLOBS.stats() == {"blobs": 1, "hits": 2}
+    recs = list(_records(tmp_path / "out"))
+    assert len({r["metin"] for _, r in recs}) == 1
+    # Tembel kayıtlar görselleri çizilmeden tamamdır; tekrar indirilmez
+    assert all(r["sayfa_resimleri"] and not any(os.path.exists(os.path.join(d, p)) for p in r["sayfa_resimleri"])
+               for d, r in recs)
+    assert run("lazy") == (0, 0, 0)
+
+    # PNG moduna geçince görselsiz kayıtlar yeniden alınır; depodan gelen kayıtta eksik görseller çizilir
+    assert run("png") == (3, 0, 3)
+    assert len(extracted) == 1
+    for record_dir, rec in _records(tmp_path / "out"):
+        assert all(os.path.getsize(os.path.join(record_dir, p)) for p in rec["sayfa_resimleri"])
+    assert run("png") == (0, 0, 0)
@@ -0,0 +1,202 @@
+import os
+import random
+import re
+
+import pytest
+
+from cleaning import TextCleaner
+from conftest import FIXTURES
+
+# TextCleaner'dan önceki yardımcı zincirinin birebir kopyası; TextCleaner.clean bununla aynı çıktıyı vermeli.
+
+
+def old_normalize_ws(text):
+    text = text or ""
+    ws_chars = "\xa0         "
+    for char in ws_chars: text = text.replace(char, " ")
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def old_dehyphenate(text):
+    return re.sub(r"(\w)-\n(\w)", r"\1\2", text)
+
+
+def old_strip_headers_footers(text):
+    lines = text.splitlines()
+    out = []
+
+    for ln in lines:
+        s = ln.strip()
+
+        if re.match(r"\d{1,2} [A-Za-zÇĞİÖŞÜçğıöşü]+ \d{4}(,|\s)?(PAZAR|PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ)?", s, re.I):
+            continue
+
+        if "resmî gazete" in s.lower():
+            continue
+
+        if re.match(r"Sayı\s*:\s*\d{5}", s):
+            continue
+
+        if s.isupper() and len(s) < 20 and s in ["YÖNETMELİK", "TEBLİĞ", "KURUL KARARI", "GENELGE", "İLAN"]:
+            continue
+        out.append(ln)
+    return "\n".join(out).strip()
+
+
+def old_strip_header_lines(text):
+    lines = text.splitlines()
+    cleaned = []
+    skip_patterns = [
+        r"^\s*\d{1,2}\s+[A-Za-zÇĞİÖŞÜçğıöşü]+\s+\d{4}(?:\s+[PAZARTESİ|SALI|ÇARŞAMBA|PERŞEMBE|CUMA|CUMARTESİ|PAZAR]*)?$",
+        r"^\s*Resm[iî] Gazete\s*$",
+        r"^\s*Sayı\s*:\s*\d+",
+        r"^\s*Karar\s*No\s*:?\s*\d+",
+        r"^\s*Karar\s*Tarihi\s*:?\s*\d{1,2}/\d{1,2}/\d{4}",
+        r"^\s*\(.*?\)$",
+    ]
+    for ln in lines:
+        if any(re.match(pat, ln.strip(), flags=re.IGNORECASE) for pat in skip_patterns):
+            continue
+        cleaned.append(ln)
+    return "\n".join(cleaned).strip()
+
+
+def old_cut_after_appendix_markers(text, min_keep_chars=400):
+    if not text:
+        return text
+    upper = text.upper()
+
+    markers = [
+        r"\bTARİHLİ\s+VE\s+\d+\s+SAYILI\s+CUMHURBAŞKANI\s+KARARININ\s+EK[İI]\b",
+        r"CUMHURBAŞKANI\s+KARARININ\s+EK[İI]",
+        r"\bEK[-–—]?\s*\d+\b",
+        r"\bEK[İI]\b",
+        r"\bL[İI]STE\b",
+        r"\bKROK[İI]\b",
+        r"\bKOORD[İI]NAT\s+L[İI]STES[İI]\b",
+        r"\bHAR[İI]TA\b",
+        r"\bTABLO\b",
+        r"\bŞEMA\b",
+        r"\bÇİZELGE\b",
+        r"\bGRAF[İI]K\b",
+        r"\bPROJE\s+ALANI\b",
+        r"\bALAN\s+BÜYÜKLÜĞÜ\b"
+    ]
+    first_idx = None
+    for pat in markers:
+        m = re.search(pat, upper, flags=re.IGNORECASE)
+        if m:
+            idx = m.start()
+            if first_idx is None or idx < first_idx:
+                first_idx = idx
+
+    if first_idx is not None and first_idx > min_keep_chars:
+        return text[:first_idx].rstrip()
+    return text
+
+
+def old_drop_coordinate_like_lines(text):
+    out = []
+    for ln in (text or "").splitlines():
+        s = ln.strip()
+        if not s:
+            out.append(ln)
+            continue
+        if len(re.findall(r"[A-Za-zÇĞİÖŞÜçğıöşü]", s)) < 3 and len(re.findall(r"\d", s)) > 5:
+            continue
+        out.append(ln)
+    return "\n".join(out)
+
+
+def old_strip_appendix_parts(text):
+    t = old_cut_after_appendix_markers(text)
+    t = old_drop_coordinate_like_lines(t)
+    return re.sub(r"\n{3,}", "\n\n", t).strip()
+
+
+def old_clean(text, header_lines=False):
+    text = old_normalize_ws(text)
+    text = old_dehyphenate(text)
+    text = old_strip_headers_footers(text)
+    text = old_strip_appendix_parts(text)
+    if header_lines:
+        text = old_strip_header_lines(text)
+    return text.strip()
+
+
+CLEANER = TextCleaner()
+
+SAMPLES = [
+    "",
+    "   \n\n\n  ",
+    "15 Ocak 2024 PAZARTESİ\nResmî Gazete\nSayı : 32430\nYÖNETMELİK\nBirinci madde metni.\n",
+    "Karar No: 8123\nKarar Tarihi : 3/1/2024\n(Ek: 5/1/2024)\nMetin devam-\nediyor ve bit-\nti.",
+    "Giriş\xa0\xa0paragrafı\t\tburada.\n\n\n\n\nİkinci   paragraf. Son.",
+    "Madde 1 - " + "uzun metin " * 60 + "\nCUMHURBAŞKANI KARARININ EKİ\nSIRA NO  ADI\n1 2 3 4 5 6 7\n",
+    "Kısa giriş EK-1 burada erken geçiyor.\n" + "gövde satırı\n" * 50,
+    "Metin " * 100 + "\n412345.12 4512345.67\nY: 412345 X: 4512345\nHARİTA\nkoordinat",
+    "Resmi Gazete\n  (Değişik: 1/2/2020)  \nsatır-\n\nayrık tire\n\n\n\nson",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+@pytest.mark.parametrize("header_lines", [False, True])
+def test_clean_matches_old_chain(text, header_lines):
+    assert CLEANER.clean(text, header_lines=header_lines) == old_clean(text, header_lines=header_lines)
+
+
+def _fixture_texts():
+    fitz = pytest.importorskip("fitz")
+    pdf_dir = os.path.join(FIXTURES, "pdf")
+    texts = []
+    for name in sorted(os.listdir(pdf_dir)):
+        with fitz.open(os.path.join(pdf_dir, name)) as doc:
+            texts.append("\n".join(pg.get_text("text") for pg in doc))
+    return texts
+
+
+def test_clean_matches_old_chain_on_fixtures():
+    for text in _fixture_texts():
+        for header_lines in (False, True):
+            assert CLEANER.clean(text, header_lines=header_lines) == old_clean(text, header_lines=header_lines)
+
+
+# Bulanık girdi: kuralların sınırlarına denk gelen parçalar rastgele birleştirilir
+FUZZ_PARTS = [
+    "madde", "yürürlük", "Kurum", "ilgili", "ek", "EK", "EKİ", "Eki", "ek-2", "EK–3", "LİSTE", "liste", "Tablo",
+    "HARİTA", "krokisi", "ŞEMA", "ÇİZELGE", "grafik", "PROJE ALANI", "alan büyüklüğü", "koordinat listesi",
+    "CUMHURBAŞKANI KARARININ EKİ", "15 Ocak 2024", "3 Mart 2021 CUMA", "Resmî Gazete", "Resmi Gazete",
+    "Sayı : 32430", "Sayı:12", "Karar No: 5", "Karar Tarihi: 1/2/2023", "(Ek: 1/1/2020)", "YÖNETMELİK", "İLAN",
+    "TEBLİĞ", "412345.12", "4512345", "12 34 56 78", "X:", "Y", "-", "–", "(", ")", ":", "1", "2024", "İı", "ÇĞÖŞÜ",
+    " ", "  ", "\t", "\xa0", " ", " ", "\n", "\n", "\n\n", "\n\n\n", "-\n", "a-\nb", " \n ",
+]
+
+
+def _fuzz_text(rnd):
+    n = rnd.randint(0, 400)
+    return "".join(rnd.choice(FUZZ_PARTS) + rnd.choice(("", " ", "", "\n")) for _ in range(n))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_clean_matches_old_chain_fuzzed(seed):
+    rnd = random.Random(seed)
+    for _ in range(100):
+        text = _fuzz_text(rnd)
+        for header_lines in (False, True):
+            assert CLEANER.clean(text, header_lines=header_lines) == old_clean(text, header_lines=header_lines), text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_helpers_match_old_helpers_fuzzed(seed):
+    rnd = random.Random(1000 + seed)
+    for _ in range(100):
+        text = _fuzz_text(rnd)
+        assert CLEANER.normalize_ws(text) == old_normalize_ws(text)
+        assert CLEANER.dehyphenate(text) == old_dehyphenate(text)
+        assert CLEANER.strip_headers_footers(text) == old_strip_headers_footers(text)
+        assert CLEANER.strip_header_lines(text) == old_strip_header_lines(text)
+        assert CLEANER.cut_after_appendix_markers(text) == old_cut_after_appendix_markers(text)
+        assert CLEANER.drop_coordinate_like_lines(text) == old_drop_coordinate_like_lines(text)
+        assert CLEANER.strip_appendix_parts(text) == old_strip_appendix_parts(text)
@@ -0,0 +1,72 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+from run_bench import IMPORT_BUDGETS_MS, LAZY_MODULES  # noqa: E402
+
+RUNS = 7
+# Paylaşılan CI makinelerinde ortanca bile oynar; bütçenin üstüne bu kat kadar pay bırakılır
+HEADROOM = 2.0
+SHORT_COMMANDS = [["-m", "cli", "--help"], ["-m", "cli", "stats"], ["main.py", "--help"]]
+
+
+def _env(tmp_path):
+    env = dict(os.environ, PYTHONPATH=ROOT, SCRAPER_OUT_DIR=str(tmp_path / "output"))
+    env.pop("SCRAPER_QUEUE", None)
+    return env
+
+
+def _import(module, tmp_path):
+    code = (f"import sys, time, json\nt0 = time.perf_counter()\nimport {module}\n"
+            f"ms = (time.perf_counter() - t0) * 1000\n"
+            f"print(json.dumps({{'ms': ms, 'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=_env(tmp_path),
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _run(argv, tmp_path):
+    if argv[0] == "main.py":
+        argv = [os.path.join(ROOT, "main.py")] + argv[1:]
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable] + argv, cwd=tmp_path, env=_env(tmp_path), capture_output=True, text=True)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_loads_no_heavy_modules(module, tmp_path):
+    assert _import(module, tmp_path)["loaded"] == []
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("argv", SHORT_COMMANDS)
+def test_short_commands_have_no_side_effects(argv, tmp_path):
+    out, _ = _run(argv, tmp_path)
+    assert out.returncode == 0, out.stderr
+    assert not os.path.exists(tmp_path / "output")
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_within_budget(module, tmp_path):
+    # İlk çalıştırma .pyc üretimini ısıtır, ölçüme sayılmaz
+    _import(module, tmp_path)
+    ms = statistics.median(_import(module, tmp_path)["ms"] for _ in range(RUNS))
+    assert ms <= IMPORT_BUDGETS_MS[module] * HEADROOM, f"import {module}: {ms:.1f} ms"
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("argv", [a for a in SHORT_COMMANDS if a[:2] == ["-m", "cli"]])
+def test_short_command_latency(argv, tmp_path):
+    _run(argv, tmp_path)
+    ms = statistics.median(_run(argv, tmp_path)[1] for _ in range(RUNS))
+    # Yorumlayıcının açılışı da dahil; cli bütçesinin üstüne sabit bir pay
+    assert ms <= (IMPORT_BUDGETS_MS["cli"] + 500) * HEADROOM, f"{' '.join(argv)}: {ms:.1f} ms"
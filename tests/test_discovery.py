@@ -0,0 +1,76 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+from conftest import ROOT
+from manifest import Manifest
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+@pytest.fixture
+def server(monkeypatch):
+    import main
+
+    srv = standin_server.start(standin_server.Corpus(items=3, pdf_ratio=0))
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _index_requests(srv):
+    return srv.stats.summary()["kinds"].get("index", 0)
+
+
+def test_unlearned_year_probes_one_candidate_first(server, tmp_path):
+    import main
+
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    assert main.collect_for_date(date(2024, 1, 15), manifest)["items"]
+    assert _index_requests(server) == 1
+    assert manifest.learned_scheme("2024") == "gunluk"
+
+
+def test_nearest_learned_year_is_tried_first(server, tmp_path):
+    import main
+
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    manifest.learn_scheme("2012", "eskiler_htm")
+    assert main.collect_for_date(date(2010, 3, 4), manifest)["items"]
+    assert _index_requests(server) == 1
+    assert manifest.learned_scheme("2010") == "eskiler_htm"
+
+
+def test_miss_falls_back_to_other_candidates(server, tmp_path):
+    import main
+
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    manifest.learn_scheme("2021", "gunluk")
+    assert main.collect_for_date(date(2010, 3, 4), manifest)["items"]
+    assert manifest.learned_scheme("2010") == "eskiler_htm"
+
+
+def test_issue_pdf_does_not_hide_index_items(tmp_path, monkeypatch):
+    # Aynı gün hem fihrist hem tam sayı PDF'i var; öğrenilmiş PDF şeması kalemleri gizlememeli
+    import main
+
+    srv = standin_server.start(standin_server.Corpus(items=3, pdf_ratio=0, issue_pdf=True))
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    try:
+        manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+        manifest.learn_scheme("2024", "eskiler_pdf")
+        pack = main.collect_for_date(date(2024, 1, 15), manifest)
+        assert len(pack["items"]) == 3
+        assert manifest.learned_scheme("2024") == "gunluk"
+
+        manifest.learn_scheme("2023", "eskiler_pdf")
+        assert len(main.collect_for_date(date(2022, 6, 1), manifest)["items"]) == 3
+        assert manifest.learned_scheme("2022") == "gunluk"
+    finally:
+        srv.shutdown()
+        srv.server_close()
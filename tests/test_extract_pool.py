@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+
+from conftest import ROOT
+from manifest import Manifest
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+pytest.importorskip("fitz")
+
+
+def _records(out_dir):
+    out = {}
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name, "data.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            out[name] = (data, sorted(os.listdir(os.path.join(out_dir, name, "pages")))
+                         if data["sayfa_resimleri"] else [])
+    return out
+
+
+def test_process_pool_matches_inline_extraction(tmp_path, monkeypatch):
+    import main
+
+    srv = standin_server.start(standin_server.Corpus(items=4, pdf_ratio=1, unique=False,
+                                                     pdfs=["duz_metin.pdf", "tablo_eki.pdf", "harita_eki.pdf"]))
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    monkeypatch.setattr(main, "BLOBS", None)
+    results = {}
+    try:
+        for workers in (0, 2):
+            # Spawn ile açılan işçiler ayarları ortamdan okur; hazırlık klasörü iki tarafta aynı olmalı
+            out_dir = str(tmp_path / f"out{workers}")
+            monkeypatch.setenv("SCRAPER_OUT_DIR", out_dir)
+            monkeypatch.setattr(main, "OUT_DIR", out_dir)
+            manifest = Manifest(str(tmp_path / f"manifest{workers}.sqlite"))
+            pack = main.collect_for_date(date(2024, 1, 15), manifest)
+            pool = main.extract_executor(workers)
+            assert (pool is None) == (workers == 0)
+            try:
+                assert main.process_items(pack["items"], "15.01.2024", pack["issue"], extract_pool=pool,
+                                          manifest=manifest) == (4, 0)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            results[workers] = _records(out_dir)
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    assert sorted(results[0]) == sorted(results[2])
+    for name, (data, pages) in results[0].items():
+        other, other_pages = results[2][name]
+        assert other == data and other_pages == pages
+        assert data["pdf_dosyasi"] == "kaynak.pdf" and len(pages) == len(data["sayfa_resimleri"]) > 0
+    assert not os.listdir(os.path.join(tmp_path / "out2", ".staging"))
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+from bs4 import BeautifulSoup
+
+import fast_html
+from conftest import FIXTURES
+
+DAY_URL = "https://www.resmigazete.gov.tr/15.01.2024"
+
+HEADER = ('<html><head><meta charset="utf-8"></head><body><div id="gazete-header"><span id="spanGazeteTarih">'
+          '15 Ocak 2024 Pazartesi Tarihli ve 32430 Sayılı Resmî Gazete</span></div>')
+
+INDEXES = {
+    "no_root": HEADER + '<div class="fihrist-item"><a href="a.htm">Kök yok</a></div></body></html>',
+    "nested_links": HEADER + '<div id="html-content"><div class="html-subtitle">YÖNETMELİKLER</div>'
+    '<div class="fihrist-item"><span><b><a href="eskiler/2024/01/20240115-1.htm">İç <i>içe</i> bağlantı</a>'
+    '</b></span><a href="ikinci.htm">İkinci</a></div>'
+    '<div class="fihrist-item"><a>href yok</a><p><a href="sonraki.htm">Sonraki bağlantı</a></p></div>'
+    '<div class="fihrist-item">bağlantısız</div></div></body></html>',
+    "entities": HEADER + '<div id="html-content"><div class="html-subtitle">TEBLİĞLER &amp; GENELGELER</div>'
+    '<div class="fihrist-item"><a href="x.htm?a=1&amp;b=2">&#304;thalat&nbsp;Rejimi &lt;Ek&gt; &quot;K&quot;</a></div>'
+    '</div></body></html>',
+    "subtitle_outside_root": HEADER + '<div class="html-subtitle">ÖNCEKİ BAŞLIK</div><div id="html-content">'
+    '<div class="fihrist-item"><a href="1.htm">Başlıksız kalem</a></div>'
+    '<div><div class="html-subtitle">İÇTEKİ</div></div>'
+    '<div class="fihrist-item"><a href="2.htm">İçteki başlık</a></div></div></body></html>',
+    "ilan_and_navigation": HEADER + '<div id="html-content"><div class="html-subtitle">KANUNLAR</div>'
+    '<div class="fihrist-item"><a href="k.htm">Kanun</a></div><div class="fihrist-item"><a href="k.htm">Tekrar</a></div>'
+    '<div class="fihrist-item"><a href="p.pdf">PDF Görüntüle</a></div>'
+    '<div class="html-title">İLÂN BÖLÜMÜ</div><div class="fihrist-item"><a href="i.htm">İlan</a></div>'
+    '</div></body></html>',
+    "no_header": '<html><body><div id="html-content"><div class="fihrist-item"><a href="a.htm">Tek</a></div>'
+    '</div></body></html>',
+    "empty": "",
+}
+
+DETAILS = {
+    "no_title": '<html><head><meta charset="utf-8"></head><body><p>İlk satır\nikinci</p><p>Üçüncü</p></body></html>',
+    "nested_title": '<html><body><h1>  KURUL <b>KARARI</b>\n</h1><p>Karar Sayısı: 12</p></body></html>',
+    "strong_only": '<html><body><div><strong></strong><b>Kalın başlık</b><p>metin</p></div></body></html>',
+    "entities": '<html><head><title>Resm&icirc; Gazete</title><script>var a = "<h1>x</h1>";</script>'
+    '<style>p{}</style></head><body><p>A&amp;B&nbsp;&nbsp;C &#8211; &lt;D&gt;</p><noscript>js</noscript>'
+    '</body></html>',
+    "blank_runs": '<html><body><h2>Başlık</h2><div>\n\n\n\n</div><p>a</p><br><br><br><p>b</p></body></html>',
+    "empty_body": "<html><body></body></html>",
+    "empty": "",
+}
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, "html", name), "rb") as f:
+        return f.read()
+
+
+def _bs4_title_and_text(body):
+    # extract_detail'in BeautifulSoup yolu
+    import main
+
+    soup = BeautifulSoup(body, "lxml")
+    try:
+        title = main.extract_title(soup) or None
+    except Exception:
+        title = None
+    return title, main._normalize_ws(main.clean_text(soup))
+
+
+@pytest.mark.parametrize("body", [_fixture("gunluk_kucuk.htm"), _fixture("gunluk_buyuk.htm")]
+                         + [v.encode("utf-8") for v in INDEXES.values()], ids=["kucuk", "buyuk"] + list(INDEXES))
+def test_daily_tree_matches_daily_page(body):
+    import main
+
+    expected = main.collect_from_daily_page(DAY_URL, BeautifulSoup(body, "lxml"))
+    assert main.collect_from_daily_tree(DAY_URL, fast_html.parse(body)) == expected
+
+
+def test_daily_edge_cases_are_exercised():
+    import main
+
+    items, issue = main.collect_from_daily_page(DAY_URL, BeautifulSoup(INDEXES["nested_links"].encode(), "lxml"))
+    assert issue == "32430"
+    assert [it["title_from_list"] for it in items] == ["İç içe bağlantı"]
+    items, _ = main.collect_from_daily_page(DAY_URL, BeautifulSoup(INDEXES["entities"].encode(), "lxml"))
+    assert items[0]["category"] == "TEBLİĞLER & GENELGELER" and items[0]["url"].endswith("x.htm?a=1&b=2")
+
+
+@pytest.mark.parametrize("body", [_fixture("detay.htm")] + [v.encode("utf-8") for v in DETAILS.values()],
+                         ids=["detay"] + list(DETAILS))
+def test_fast_title_and_text_matches_bs4(body):
+    import main
+
+    assert main.title_and_text_fast(body) == _bs4_title_and_text(body)
+
+
+_PARTS = [
+    '<div class="html-subtitle">KURUL &amp; KARARLARI</div>', '<div class="html-subtitle"></div>',
+    '<div class="html-title">YÜRÜTME VE İDARE BÖLÜMÜ</div>', '<div class="html-title">İLAN BÖLÜMÜ</div>',
+    '<div class="fihrist-item"><a href="{n}.htm">Kalem {n} &#304;&ccedil;</a></div>',
+    '<div class="fihrist-item"><p><span><a href="{n}.pdf">  İç   içe {n} </a></span></p></div>',
+    '<div class="fihrist-item"><a href="../{n}.htm"><b>Kalın</b> <i>{n}</i></a><a href="x{n}.htm">ikinci</a></div>',
+    '<div class="fihrist-item"><a href="{n}.htm">Önceki</a></div>', '<div class="fihrist-item"><a></a></div>',
+    '<div><div class="html-subtitle">İÇ {n}</div></div>', '<p>serbest metin {n}</p>', '<!-- yorum -->', ' \n ',
+]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_daily_tree_matches_daily_page_fuzzed(seed):
+    import random
+
+    import main
+
+    rnd = random.Random(seed)
+    for n in range(30):
+        inner = "".join(rnd.choice(_PARTS).format(n=rnd.randint(0, 9)) for _ in range(rnd.randint(0, 25)))
+        before = rnd.choice(("", '<div class="html-subtitle">DIŞ</div>'))
+        body = (HEADER + before + f'<div id="html-content">{inner}</div></body></html>').encode("utf-8")
+        expected = main.collect_from_daily_page(DAY_URL, BeautifulSoup(body, "lxml"))
+        assert main.collect_from_daily_tree(DAY_URL, fast_html.parse(body)) == expected, body
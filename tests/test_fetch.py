@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+import time
+from datetime import date
+
+from conftest import ROOT
+from manifest import Manifest
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+def test_token_bucket_paces_each_host_separately(monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "HOST_RATE", 20.0)
+    monkeypatch.setattr(main, "HOST_BURST", 2)
+    monkeypatch.setattr(main, "_BUCKETS", {})
+    t0 = time.monotonic()
+    for _ in range(7):
+        main._throttle("https://a.example.org/x")
+    # İki istek patlama payından, kalan beşi 1/20 sn aralıkla
+    assert time.monotonic() - t0 >= 0.2
+    t0 = time.monotonic()
+    main._throttle("https://b.example.org/x")
+    main._throttle("https://b.example.org/y")
+    assert time.monotonic() - t0 < 0.05
+
+
+def _folders(out_dir):
+    out = {}
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name, "data.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                out[name] = json.load(f)["kaynak_url"]
+    return out
+
+
+def test_concurrent_fetch_keeps_list_order_numbering(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    runs = []
+    for seed in (1, 2):
+        # Rastgele gecikmeler indirmelerin liste sırasından farklı bitmesini sağlar
+        srv = standin_server.start(standin_server.Corpus(items=8, pdf_ratio=0),
+                                   standin_server.Behaviour(latency=0.2, jitter=0.05, seed=seed))
+        monkeypatch.setattr(main, "BASE", srv.base_url)
+        out_dir = tmp_path / f"out{seed}"
+        monkeypatch.setattr(main, "OUT_DIR", str(out_dir))
+        try:
+            manifest = Manifest(str(tmp_path / f"manifest{seed}.sqlite"))
+            pack = main.collect_for_date(date(2024, 1, 15), manifest)
+            t0 = time.perf_counter()
+            assert main.process_items(pack["items"], "15.01.2024", pack["issue"], concurrency=8,
+                                      manifest=manifest) == (8, 0)
+            elapsed = time.perf_counter() - t0
+        finally:
+            srv.shutdown()
+            srv.server_close()
+        # Sıralı indirme en az 8 x 0.15 sn sürerdi; eşzamanlı indirmede gecikmeler örtüşür
+        assert elapsed < 8 * 0.15
+        folders = _folders(out_dir)
+        # Numara (klasör adının son parçası) tamamlanma sırasına değil liste sırasına göre verilir
+        ordered = sorted(folders, key=lambda n: int(n.rsplit("_", 1)[1]))
+        assert [folders[n] for n in ordered] == [it["url"] for it in pack["items"]]
+        runs.append(ordered)
+    assert runs[0] == runs[1]
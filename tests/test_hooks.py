@@ -0,0 +1,58 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import hooks
+
+RECORD = {"kaynak_url": "https://example.org/eskiler/2024/01/20240115-1.htm", "baslik": "İlân Yönetmeliği"}
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    # Yanıt kodları sırayla verilir; liste bitince 200
+    statuses, bodies = [], []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            bodies.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(statuses.pop(0) if statuses else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setattr(hooks.time, "sleep", lambda s: None)
+    yield f"http://127.0.0.1:{srv.server_address[1]}/kayit", statuses, bodies
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_retries_5xx_then_delivers(webhook, tmp_path, capsys):
+    url, statuses, bodies = webhook
+    statuses.extend([503, 502])
+    hooks.WebhookHook(url, dead_letter=str(tmp_path / "olu.jsonl"))(RECORD)
+    assert bodies == [RECORD] * 3
+    assert not (tmp_path / "olu.jsonl").exists()
+    assert capsys.readouterr().err == ""
+
+
+def test_final_5xx_goes_to_dead_letter(webhook, tmp_path, capsys):
+    url, statuses, bodies = webhook
+    statuses.extend([500, 503, 503])
+    dead_letter = tmp_path / "kancalar" / "olu.jsonl"
+    hooks.WebhookHook(url, dead_letter=str(dead_letter))(RECORD)
+    assert len(bodies) == 3
+    assert [json.loads(line) for line in dead_letter.read_text(encoding="utf-8").splitlines()] == [RECORD]
+    err = capsys.readouterr().err
+    assert "[UYARI]" in err and RECORD["kaynak_url"] in err and str(dead_letter) in err
+
+
+def test_unreachable_webhook_warns_with_record_id(tmp_path, capsys):
+    hooks.WebhookHook("http://127.0.0.1:9/kayit", timeout=1, retries=1, dead_letter="")(RECORD)
+    err = capsys.readouterr().err
+    assert "teslim edilemedi" in err and RECORD["kaynak_url"] in err
@@ -0,0 +1,111 @@
+import os
+import sys
+
+import pytest
+import requests
+
+from conftest import ROOT
+from http_cache import HttpCache
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+@pytest.fixture
+def server():
+    srv = standin_server.start(standin_server.Corpus(items=2, pdf_ratio=0))
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def send():
+    session = requests.Session()
+    calls = []
+
+    def _send(url, **kwargs):
+        calls.append(dict(kwargs.get("headers") or {}))
+        return session.get(url, timeout=10, **kwargs)
+
+    _send.calls = calls
+    yield _send
+    session.close()
+
+
+def _statuses(server):
+    return server.stats.summary()["status"]
+
+
+def test_conditional_get_reuses_body_on_304(server, send, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    url = server.base_url + "/15.01.2024"
+    first = cache.fetch(send, url)
+    assert first.status_code == 200 and b"fihrist-item" in first.content
+    assert cache.lookup(url)["etag"]
+
+    again = cache.fetch(send, url)
+    assert again.status_code == 200 and again.from_cache
+    assert again.content == first.content
+    assert "If-None-Match" in send.calls[-1] and "If-Modified-Since" in send.calls[-1]
+    assert _statuses(server) == {"200": 1, "304": 1}
+
+
+def test_last_modified_alone_revalidates(server, send, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    url = server.base_url + "/15.01.2024"
+    body = cache.fetch(send, url).content
+    with cache._lock:
+        cache._conn().execute("UPDATE entries SET etag = NULL")
+        cache._conn().commit()
+    assert cache.fetch(send, url).content == body
+    assert "If-None-Match" not in send.calls[-1]
+    assert _statuses(server) == {"200": 1, "304": 1}
+
+
+def test_fresh_entry_is_served_without_request(server, send, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    url = server.base_url + "/15.01.2024"
+    cache.fetch(send, url, ttl=3600)
+    assert cache.fetch(send, url, ttl=3600).from_cache
+    assert cache.fetch(send, url, ttl=-1).from_cache
+    assert len(send.calls) == 1
+
+
+def test_offline_replays_cache_and_never_sends(server, send, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    url = server.base_url + "/15.01.2024"
+    body = cache.fetch(send, url).content
+
+    offline = HttpCache(str(tmp_path / "cache"), offline=True)
+    assert offline.fetch(send, url).content == body
+    missing = offline.fetch(send, server.base_url + "/16.01.2024")
+    assert missing.status_code == 504 and not missing.from_cache
+    assert len(send.calls) == 1
+
+
+def test_same_body_is_stored_once(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    cache.store("https://example.org/a", b"govde", {"Content-Type": "text/html"})
+    src = tmp_path / "b.pdf"
+    src.write_bytes(b"govde")
+    cache.store_file("https://example.org/b", str(src), {})
+    a, b = cache.lookup("https://example.org/a"), cache.lookup("https://example.org/b")
+    assert a["body_hash"] == b["body_hash"]
+    blobs = [f for _, _, files in os.walk(tmp_path / "cache" / "blobs") for f in files]
+    assert len(blobs) == 1
+
+
+def test_main_offline_mode_reads_from_cache(server, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "BASE", server.base_url)
+    monkeypatch.setattr(main, "HTTP_CACHE", HttpCache(str(tmp_path / "cache")))
+    url = server.base_url + "/15.01.2024"
+    assert main.get_page(url) is not None
+    main.set_offline()
+    before = server.stats.summary()["requests"]
+    assert main.get_page(url) is not None
+    assert main.get_page(server.base_url + "/16.01.2024") is None
+    assert server.stats.summary()["requests"] == before
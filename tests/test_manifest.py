@@ -0,0 +1,60 @@
+import os
+import sys
+from datetime import date
+
+from conftest import ROOT
+from manifest import Manifest
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+def _records(out_dir):
+    return sorted(n for n in os.listdir(out_dir) if os.path.isfile(os.path.join(out_dir, n, "data.json")))
+
+
+def test_repeat_runs_skip_done_items_and_keep_numbers(tmp_path, monkeypatch):
+    import main
+
+    server = standin_server.start(standin_server.Corpus(items=4, pdf_ratio=0))
+    monkeypatch.setattr(main, "BASE", server.base_url)
+    monkeypatch.setattr(main, "OUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+    try:
+        pack = main.collect_for_date(date(2024, 1, 15), manifest)
+        items, issue = pack["items"], pack["issue"]
+        urls = [it["url"] for it in items]
+
+        def run(batch):
+            server.stats.reset()
+            saved, failed = main.process_items([dict(it) for it in batch], "15.01.2024", issue, concurrency=3,
+                                               manifest=manifest)
+            return saved, failed, server.stats.summary()["kinds"].get("detail_html", 0)
+
+        assert run(items[1:]) == (3, 0, 3)
+        first = {u: manifest.get(u)["seq"] for u in urls[1:]}
+        assert sorted(first.values()) == [1, 2, 3]
+        folders = _records(tmp_path / "out")
+
+        # Aynı kalemler: hiçbiri yeniden indirilmez ya da yeniden numaralanmaz
+        assert run(items[1:]) == (0, 0, 0)
+        assert _records(tmp_path / "out") == folders
+
+        # Listeye önden yeni bir kalem eklendi: yalnızca o indirilir, boştaki ilk numarayı alır
+        assert run(items) == (1, 0, 1)
+        assert {u: manifest.get(u)["seq"] for u in urls[1:]} == first
+        assert manifest.get(urls[0])["seq"] == 4
+        assert len(_records(tmp_path / "out")) == 4
+
+        # Klasörü silinen kayıt tamamlanmış sayılmaz; yeniden indirilir ve boşalan numarasını geri alır
+        lost = manifest.get(urls[2])
+        for name in os.listdir(os.path.dirname(lost["record_path"])):
+            os.remove(os.path.join(os.path.dirname(lost["record_path"]), name))
+        assert run(items) == (1, 0, 1)
+        assert manifest.get(urls[2])["seq"] == lost["seq"]
+        assert len(_records(tmp_path / "out")) == 4
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,76 @@
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+
+from conftest import ROOT
+from manifest import Manifest
+from metrics import BUCKETS, PREFIX, Metrics
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+def test_worker_snapshots_merge_and_export(tmp_path):
+    main_metrics, worker = Metrics(), Metrics()
+    main_metrics.inc("pages_ocr_total", 2)
+    main_metrics.observe("stage_seconds", 0.2, stage="fetch_detail")
+    worker.inc("pages_ocr_total", 3)
+    worker.inc("http_requests_total", status="200")
+    with worker.timer("ocr_page"):
+        pass
+    worker.observe("stage_seconds", 7.0, stage="fetch_detail")
+    main_metrics.merge(json.loads(json.dumps(worker.drain())))
+    assert worker.snapshot() == {"counters": [], "histograms": []}
+
+    summary = main_metrics.summary()
+    assert summary["counters"] == {"http_requests_total{status=200}": 1, "pages_ocr_total": 5}
+    fetch = summary["stages"]["fetch_detail"]
+    assert fetch["count"] == 2 and fetch["sum_seconds"] == pytest.approx(7.2)
+    assert fetch["buckets"]["0.25"] == 1 and fetch["buckets"]["10.0"] == 2
+    assert summary["stages"]["ocr_page"]["count"] == 1
+
+    json_path, prom_path = tmp_path / "m" / "run.json", tmp_path / "m" / "metrics.prom"
+    main_metrics.write(str(json_path), str(prom_path))
+    assert json.loads(json_path.read_text(encoding="utf-8"))["counters"]["pages_ocr_total"] == 5
+    prom = prom_path.read_text(encoding="utf-8").splitlines()
+    assert f"# TYPE {PREFIX}_pages_ocr_total counter" in prom
+    assert f"{PREFIX}_pages_ocr_total 5" in prom
+    assert f'{PREFIX}_http_requests_total{{status="200"}} 1' in prom
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in prom
+               if line.startswith(f'{PREFIX}_stage_seconds_bucket{{stage="fetch_detail"')]
+    assert len(buckets) == len(BUCKETS) + 1 and buckets == sorted(buckets) and buckets[-1] == 2
+    assert f'{PREFIX}_stage_seconds_count{{stage="fetch_detail"}} 2' in prom
+    assert sorted(os.listdir(tmp_path / "m")) == ["metrics.prom", "run.json"]
+
+
+def test_run_records_stage_timings_and_counters(tmp_path, monkeypatch):
+    pytest.importorskip("fitz")
+    import main
+
+    srv = standin_server.start(standin_server.Corpus(items=2, pdf_ratio=1, pdfs=["harita_eki.pdf"]))
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    monkeypatch.setattr(main, "OUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    monkeypatch.setattr(main, "BLOBS", None)
+    monkeypatch.setattr(main, "METRICS", Metrics())
+    try:
+        manifest = Manifest(str(tmp_path / "manifest.sqlite"))
+        pack = main.collect_for_date(date(2024, 1, 15), manifest)
+        assert main.process_items(pack["items"], "15.01.2024", pack["issue"], manifest=manifest) == (2, 0)
+    finally:
+        srv.shutdown()
+        srv.server_close()
+
+    summary = main.METRICS.summary()
+    counters = summary["counters"]
+    assert {"get_soup", "fetch_detail", "extract_detail", "parse_detail", "save"} <= set(summary["stages"])
+    assert summary["stages"]["save"]["count"] == 2
+    assert counters["http_requests_total{status=200}"] == srv.stats.summary()["status"]["200"]
+    assert counters["bytes_downloaded_total"] >= 2 * os.path.getsize(
+        os.path.join(ROOT, "bench", "fixtures", "pdf", "harita_eki.pdf"))
+    assert counters["pages_rendered_total"] >= 2 * 5
+    assert counters["records_saved_total"] == 2
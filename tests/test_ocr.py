@@ -0,0 +1,169 @@
+import os
+
+import pytest
+
+from conftest import FIXTURES
+
+pytest.importorskip("fitz")
+pytest.importorskip("PIL")
+
+SCAN = os.path.join(FIXTURES, "pdf", "taranmis.pdf")
+PAGE_WIDTH = 595
+
+GOOD = " ".join(["yönetmelik"] * 25)
+BETTER = " ".join(["madde"] * 12 + ["x1"] * 13)
+GARBAGE = " ".join(["x1"] * 25)
+
+
+class FakeOcr:
+    # Tesseract yerine: çizim genişliğinden basamağı (dpi) bulur, o basamak için verilen sonucu döndürür
+    def __init__(self, by_dpi):
+        self.by_dpi, self.calls = by_dpi, []
+
+    def __call__(self, images, lang=None, config=None, timeout=None):
+        out = []
+        for img in images:
+            dpi = round(img.width * 72 / PAGE_WIDTH / 50) * 50
+            self.calls.append(dpi)
+            out.append((self.by_dpi[dpi], None))
+        return out
+
+
+class Budget:
+    # ocr.calls sayısı limit'e ulaşınca dolar
+    def __init__(self, ocr, limit):
+        self.ocr, self.limit, self.exceeded = ocr, limit, False
+
+    def expired(self):
+        self.exceeded = self.exceeded or len(self.ocr.calls) >= self.limit
+        return self.exceeded
+
+    def timeout(self, pages=1):
+        return None
+
+
+@pytest.fixture
+def ocr(monkeypatch):
+    import main
+
+    def install(by_dpi):
+        fake = FakeOcr(by_dpi)
+        monkeypatch.setattr(main, "_ocr_images_scored", fake)
+        monkeypatch.setattr(main, "TESSERACT_OK", True)
+        monkeypatch.setattr(main, "OCR_BATCH", 1)
+        return fake
+
+    return install
+
+
+def _pages(budget=None):
+    import main
+
+    raw_pages = []
+    main._extract_pdf_pages(SCAN, raw_pages=raw_pages, budget=budget)
+    return raw_pages
+
+
+def test_ladder_climbs_while_results_improve(ocr):
+    fake = ocr({200: GARBAGE, 300: BETTER, 400: GOOD})
+    pages = _pages()
+    assert fake.calls == [200, 300, 400] * len(pages)
+    assert all(p["dpi"] == 400 and p["ocr"] == GOOD and p["secilen"] == "ocr" for p in pages)
+
+
+def test_ladder_stops_when_result_is_good(ocr):
+    fake = ocr({200: GARBAGE, 300: GOOD, 400: GOOD})
+    pages = _pages()
+    assert fake.calls == [200, 300] * len(pages)
+    assert all(p["dpi"] == 300 and not p["ertelendi"] for p in pages)
+
+
+def test_good_first_read_is_not_escalated(ocr):
+    fake = ocr({200: GOOD, 300: GOOD, 400: GOOD})
+    pages = _pages()
+    assert fake.calls == [200] * len(pages)
+    assert all(p["dpi"] == 200 for p in pages)
+
+
+def test_no_climb_above_ocr_dpi_without_improvement(ocr):
+    fake = ocr({200: BETTER, 300: GARBAGE, 400: GOOD})
+    pages = _pages()
+    assert fake.calls == [200, 300] * len(pages)
+    assert all(p["dpi"] == 200 and p["ocr"] == BETTER for p in pages)
+
+
+def test_pages_deferred_when_budget_runs_out(ocr):
+    fake = ocr({200: GOOD, 300: GOOD, 400: GOOD})
+    pages = _pages(Budget(fake, 1))
+    assert fake.calls == [200]
+    assert [p["ertelendi"] for p in pages] == [False] + [True] * (len(pages) - 1)
+    assert pages[0]["secilen"] == "ocr" and pages[1]["ocr"] is None
+
+
+def test_budget_stops_escalation_and_defers_page(ocr):
+    fake = ocr({200: GARBAGE, 300: GOOD, 400: GOOD})
+    pages = _pages(Budget(fake, 1))
+    assert fake.calls == [200]
+    assert all(p["ertelendi"] for p in pages)
+    assert pages[0]["ocr"] == GARBAGE and pages[0]["dpi"] == 200
+
+
+def test_partial_record_lists_missing_pages(ocr, monkeypatch, tmp_path):
+    import shutil
+
+    import main
+
+    fake = ocr({200: GOOD, 300: GOOD, 400: GOOD})
+    monkeypatch.setattr(main, "_DocBudget", lambda: Budget(fake, 2))
+    pdf = tmp_path / "kaynak.pdf"
+    shutil.copy(SCAN, pdf)
+    item = {"url": "https://example.org/eskiler/2024/01/20240115-9.pdf", "category": "İLAN", "title_from_list": "Tarama"}
+    rec, _, _ = main.extract_detail(item, "15.01.2024", {"pdf_path": str(pdf), "sha256": ""})
+    assert rec.kismi
+    assert rec.eksik_sayfalar == [3]
+
+    monkeypatch.setattr(main, "_DocBudget", lambda: Budget(fake, 100))
+    rec, _, _ = main.extract_detail(item, "15.01.2024", {"pdf_path": str(pdf), "sha256": ""})
+    assert not rec.kismi and rec.eksik_sayfalar == []
+
+
+def test_each_scanned_page_is_rendered_once(ocr, monkeypatch, tmp_path):
+    import main
+
+    ocr({200: GOOD, 300: GOOD, 400: GOOD})
+    renders = []
+    real_render = main._render
+    monkeypatch.setattr(main, "_render", lambda pg, zoom: renders.append(pg.number) or real_render(pg, zoom))
+    monkeypatch.setattr(main, "PAGE_IMAGE_MODE", "png")
+    pieces, images, used_ocr, _ = main._extract_pdf_pages(SCAN, image_dir=str(tmp_path))
+    # OCR çizimi sayfa görseline küçültülerek kullanılır; ikinci bir çizim yapılmaz
+    assert renders == [0, 1, 2]
+    assert used_ocr == 3 and all(p == GOOD for p in pieces)
+    assert all((tmp_path / name).stat().st_size for name in images)
+
+
+def test_ocr_results_are_cached_by_image_and_settings(monkeypatch, tmp_path):
+    from PIL import Image
+
+    import main
+
+    calls = []
+
+    def batch(images, lang, config, timeout=None):
+        calls.append(len(images))
+        return [f"{lang} sayfa {img.getpixel((0, 0))}" for img in images]
+
+    monkeypatch.setattr(main, "OCR_CACHE_DIR", str(tmp_path / "ocr"))
+    monkeypatch.setattr(main, "TESSERACT_OK", True)
+    monkeypatch.setattr(main, "TESSEROCR_OK", False)
+    monkeypatch.setattr(main, "_tesseract_batch", batch)
+    pages = [Image.new("L", (40, 40), c) for c in (0, 255)]
+
+    first = main._ocr_images(pages, lang="tur", config="--psm 6")
+    assert first == ["tur sayfa 0", "tur sayfa 255"] and calls == [2]
+    assert main._ocr_images(pages, lang="tur", config="--psm 6") == first and calls == [2]
+    # Dil ya da ayar değişince önbellek kullanılmaz; yalnızca yeni görüntü okunur
+    assert main._ocr_images(pages[:1], lang="eng", config="--psm 6") == ["eng sayfa 0"] and calls == [2, 1]
+    main._ocr_images(pages[:1], lang="tur", config="--psm 4")
+    main._ocr_images(pages + [Image.new("L", (40, 40), 128)], lang="tur", config="--psm 6")
+    assert calls == [2, 1, 1, 1]
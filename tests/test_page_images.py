@@ -0,0 +1,43 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import FIXTURES
+
+pytest.importorskip("fitz")
+pytest.importorskip("PIL")
+
+URL = "https://example.org/eskiler/2020/01/20200101-1.pdf"
+
+
+def _lazy_record(tmp_path):
+    record_dir = tmp_path / "01012020_31000_YÖNETMELİKLER_001"
+    record_dir.mkdir()
+    shutil.copy(os.path.join(FIXTURES, "pdf", "duz_metin.pdf"), record_dir / "kaynak.pdf")
+    data = {"tarih": "01.01.2020", "sayi": "31000", "kategori": "YÖNETMELİKLER", "baslik": "Yönetmelik",
+            "kaynak_url": URL, "metin": "metin", "pdf_dosyasi": "kaynak.pdf",
+            "sayfa_resimleri": ["pages/page_1.png"]}
+    json_path = record_dir / "data.json"
+    json_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return record_dir, str(json_path)
+
+
+def test_missing_images_complete_only_in_lazy_mode(tmp_path, monkeypatch):
+    import main
+
+    _, json_path = _lazy_record(tmp_path)
+    monkeypatch.setattr(main, "PAGE_IMAGE_MODE", "png")
+    assert not main.record_is_complete(json_path, URL)
+    monkeypatch.setattr(main, "PAGE_IMAGE_MODE", "lazy")
+    assert main.record_is_complete(json_path, URL)
+
+
+def test_show_images_renders_lazy_pages(tmp_path, capsys):
+    import cli
+
+    record_dir, _ = _lazy_record(tmp_path)
+    assert cli.main(["show", str(record_dir), "--images"]) == 0
+    assert (record_dir / "pages" / "page_1.png").stat().st_size > 0
+    assert str(record_dir / "pages" / "page_1.png") in capsys.readouterr().out
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from conftest import FIXTURES
+
+pytest.importorskip("fitz")
+pytest.importorskip("PIL")
+
+
+def _pdf(name):
+    return os.path.join(FIXTURES, "pdf", name)
+
+
+@pytest.fixture
+def classified(monkeypatch):
+    import main
+
+    seen = []
+    classify = main._classify_page
+
+    def record(pg, text=None):
+        seen.append(pg.number)
+        return classify(pg, text)
+
+    monkeypatch.setattr(main, "PAGE_CLASSIFIER", True)
+    monkeypatch.setattr(main, "_classify_page", record)
+    return seen
+
+
+@pytest.mark.parametrize("name", ["duz_metin.pdf", "harita_eki.pdf", "tablo_eki.pdf"])
+def test_text_pages_are_not_classified(name, classified):
+    import main
+
+    raw_pages = []
+    main._extract_pdf_pages(_pdf(name), raw_pages=raw_pages)
+    assert classified == []
+    assert all(p["sinif"] is None for p in raw_pages)
+
+
+def test_low_text_pages_are_classified(classified):
+    import main
+
+    raw_pages = []
+    main._extract_pdf_pages(_pdf("taranmis.pdf"), raw_pages=raw_pages)
+    assert classified == list(range(len(raw_pages)))
+    assert all(p["sinif"] == "scan" for p in raw_pages)
@@ -0,0 +1,79 @@
+import hashlib
+import mmap
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+from conftest import FIXTURES, ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+PDF = os.path.join(FIXTURES, "pdf", "tablo_eki.pdf")
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def iter_content(self, chunk_size=1):
+        yield from self.chunks()
+
+
+def test_spool_streams_to_disk_with_flat_memory(tmp_path):
+    import main
+
+    mb = 1024 * 1024
+    dest = tmp_path / "kayit" / "kaynak.pdf"
+    expected = hashlib.sha256()
+    for i in range(24):
+        expected.update(bytes([i]) * mb)
+    tracemalloc.start()
+    try:
+        sha = main._spool_pdf(FakeResponse(lambda: (bytes([i]) * mb for i in range(24))), str(dest),
+                              max_bytes=32 * mb)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sha == expected.hexdigest()
+    assert dest.stat().st_size == 24 * mb
+    # Gövde hiçbir zaman bütünüyle bellekte tutulmaz; tepe değer birkaç parça kadardır
+    assert peak < 4 * mb
+    assert os.listdir(dest.parent) == ["kaynak.pdf"]
+
+
+def test_size_cap_aborts_without_leaving_files(tmp_path):
+    import main
+
+    dest = tmp_path / "kaynak.pdf"
+    with pytest.raises(ValueError):
+        main._spool_pdf(FakeResponse(lambda: (b"x" * 1000 for _ in range(5))), str(dest), max_bytes=2500)
+    assert os.listdir(tmp_path) == []
+
+
+def test_fetch_detail_spools_pdf_and_extraction_reads_the_path(tmp_path, monkeypatch):
+    pytest.importorskip("fitz")
+    import main
+
+    srv = standin_server.start(standin_server.Corpus(items=1, pdf_ratio=1, pdfs=["tablo_eki.pdf"], unique=False))
+    monkeypatch.setattr(main, "OUT_DIR", str(tmp_path / "out"))
+    monkeypatch.setattr(main, "HTTP_CACHE", None)
+    try:
+        fetched = main.fetch_detail({"url": f"{srv.base_url}eskiler/2024/01/20240115-1.pdf"})
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    with open(PDF, "rb") as f:
+        body = f.read()
+    assert fetched["body"] is None
+    assert fetched["sha256"] == hashlib.sha256(body).hexdigest()
+    assert fetched["pdf_path"].startswith(str(tmp_path / "out" / ".staging"))
+    with open(fetched["pdf_path"], "rb") as f:
+        assert f.read() == body
+
+    with main._pdf_stream(fetched["pdf_path"]) as stream:
+        assert isinstance(stream, mmap.mmap) and stream[:5] == b"%PDF-"
+    assert main.pdf_to_text_robust(fetched["pdf_path"]) == main.pdf_to_text_robust(body)
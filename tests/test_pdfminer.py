@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from conftest import FIXTURES
+
+pytest.importorskip("pdfminer")
+pytest.importorskip("fitz")
+
+PDFS = sorted(os.listdir(os.path.join(FIXTURES, "pdf")))
+
+
+def _layout_pages(path):
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    rsrcmgr = PDFResourceManager()
+    device = PDFPageAggregator(rsrcmgr, laparams=None)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    with open(path, "rb") as fp:
+        for page in PDFPage.get_pages(fp):
+            interpreter.process_page(page)
+            yield device.get_result()
+
+
+@pytest.mark.parametrize("name", PDFS)
+def test_single_pass_matches_extract_text_per_page(name):
+    from pdfminer.high_level import extract_text
+
+    import main
+
+    path = os.path.join(FIXTURES, "pdf", name)
+    params = main._pdfminer_params()
+    # Her düzen stratejisi tek tek extract_text (TextConverter) ile aynı sayfa metnini üretir
+    for n, ltpage in enumerate(_layout_pages(path)):
+        for p in params:
+            assert main._pdfminer_layout_text(ltpage, p) + "\f" == \
+                extract_text(path, page_numbers=[n], laparams=p), f"{name} sayfa {n + 1}"
+    # Tek geçiş, eski iki tam extract_text geçişinin uzun olanıyla aynı
+    found = main._pdfminer_pages(path)
+    assert sorted(found) == list(range(n + 1))
+    for page, text in found.items():
+        assert text == max((extract_text(path, page_numbers=[page], laparams=p).strip() for p in params),
+                           key=len), f"{name} sayfa {page + 1}"
+
+
+@pytest.mark.parametrize("name", PDFS)
+def test_only_short_pages_are_parsed_in_parallel(name, monkeypatch):
+    import main
+
+    path = os.path.join(FIXTURES, "pdf", name)
+    with main._open_pdf(path) as doc:
+        pieces = [pg.get_text("text").strip() for pg in doc]
+    full = main._pdfminer_pages(path)
+    short = [i for i, t in enumerate(pieces) if len(t) < main.OCR_MIN_CHARS]
+    monkeypatch.setattr(main, "PDFMINER_WORKERS", 2)
+    with open(path, "rb") as f:
+        body = f.read()
+    for pdf in (path, body):
+        found = main._pdfminer_fallback(pdf, pieces)
+        assert set(found) <= set(short)
+        assert found == {i: full[i] for i in short if len(full[i]) > len(pieces[i])}
+    assert main._pdfminer_fallback(path, []) == {i: t for i, t in full.items()}
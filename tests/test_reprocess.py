@@ -0,0 +1,47 @@
+import json
+
+from models import ResmiGazeteKaydi
+from sinks import ShardSink, iter_records
+
+RAW = {"tur": "html", "html_baslik": "İLAN YÖNETMELİĞİ", "html_metin": "Yeni   metin\n\nikinci paragraf"}
+
+
+def _rec(n, tarih="15.01.2024"):
+    return ResmiGazeteKaydi(tarih=tarih, sayi="32430", kategori="YÖNETMELİKLER", baslik="Eski başlık",
+                            kaynak_url=f"https://example.org/eskiler/2024/01/20240115-{n}.htm", metin="eski metin")
+
+
+def test_reprocess_uses_spawn_workers(tmp_path, monkeypatch):
+    import main
+
+    # İşçiler spawn ile açılır ve ayarları ortamdan okur; parça kayıtlarının ham önbelleği OUT_DIR altında
+    out_dir = tmp_path / "out"
+    monkeypatch.setenv("SCRAPER_OUT_DIR", str(out_dir))
+    monkeypatch.setattr(main, "OUT_DIR", str(out_dir))
+    monkeypatch.setattr(main, "SEARCH_INDEX", None)
+    contexts = []
+    real_pool = main.ProcessPoolExecutor
+
+    def pool(*args, **kw):
+        contexts.append(kw.get("mp_context"))
+        return real_pool(*args, **kw)
+
+    monkeypatch.setattr(main, "ProcessPoolExecutor", pool)
+
+    record_dir = out_dir / "15012024_32430_YÖNETMELİKLER_001"
+    record_dir.mkdir(parents=True)
+    (record_dir / "data.json").write_text(json.dumps(_rec(1).model_dump(mode="json"), ensure_ascii=False),
+                                          encoding="utf-8")
+    main.write_raw(str(record_dir / main.RAW_CACHE_NAME), RAW)
+    shard_dir = tmp_path / "records"
+    sink = ShardSink(str(shard_dir), "jsonl")
+    shard = sink.write(_rec(2))
+    sink.write(_rec(3, "16.01.2024"))
+    sink.close()
+    main.write_raw(main.raw_cache_path(shard, str(_rec(2).kaynak_url)), RAW)
+
+    assert main.reprocess(str(out_dir), str(shard_dir), workers=2) == (3, 2, 1)
+    assert [c.get_start_method() for c in contexts] == ["spawn"]
+    data = json.loads((record_dir / "data.json").read_text(encoding="utf-8"))
+    assert (data["baslik"], data["metin"]) == ("İLAN YÖNETMELİĞİ", "Yeni metin\n\nikinci paragraf")
+    assert [r.metin for r in iter_records(str(shard_dir))] == ["Yeni metin\n\nikinci paragraf", "eski metin"]
@@ -0,0 +1,58 @@
+import json
+import os
+import sqlite3
+
+import search_index
+from models import ResmiGazeteKaydi
+from search_index import SearchIndex
+
+METIN = ("Giriş. " + "Bu YÖNETMELİK, İstanbul'daki Resmî Gazete ilânları hakkında düzenleme içerir. " * 3
+         + "Son söz İLAN.")
+
+
+def _rec(**kw):
+    data = {"tarih": "15.01.2024", "sayi": "32430", "kategori": "YÖNETMELİKLER", "baslik": "İlân Yönetmeliği",
+            "kaynak_url": "https://example.org/eskiler/2024/01/20240115-1.htm", "metin": METIN}
+    data.update(kw)
+    return ResmiGazeteKaydi(**data)
+
+
+def test_snippet_uses_original_text(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.sqlite"))
+    index.add(_rec())
+    assert "[İstanbul]'daki Resmî Gazete" in index.search("istanbul")[0]["snippet"]
+    assert "[Resmî] [Gazete] ilânları" in index.search("RESMI gazete")[0]["snippet"]
+    assert index.search("son")[0]["snippet"].endswith("[Son] söz İLAN.")
+
+
+def test_old_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / "search.sqlite")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, tarih TEXT, iso_date TEXT, "
+               "kategori TEXT, baslik TEXT, karar_kanun_no TEXT, record_path TEXT)")
+    db.execute(f"CREATE VIRTUAL TABLE fts USING fts5({', '.join(search_index.FIELDS)})")
+    db.execute("INSERT INTO docs (url) VALUES ('https://example.org/eski')")
+    db.commit()
+    db.close()
+    index = SearchIndex(path)
+    assert index.count() == 0
+    index.add(_rec())
+    assert index.search("istanbul")
+
+
+def test_cli_defaults_follow_out_dir(tmp_path, monkeypatch, capsys):
+    out_dir = tmp_path / "veri"
+    record_dir = out_dir / "15012024_32430_YÖNETMELİKLER_001"
+    record_dir.mkdir(parents=True)
+    (record_dir / "data.json").write_text(json.dumps(_rec().model_dump(mode="json"), ensure_ascii=False),
+                                          encoding="utf-8")
+    monkeypatch.setenv("SCRAPER_OUT_DIR", str(out_dir))
+    monkeypatch.delenv("SEARCH_INDEX", raising=False)
+    monkeypatch.delenv("RECORD_SHARD_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert search_index.main(["reindex"]) == 0
+    assert os.path.exists(out_dir / "search.sqlite")
+    assert not os.path.exists(tmp_path / "output")
+    assert search_index.main(["search", "istanbul"]) == 0
+    assert "[İstanbul]'daki" in capsys.readouterr().out
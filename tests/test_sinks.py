@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from models import ResmiGazeteKaydi, Tablo
+from sinks import (EXTENSIONS, PART_SUFFIX, PYARROW_OK, ZSTD_OK, ShardSink, iter_records, iter_shard,
+                   rewrite_shard, shard_paths)
+
+FORMATS = [pytest.param(fmt, marks=pytest.mark.skipif(
+    (fmt == "jsonl.zst" and not ZSTD_OK) or (fmt == "parquet" and not PYARROW_OK), reason=f"{fmt} kurulu değil"))
+    for fmt in EXTENSIONS]
+
+
+def _rec(day, n):
+    return ResmiGazeteKaydi(tarih=f"{day:02d}.01.2024", sayi=str(32420 + day), kategori="YÖNETMELİKLER",
+                            baslik=f"Yönetmelik {n} — İçişleri", kaynak_url=f"https://example.org/{day}/{n}.htm",
+                            metin="Türkçe metin: ğüşıöç İĞÜŞÖÇ\nikinci satır " * (n + 1),
+                            sayfa_resimleri=[f"pages/page_{n}.png"], eksik_sayfalar=[n], kismi=bool(n % 2),
+                            tablolar=[Tablo(sayfa=2, kaynak="words", basliklar=["SIRA NO", "ADI"],
+                                            satirlar=[["1", "İzmir"], ["2", "Muş"]])])
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_round_trip_with_date_and_count_rollover(fmt, tmp_path):
+    sink = ShardSink(str(tmp_path), fmt, max_records=2)
+    recs = [_rec(day, n) for day in (14, 15, 16) for n in range(3)]
+    paths = [sink.write(r) for r in recs]
+
+    # Dolan parçalar kapanır ve görünür olur; açık parça yalnızca .part olarak vardır
+    visible = list(shard_paths(str(tmp_path)))
+    assert len(visible) == 3 and all(os.path.exists(p) for p in visible)
+    assert all(os.path.exists(p + PART_SUFFIX) for p in set(paths) - set(visible))
+    sink.close()
+
+    shards = list(shard_paths(str(tmp_path)))
+    assert len(shards) == 6
+    assert sorted({os.path.basename(os.path.dirname(p)) for p in shards}) == \
+        ["date=2024-01-14", "date=2024-01-15", "date=2024-01-16"]
+    assert not [n for _, _, files in os.walk(tmp_path) for n in files if n.endswith(PART_SUFFIX)]
+    assert list(iter_records(str(tmp_path))) == recs
+    for rec, path in zip(recs, paths):
+        assert rec in list(iter_shard(path))
+    assert list(iter_records(str(tmp_path), start="2024-01-15", end="2024-01-15")) == recs[3:6]
+    assert [p for _, p in iter_records(str(tmp_path), with_path=True)] == paths
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_size_rollover_and_rewrite(fmt, tmp_path):
+    sink = ShardSink(str(tmp_path), fmt, max_bytes=1)
+    recs = [_rec(15, n) for n in range(3)]
+    paths = [sink.write(r) for r in recs]
+    sink.close()
+    assert len(set(paths)) == 3
+
+    def fix(rec):
+        if rec.baslik.startswith("Yönetmelik 1"):
+            rec.metin = "düzeltildi"
+            return True
+        return False
+
+    for path in paths:
+        rewrite_shard(path, fix)
+    assert [r.metin for r in iter_records(str(tmp_path))] == [recs[0].metin, "düzeltildi", recs[2].metin]
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+from datetime import date
+
+import pytest
+import requests
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import load_test  # noqa: E402
+import standin_server  # noqa: E402
+
+
+@pytest.fixture
+def start():
+    servers = []
+
+    def run(corpus=None, behaviour=None):
+        srv = standin_server.start(corpus or standin_server.Corpus(items=3), behaviour)
+        servers.append(srv)
+        return srv
+
+    yield run
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+@pytest.mark.parametrize("day, scheme", [(date(2024, 1, 15), 0), (date(2012, 3, 4), 1), (date(2003, 6, 2), 2)])
+def test_serves_each_scheme_under_scraper_urls(start, monkeypatch, day, scheme):
+    import main
+
+    srv = start()
+    monkeypatch.setattr(main, "BASE", srv.base_url)
+    statuses = [requests.get(url, timeout=5).status_code for url in main.build_candidates(day)]
+    assert statuses == [200 if i == scheme else 404 for i in range(3)]
+    if scheme < 2:
+        url = main.build_candidates(day)[scheme]
+        items, issue = main.collect_from_page(url, main.get_page(url))
+        assert len(items) == 3 and issue == str(standin_server.Corpus().issue(day))
+        for it in items:
+            r = requests.get(it["url"], timeout=5)
+            assert r.status_code == 200
+            assert r.headers["Content-Type"].startswith("application/pdf" if it["url"].endswith(".pdf")
+                                                        else "text/html")
+
+
+def test_conditional_requests_get_304(start):
+    srv = start()
+    url = f"{srv.base_url}15.01.2024"
+    first = requests.get(url, timeout=5)
+    assert requests.get(url, headers={"If-None-Match": first.headers["ETag"]}, timeout=5).status_code == 304
+    assert requests.get(url, headers={"If-Modified-Since": first.headers["Last-Modified"]},
+                        timeout=5).status_code == 304
+    assert requests.get(url, headers={"If-None-Match": '"baska"'}, timeout=5).status_code == 200
+    assert srv.stats.summary()["status"] == {"200": 2, "304": 2}
+
+
+def test_errors_and_throttling(start):
+    srv = start(behaviour=standin_server.Behaviour(error_rate=1.0))
+    assert requests.get(f"{srv.base_url}15.01.2024", timeout=5).status_code in (500, 502, 503)
+    srv = start(behaviour=standin_server.Behaviour(rate=0.01, burst=2))
+    codes = [requests.get(f"{srv.base_url}15.01.2024", timeout=5).status_code for _ in range(4)]
+    assert codes == [200, 200, 429, 429]
+
+
+def test_same_seed_same_corpus():
+    a, b = standin_server.Corpus(seed=3), standin_server.Corpus(seed=3)
+    day = date(2024, 1, 15)
+    assert a.index_html(day) == b.index_html(day)
+    assert a.index_html(day) != standin_server.Corpus(seed=4).index_html(day)
+
+
+def test_histogram_quantile():
+    buckets = {"0.1": 2, "0.5": 6, "1.0": 10}
+    assert load_test.histogram_quantile(0.5, buckets, 10) == pytest.approx(0.4)
+    assert load_test.histogram_quantile(0.2, buckets, 10) == pytest.approx(0.1)
+    assert load_test.histogram_quantile(0.5, buckets, 0) == 0.0
+
+
+def test_load_test_reports_end_to_end_run(tmp_path, capsys):
+    out = tmp_path / "sonuc.json"
+    assert load_test.main(["--start", "2024-01-15", "--end", "2024-01-16", "--items", "2", "--pdf-ratio", "0",
+                           "--partitions", "2", "--extract-workers", "0", "--revalidate",
+                           "--json", str(out)]) == 0
+    results = json.loads(out.read_text())
+    first, again = results["first"], results["revalidate"]
+    assert first["documents"] == 4 and first["failed"] == 0 and first["docs_per_s"] > 0
+    assert {"get_soup", "fetch_detail", "save"} <= set(first["stages"])
+    assert first["server"]["status"]["200"] == first["server"]["requests"]
+    assert again["documents"] == 4 and again["server"]["status"].get("304", 0) > 0
+    assert "belge/sn" in capsys.readouterr().out
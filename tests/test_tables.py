@@ -0,0 +1,49 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from conftest import FIXTURES, ROOT
+
+pytest.importorskip("fitz")
+
+
+def test_appendix_table_reaches_record(tmp_path):
+    # Ek başlığı temizlenmiş metinden kesilse de tablolar çıkarılmalı
+    import main
+
+    pdf = tmp_path / "kaynak.pdf"
+    shutil.copy(os.path.join(FIXTURES, "pdf", "tablo_eki.pdf"), pdf)
+    item = {"url": "https://example.org/eskiler/2020/01/20200101-2.pdf", "category": "YÜRÜTME VE İDARE BÖLÜMÜ",
+            "title_from_list": "Cumhurbaşkanı Kararı"}
+    rec, _, _ = main.extract_detail(item, "01.01.2020", {"pdf_path": str(pdf), "sha256": ""})
+    assert rec.tablolar
+    assert rec.tablolar[0].basliklar[:2] == ["SIRA NO", "İMZA TARİHİ VE YERİ"]
+
+
+def test_liste_inside_title_does_not_cut_text(tmp_path):
+    # "LİSTESİNDE" başlıktaki bir kelimedir, ek başlığı değildir; metin başlıkta kesilmemeli
+    import fitz
+    import main
+
+    sys.path.insert(0, os.path.join(ROOT, "bench"))
+    from make_fixtures import _save, _text_page, _wrap
+
+    body = ("İthalat rejimi kararına ekli listede yer alan eşyanın gümrük tarife pozisyonları bu Karar ile "
+            "yeniden düzenlenmiştir. ") * 4
+    doc = fitz.open()
+    _text_page(doc, ["15 Ocak 2024 PAZARTESİ", "Resmî Gazete", "Sayı : 32430", "",
+                     "İTHALAT LİSTESİNDE DEĞİŞİKLİK YAPILMASINA DAİR KARAR", "Karar Sayısı: 8126", ""]
+               + _wrap(body) + ["", "Bu Karar yayımı tarihinde yürürlüğe girer."])
+    with fitz.open(os.path.join(FIXTURES, "pdf", "tablo_eki.pdf")) as src:
+        doc.insert_pdf(src, from_page=1, to_page=1)
+    pdf = tmp_path / "kaynak.pdf"
+    pdf.write_bytes(_save(doc))
+
+    item = {"url": "https://example.org/eskiler/2024/01/20240115-3.pdf", "category": "YÜRÜTME VE İDARE BÖLÜMÜ",
+            "title_from_list": "İthalat Listesinde Değişiklik Yapılmasına Dair Karar"}
+    rec, _, _ = main.extract_detail(item, "15.01.2024", {"pdf_path": str(pdf), "sha256": ""})
+    assert "İTHALAT LİSTESİNDE DEĞİŞİKLİK YAPILMASINA DAİR KARAR" in rec.metin
+    assert "Bu Karar yayımı tarihinde yürürlüğe girer." in rec.metin
+    assert rec.tablolar and rec.tablolar[0].sayfa == 2
@@ -0,0 +1,32 @@
+import json
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import standin_server  # noqa: E402
+
+
+def test_mukerrer_records_do_not_overwrite_main_issue(tmp_path, monkeypatch):
+    # Mükerrer sayı aynı sayı numarasını taşır; kayıt klasörleri ana sayınınkilerle çakışmamalı
+    import main
+
+    server = standin_server.start(standin_server.Corpus(items=5, mukerrer=4, pdf_ratio=0))
+    try:
+        monkeypatch.setattr(main, "BASE", server.base_url)
+        monkeypatch.setattr(main, "OUT_DIR", str(tmp_path))
+        main.watch(once=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    urls = []
+    for name in os.listdir(tmp_path):
+        path = os.path.join(tmp_path, name, "data.json")
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                urls.append(json.load(f)["kaynak_url"])
+    assert len(urls) == 9
+    assert sum("M1-" in u for u in urls) == 4
@@ -0,0 +1,31 @@
+from work_queue import WorkQueue
+
+
+def test_only_current_lease_holder_can_finish_a_job(tmp_path):
+    queue = WorkQueue(str(tmp_path / "kuyruk.sqlite"))
+    queue.put("fetch", "https://example.org/1.htm", {"url": "https://example.org/1.htm"})
+
+    # İlk işçinin kirası dolar, iş ikinci işçiye geçer
+    stale = queue.lease("fetch", "isci-1", lease_seconds=-1)
+    job = queue.lease("fetch", "isci-2")
+    assert job["id"] == stale["id"] and job["attempts"] == 2
+
+    assert queue.complete(stale["id"], "isci-1", "extract", [("a", {})]) is False
+    assert queue.fail(stale["id"], "isci-1", stale["attempts"], "zaman aşımı", retryable=False) is None
+    assert queue.stats() == {"fetch": {"ready": 0, "leased": 1, "done": 0, "dead": 0}}
+
+    assert queue.complete(job["id"], "isci-2", "extract", [("b", {"x": 1})]) is True
+    assert queue.stats()["fetch"]["done"] == 1
+    assert queue.lease("extract", "isci-3")["key"] == "b"
+    # Bitmiş iş eski kiracı tarafından geri açılamaz
+    assert queue.fail(job["id"], "isci-2", job["attempts"], "geç hata") is None
+
+
+def test_fail_backs_off_then_goes_dead(tmp_path):
+    queue = WorkQueue(str(tmp_path / "kuyruk.sqlite"), max_attempts=2, backoff=0)
+    queue.put("extract", "k", {})
+    job = queue.lease("extract", "isci")
+    assert queue.fail(job["id"], "isci", job["attempts"], "hata") is False
+    job = queue.lease("extract", "isci")
+    assert queue.fail(job["id"], "isci", job["attempts"], "hata") is True
+    assert queue.dead("extract")[0]["attempts"] == 2
@@ -0,0 +1,21 @@
+import argparse
+import os
+
+from work_queue import RETRY_STAGE, WorkQueue
+
+
+def test_worker_defers_ocr_to_its_own_queue(tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, "_retry_queue", None)
+    queue_path = str(tmp_path / "kuyruk.sqlite")
+    args = argparse.Namespace(stage="store", queue=queue_path, threads=1, drain=True, idle_sleep=0)
+    main.main_worker(args)
+
+    rec = main.ResmiGazeteKaydi(tarih="01.01.2020", sayi="31000", kategori="YÖNETMELİKLER", baslik="Yönetmelik",
+                                kaynak_url="https://example.org/eskiler/2020/01/20200101-1.pdf", metin="metin",
+                                kismi=True, eksik_sayfalar=[2])
+    main.defer_ocr(rec, str(tmp_path / "kayit" / "data.json"))
+
+    assert WorkQueue(queue_path).stats()[RETRY_STAGE]["ready"] == 1
+    assert not os.path.exists(main.QUEUE_PATH)
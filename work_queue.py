@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import threading
+from datetime import timedelta
+
+# Aşamalar arası kalıcı iş kuyruğu (SQLite). Her iş (aşama, anahtar) ikilisiyle tekildir;
+# aynı işi yeniden eklemek etkisizdir. Bir işçi işi süreli olarak kiralar (lease); işçi
+# ölürse kira dolunca iş başka bir işçiye verilir. Hata alan iş geri çekilerek yeniden
+# denenir, deneme sınırı aşılınca "dead" durumuna düşer ve elle yeniden kuyruğa alınabilir.
+#
+# Durumlar: ready -> leased -> done | ready (yeniden deneme) | dead
+
+STATUSES = ("ready", "leased", "done", "dead")
+# Aşamalar sırasıyla; her aşamanın işi bittiğinde bir sonrakine iş ekler
+PIPELINE = ("discover", "fetch", "extract", "store")
+# Süre bütçesi yüzünden ertelenen OCR sayfaları; kayıt yazıldıktan sonra arka planda yeniden okunur
+RETRY_STAGE = "ocr_retry"
+STAGES = PIPELINE + (RETRY_STAGE,)
+
+
+class WorkQueue:
+    def __init__(self, path, max_attempts=5, backoff=30.0, max_backoff=3600.0):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _conn(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Aynı dosyayı birden fazla süreç paylaşır; kilit beklemesi bağlantı düzeyinde
+            db = sqlite3.connect(self.path, timeout=60, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_until REAL,
+                worker TEXT,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                UNIQUE (stage, key)
+            )""")
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(stage, status, available_at)")
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def _row(row):
+        if not row:
+            return None
+        job = dict(zip(("id", "stage", "key", "payload", "attempts"), row))
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def _insert(self, db, stage, key, payload, now, delay=0.0, reset=False):
+        sql = ("INSERT INTO jobs (stage, key, payload, status, available_at, created_at, updated_at) "
+               "VALUES (?, ?, ?, 'ready', ?, ?, ?) ON CONFLICT(stage, key) DO ")
+        if reset:
+            # Bitmiş ya da ölü iş yeni yükle yeniden hazırlanır; bekleyen/kiralanmış işe dokunulmaz
+            sql += ("UPDATE SET payload = excluded.payload, status = 'ready', attempts = 0, last_error = NULL, "
+                    "available_at = excluded.available_at, updated_at = excluded.updated_at "
+                    "WHERE status IN ('done', 'dead')")
+        else:
+            sql += "NOTHING"
+        cur = db.execute(sql, (stage, key, json.dumps(payload, ensure_ascii=False), now + delay, now, now))
+        return cur.rowcount > 0
+
+    def put(self, stage, key, payload, delay=0.0, reset=False):
+        # Eklendiyse True; aynı anahtarla iş zaten varsa False (reset: bitmiş işi yeniden hazırla)
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._insert(db, stage, key, payload, time.time(), delay, reset)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return added
+
+    def put_many(self, stage, jobs):
+        # jobs: (anahtar, yük) ikilileri; tek işlemde eklenir
+        n, now = 0, time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                for key, payload in jobs:
+                    n += self._insert(db, stage, key, payload, now)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return n
+
+    def lease(self, stage, worker, lease_seconds=300.0):
+        # Hazır ya da kirası dolmuş en eski işi kiralar; yoksa None
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("""SELECT id, stage, key, payload, attempts FROM jobs
+                                    WHERE stage = ? AND ((status = 'ready' AND available_at <= ?)
+                                          OR (status = 'leased' AND lease_until < ?))
+                                    ORDER BY available_at, id LIMIT 1""", (stage, now, now)).fetchone()
+                if row:
+                    db.execute("UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_until = ?, "
+                               "worker = ?, updated_at = ? WHERE id = ?", (now + lease_seconds, worker, now, row[0]))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        job = self._row(row)
+        if job:
+            job["attempts"] += 1
+        return job
+
+    def extend(self, job_id, worker, lease_seconds=300.0):
+        # Uzun süren iş için kirayı uzatır; iş başka işçiye geçtiyse False
+        now = time.time()
+        with self._lock:
+            cur = self._conn().execute("UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? "
+                                       "AND status = 'leased' AND worker = ?",
+                                       (now + lease_seconds, now, job_id, worker))
+        return cur.rowcount > 0
+
+    def complete(self, job_id, worker, next_stage=None, next_jobs=()):
+        # İşi bitirir ve sonraki aşamanın işlerini aynı işlemde ekler. Kira dolup iş başka işçiye
+        # geçtiyse hiçbir şey yazılmaz ve False döner; işi artık yeni kiracı bitirir.
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                held = db.execute("UPDATE jobs SET status = 'done', lease_until = NULL, last_error = NULL, "
+                                  "updated_at = ? WHERE id = ? AND status = 'leased' AND worker = ?",
+                                  (now, job_id, worker)).rowcount > 0
+                if held:
+                    for key, payload in next_jobs:
+                        self._insert(db, next_stage, key, payload, now)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return held
+
+    def fail(self, job_id, worker, attempts, error, retryable=True):
+        # Deneme hakkı kaldıysa üstel geri çekilmeyle yeniden kuyruğa alınır; "dead" olduysa True.
+        # İş başka işçiye geçtiyse dokunulmaz; None döner.
+        now = time.time()
+        dead = not retryable or attempts >= self.max_attempts
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+        with self._lock:
+            cur = self._conn().execute("UPDATE jobs SET status = ?, available_at = ?, lease_until = NULL, "
+                                       "last_error = ?, updated_at = ? WHERE id = ? AND status = 'leased' "
+                                       "AND worker = ?",
+                                       ("dead" if dead else "ready", now + delay, str(error)[:2000], now, job_id,
+                                        worker))
+        return dead if cur.rowcount > 0 else None
+
+    def requeue_dead(self, stage=None):
+        sql = "UPDATE jobs SET status = 'ready', attempts = 0, available_at = ?, updated_at = ? WHERE status = 'dead'"
+        args = [time.time(), time.time()]
+        if stage:
+            sql += " AND stage = ?"
+            args.append(stage)
+        with self._lock:
+            return self._conn().execute(sql, args).rowcount
+
+    def dead(self, stage=None, limit=50):
+        sql = "SELECT stage, key, attempts, last_error FROM jobs WHERE status = 'dead'"
+        args = []
+        if stage:
+            sql += " AND stage = ?"
+            args.append(stage)
+        sql += " ORDER BY updated_at DESC LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn().execute(sql, args).fetchall()
+        return [dict(zip(("stage", "key", "attempts", "last_error"), r)) for r in rows]
+
+    def stats(self):
+        # {aşama: {durum: adet}}
+        with self._lock:
+            rows = self._conn().execute("SELECT stage, status, COUNT(*) FROM jobs GROUP BY stage, status").fetchall()
+        out = {}
+        for stage, status, n in rows:
+            out.setdefault(stage, dict.fromkeys(STATUSES, 0))[status] = n
+        return out
+
+    def pending(self, stages=None):
+        # Henüz bitmemiş (ready/leased) iş sayısı
+        sql = "SELECT COUNT(*) FROM jobs WHERE status IN ('ready', 'leased')"
+        args = list(stages or [])
+        if args:
+            sql += f" AND stage IN ({','.join('?' * len(args))})"
+        with self._lock:
+            return self._conn().execute(sql, args).fetchone()[0]
+
+
+def enqueue_days(queue, start, end):
+    # start..end (dahil) günlerini keşif aşamasına ekler; zaten kuyrukta olanlar atlanır
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return queue.put_many("discover", [(d.isoformat(), {"date": d.isoformat()}) for d in days])